@@ -0,0 +1,276 @@
+"""
+This module provides an asyncio front-end to validate FITS files on high-latency storage.
+
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from solarnet_metadata.batch import create_task_pool
+from solarnet_metadata.cache import ValidationCache
+from solarnet_metadata.findings import Finding
+from solarnet_metadata.headers import is_compressed_image, iter_header_bytes
+from solarnet_metadata.schema import SOLARNETSchema, get_schema
+from solarnet_metadata.validation import validate_file_headers
+
+if TYPE_CHECKING:
+    from astropy.io import fits
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["avalidate_file", "avalidate_files"]
+
+
+def _read_file_headers(
+    file_path: Path, opener: Optional[Callable[[Path], BinaryIO]] = None
+) -> List[Union["fits.Header", bytes]]:
+    """
+    Read the raw bytes of the headers of a FITS file, skipping over the HDU data.
+
+    The headers of tile-compressed images are read with `astropy.io.fits` instead, as in
+    `~solarnet_metadata.validation.validate_file`.
+    """
+    fileobj = opener(file_path) if opener is not None else open(file_path, "rb")
+    with fileobj:
+        headers = list(iter_header_bytes(fileobj, name=str(file_path)))
+        if any(is_compressed_image(header) for header in headers):
+            from astropy.io import fits
+
+            fileobj.seek(0)
+            with fits.open(fileobj) as hdul:
+                headers = [
+                    hdul[index].header if is_compressed_image(header) else header
+                    for index, header in enumerate(headers)
+                ]
+        return headers
+
+
+async def avalidate_file(
+    file_path: Path,
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+    executor: Optional[Executor] = None,
+    opener: Optional[Callable[[Path], BinaryIO]] = None,
+) -> Union[List[str], List[Finding]]:
+    """
+    Validates a FITS file against the SOLARNET schema requirements without blocking the
+    event loop.
+
+    The headers of the file are read in a thread, skipping over the HDU data, and then
+    validated as raw cards in `executor` with
+    `~solarnet_metadata.validation.validate_file_headers`. The findings are the same as
+    from `~solarnet_metadata.validation.validate_file`.
+
+    Parameters
+    ----------
+    file_path : Path
+        The path to the FITS file to validate.
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers.
+        See `~solarnet_metadata.cache.ValidationCache`.
+    executor : Optional[Executor], default None
+        The pool to validate the headers in. If None, the default executor of the event
+        loop is used.
+    opener : Optional[Callable[[Path], BinaryIO]], default None
+        A function to open the file as a seekable binary file object. If None, the file is
+        opened with `open`.
+
+    Returns
+    -------
+    validation_findings : Union[List[str], List[Finding]]
+        A list of validation issues found; empty if the file is valid.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> from solarnet_metadata.aio import avalidate_file
+    >>> findings = asyncio.run(avalidate_file("my_file.fits"))  # doctest: +SKIP
+    """
+    # Check if Custom Schema is provided
+    if schema is None or not isinstance(schema, SOLARNETSchema):
+        # Use the shared default schema
+        schema = get_schema()
+
+    loop = asyncio.get_running_loop()
+    header_bytes = await loop.run_in_executor(
+        None, _read_file_headers, file_path, opener
+    )
+    task = partial(
+        validate_file_headers,
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+        structured=structured,
+        cache=cache,
+    )
+    return await loop.run_in_executor(executor, task, header_bytes)
+
+
+async def avalidate_files(
+    file_paths: Iterable[Path],
+    max_concurrency: int = 16,
+    workers: Optional[int] = None,
+    executor: str = "process",
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+    opener: Optional[Callable[[Path], BinaryIO]] = None,
+) -> AsyncIterator[Tuple[Path, Union[List[str], List[Finding]]]]:
+    """
+    Validates many FITS files against the SOLARNET schema requirements, overlapping the
+    reads of their headers.
+
+    The headers of up to `max_concurrency` files are read at once in a pool of I/O
+    threads, so the latency of a network filesystem is paid once per batch of files rather
+    than once per file. The headers read are then validated as raw cards in a pool of
+    `workers` processes or threads created with `~solarnet_metadata.batch.create_task_pool`,
+    which the schema and validation options are sent to once, as in
+    `~solarnet_metadata.batch.validate_files`. Results are yielded as soon as
+    each file is validated, so they may be in a different order than `file_paths`, and
+    `file_paths` may be a long or lazy iterable.
+
+    Files that cannot be read are reported with a single finding rather than raising an
+    exception, so one bad file does not stop the validation of the others.
+
+    Parameters
+    ----------
+    file_paths : Iterable[Path]
+        The paths to the FITS files to validate.
+    max_concurrency : int, default 16
+        The maximum number of files to read headers from at once.
+    workers : Optional[int], default None
+        The number of worker processes or threads validating the headers. If None, the
+        number of CPUs is used.
+    executor : str, default "process"
+        The type of worker pool validating the headers, either "process" or "thread".
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers, shared by all workers.
+        See `~solarnet_metadata.cache.ValidationCache`.
+    opener : Optional[Callable[[Path], BinaryIO]], default None
+        A function to open each file as a seekable binary file object. If None, the files
+        are opened with `open`.
+
+    Yields
+    ------
+    result : Tuple[Path, Union[List[str], List[Finding]]]
+        The path of each file and the list of validation issues found in it.
+
+    Raises
+    ------
+    ValueError: If `executor` is not a known type of worker pool, or `workers` or
+        `max_concurrency` are not positive.
+
+    Examples
+    --------
+    >>> from solarnet_metadata.aio import avalidate_files
+    >>> async def sweep(file_paths):
+    ...     async for file_path, findings in avalidate_files(file_paths):
+    ...         print(file_path, len(findings))
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be positive.")
+
+    # Check if Custom Schema is provided
+    if schema is None or not isinstance(schema, SOLARNETSchema):
+        # Use the shared default schema
+        schema = get_schema()
+
+    task = partial(
+        validate_file_headers,
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+        structured=structured,
+        cache=cache,
+    )
+    pool, run_task = create_task_pool(task, workers=workers, executor=executor)
+    io_pool = ThreadPoolExecutor(max_workers=max_concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def validate(file_path: Path):
+        try:
+            header_bytes = await loop.run_in_executor(
+                io_pool, _read_file_headers, file_path, opener
+            )
+            findings = await loop.run_in_executor(pool, run_task, header_bytes)
+        except Exception as e:
+            logger.debug(f"Could not validate file {file_path}: {e}")
+            finding = Finding("unreadable-file", args=(e,))
+            findings = [finding] if structured else [str(finding)]
+        return file_path, findings
+
+    in_flight = set()
+    try:
+        file_paths = iter(file_paths)
+        while True:
+            # Keep the I/O threads busy, with the next files ready to be read
+            for file_path in file_paths:
+                in_flight.add(asyncio.ensure_future(validate(file_path)))
+                if len(in_flight) >= 2 * max_concurrency:
+                    break
+            if not in_flight:
+                break
+
+            done, in_flight = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield future.result()
+    finally:
+        # Stop the validation of the remaining files if the iteration is stopped, without
+        # blocking the event loop on the files being read or validated
+        for future in in_flight:
+            future.cancel()
+        io_pool.shutdown(wait=not in_flight, cancel_futures=True)
+        pool.shutdown(wait=not in_flight, cancel_futures=True)
@@ -0,0 +1,279 @@
+"""
+This module provides functions to validate many FITS files in parallel.
+
+"""
+
+import logging
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from solarnet_metadata.cache import ValidationCache
+from solarnet_metadata.findings import Finding
+from solarnet_metadata.schema import SOLARNETSchema, get_schema
+from solarnet_metadata.validation import validate_file
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["create_task_pool", "map_files", "validate_files"]
+
+EXECUTOR_TYPES = ("process", "thread")
+
+# Task run on each item by the current worker process, set once by `_init_worker`
+_WORKER_TASK: Optional[Callable[[Any], Any]] = None
+
+
+def _init_worker(task: Callable[[Any], Any]) -> None:
+    """
+    Initialize a worker process with the task to run on each item.
+
+    The task, including any schema and options bound to it, is sent to each worker
+    process once, rather than with every item.
+    """
+    global _WORKER_TASK
+    _WORKER_TASK = task
+
+
+def _run_task_in_worker(item: Any) -> Any:
+    """
+    Run the task set by `_init_worker` on an item in a worker process.
+    """
+    return _WORKER_TASK(item)
+
+
+def create_task_pool(
+    task: Callable[[Any], Any],
+    workers: Optional[int] = None,
+    executor: str = "process",
+) -> Tuple[Executor, Callable[[Any], Any]]:
+    """
+    Function to create a pool of worker processes or threads to run a task on many items,
+    e.g. files or headers.
+
+    With worker processes, the task is sent to each worker once when it starts, so any
+    data bound to it (for example a schema, with `functools.partial`) is not sent again
+    with every item. The items are run by submitting the returned function to the pool,
+    e.g. `pool.submit(run_task, item)`.
+
+    Parameters
+    ----------
+    task : Callable[[Any], Any]
+        The function to run on each item. It must be picklable to use worker processes.
+    workers : Optional[int], default None
+        The number of worker processes or threads. If None, the number of CPUs is used.
+    executor : str, default "process"
+        The type of worker pool, either "process" or "thread".
+
+    Returns
+    -------
+    pool : Executor
+        The pool of worker processes or threads. It must be shut down by the caller.
+    run_task : Callable[[Any], Any]
+        The function to submit to the pool to run the task on an item.
+
+    Raises
+    ------
+    ValueError: If `executor` is not a known type of worker pool, or `workers` is not
+        positive.
+    """
+    if executor not in EXECUTOR_TYPES:
+        raise ValueError(
+            f"Unknown executor '{executor}'. Must be one of {list(EXECUTOR_TYPES)}."
+        )
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be positive.")
+
+    if executor == "process":
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(task,),
+        )
+        return pool, _run_task_in_worker
+    # Threads share the task of this process
+    return ThreadPoolExecutor(max_workers=workers), task
+
+
+def _validate_file_safe(
+    file_path: Path, structured: bool = False, **kwargs
+) -> Union[List[str], List[Finding]]:
+    """
+    Validate a file, reporting a file that cannot be read as a finding.
+    """
+    try:
+        return validate_file(file_path, structured=structured, **kwargs)
+    except Exception as e:
+        logger.debug(f"Could not validate file {file_path}: {e}")
+        finding = Finding("unreadable-file", args=(e,))
+        return [finding] if structured else [str(finding)]
+
+
+def map_files(
+    task: Callable[[Path], Any],
+    file_paths: Iterable[Path],
+    workers: Optional[int] = None,
+    executor: str = "process",
+    max_in_flight: Optional[int] = None,
+) -> Iterator[Tuple[Path, Any]]:
+    """
+    Runs a task on many files in parallel in a pool of worker processes or threads.
+
+    The pool is created with `create_task_pool`, which sends the task to each worker once
+    when it starts, so any data bound to it (for example a schema, with
+    `functools.partial`) is not sent again with every file. Results are yielded as soon
+    as each file is done, so they may be in a different order than `file_paths`. At most
+    `max_in_flight` files are submitted to the pool at any time, so `file_paths` may be a
+    long or lazy iterable.
+
+    Parameters
+    ----------
+    task : Callable[[Path], Any]
+        The function to run on each file. It must be picklable to use worker processes.
+    file_paths : Iterable[Path]
+        The paths to the files.
+    workers : Optional[int], default None
+        The number of worker processes or threads. If None, the number of CPUs is used.
+    executor : str, default "process"
+        The type of worker pool, either "process" or "thread".
+    max_in_flight : Optional[int], default None
+        The maximum number of files submitted to the pool at once. If None, twice the
+        number of workers is used.
+
+    Yields
+    ------
+    result : Tuple[Path, Any]
+        The path of each file and the result of the task on it.
+
+    Raises
+    ------
+    ValueError: If `executor` is not a known type of worker pool, or `workers` or
+        `max_in_flight` are not positive.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be positive.")
+
+    pool, run_task = create_task_pool(task, workers=workers, executor=executor)
+    with pool:
+        file_paths = iter(file_paths)
+        in_flight = {}
+        while True:
+            # Keep the pool busy, up to the limit of files in flight
+            for file_path in file_paths:
+                in_flight[pool.submit(run_task, file_path)] = file_path
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield in_flight.pop(future), future.result()
+
+
+def validate_files(
+    file_paths: Iterable[Path],
+    workers: Optional[int] = None,
+    executor: str = "process",
+    max_in_flight: Optional[int] = None,
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    header_only: bool = False,
+    raw_cards: bool = False,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+) -> Iterator[Tuple[Path, Union[List[str], List[Finding]]]]:
+    """
+    Validates many FITS files in parallel against the SOLARNET schema requirements.
+
+    Files are validated with `~solarnet_metadata.validation.validate_file` in a pool of
+    worker processes or threads with `map_files`. The schema and validation options are
+    sent to each worker once when it starts. Results are yielded as soon as each file is
+    validated, so they may be in a different order than `file_paths`. At most
+    `max_in_flight` files are submitted to the pool at any time, so `file_paths` may be a
+    long or lazy iterable.
+
+    Files that cannot be read are reported with a single finding rather than raising an
+    exception, so one bad file does not stop the validation of the others.
+
+    Parameters
+    ----------
+    file_paths : Iterable[Path]
+        The paths to the FITS files to validate.
+    workers : Optional[int], default None
+        The number of worker processes or threads. If None, the number of CPUs is used.
+    executor : str, default "process"
+        The type of worker pool, either "process" or "thread".
+    max_in_flight : Optional[int], default None
+        The maximum number of files submitted to the pool at once. If None, twice the
+        number of workers is used.
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    header_only : bool, default False
+        Whether to read only the headers of the files. See `validate_file`.
+    raw_cards : bool, default False
+        Whether to validate the raw header cards of the files. See `validate_file`.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers, shared by all workers.
+        See `~solarnet_metadata.cache.ValidationCache`.
+
+    Yields
+    ------
+    result : Tuple[Path, Union[List[str], List[Finding]]]
+        The path of each file and the list of validation issues found in it.
+
+    Raises
+    ------
+    ValueError: If `executor` is not a known type of worker pool, or `workers` or
+        `max_in_flight` are not positive.
+    """
+    # Check if Custom Schema is provided
+    if schema is None or not isinstance(schema, SOLARNETSchema):
+        # Use the shared default schema
+        schema = get_schema()
+
+    task = partial(
+        _validate_file_safe,
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+        header_only=header_only,
+        raw_cards=raw_cards,
+        structured=structured,
+        cache=cache,
+    )
+    yield from map_files(
+        task,
+        file_paths,
+        workers=workers,
+        executor=executor,
+        max_in_flight=max_in_flight,
+    )
@@ -0,0 +1,175 @@
+"""
+This module provides a persistent cache of validation findings, keyed by the content of
+the validated headers.
+
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from solarnet_metadata import __version__
+from solarnet_metadata.findings import Finding
+from solarnet_metadata.schema import SOLARNETSchema
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ValidationCache"]
+
+
+class ValidationCache:
+    """
+    Class representing a persistent cache of validation findings in an SQLite database.
+
+    Findings are cached for each validated header, keyed by a hash of the raw header
+    bytes, the fingerprint of the schema, the validation options and the package version. A
+    header that is byte-identical to one validated before with the same schema and options
+    is not validated again. Editing the schema layer files changes the content of the
+    schema, so findings cached for the previous schema are no longer used.
+
+    The cache can be shared by several threads and processes, and is re-opened in each
+    worker process when it is sent to a process pool.
+
+    Parameters
+    ----------
+    path : `Path`
+        The path to the SQLite database file. It is created if it does not exist.
+    timeout : `float`, default 30.0
+        The number of seconds to wait for another process writing to the database.
+
+    Examples
+    --------
+    >>> from solarnet_metadata.cache import ValidationCache
+    >>> from solarnet_metadata.validation import validate_file
+    >>> cache = ValidationCache("findings.sqlite")  # doctest: +SKIP
+    >>> findings = validate_file("my_file.fits", cache=cache)  # doctest: +SKIP
+    """
+
+    def __init__(self, path: Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Function to get the connection to the database, opening it on first use.
+        """
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS findings (key TEXT PRIMARY KEY, findings TEXT)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def make_key(
+        self, header_bytes: bytes, schema: SOLARNETSchema, **options: Any
+    ) -> str:
+        """
+        Function to get the cache key of a header validated with a schema and options.
+
+        Parameters
+        ----------
+        header_bytes : `bytes`
+            The raw bytes of the header.
+        schema : `SOLARNETSchema`
+            The schema the header is validated against.
+        **options : `Any`
+            The validation options, e.g. `is_primary` and the `warn_*` flags.
+
+        Returns
+        -------
+        key : `str`
+            The hex digest identifying the header, schema and options.
+        """
+        digest = hashlib.sha256()
+        context = [__version__, schema.fingerprint, sorted(options.items())]
+        digest.update(json.dumps(context).encode("utf-8"))
+        digest.update(bytes(header_bytes))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Finding]]:
+        """
+        Function to get the cached findings for a key.
+
+        Parameters
+        ----------
+        key : `str`
+            The cache key, as returned by `make_key`.
+
+        Returns
+        -------
+        findings : `Optional[List[Finding]]`
+            The cached findings, or None if the key is not in the cache.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT findings FROM findings WHERE key = ?", (key,))
+                .fetchone()
+            )
+        if row is None:
+            return None
+        return [Finding.from_dict(data) for data in json.loads(row[0])]
+
+    def set(self, key: str, findings: List[Finding]) -> None:
+        """
+        Function to cache the findings for a key.
+
+        Parameters
+        ----------
+        key : `str`
+            The cache key, as returned by `make_key`.
+        findings : `List[Finding]`
+            The findings to cache.
+        """
+        data = json.dumps([finding.to_dict() for finding in findings])
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO findings (key, findings) VALUES (?, ?)",
+                (key, data),
+            )
+
+    def clear(self) -> None:
+        """
+        Function to remove all of the cached findings.
+        """
+        with self._lock:
+            self._connect().execute("DELETE FROM findings")
+
+    def close(self) -> None:
+        """
+        Function to close the connection to the database. It is re-opened when needed.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                self._connect().execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+            )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Connections and locks cannot be sent to other processes
+        return {"path": self.path, "timeout": self.timeout}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"ValidationCache({str(self.path)!r})"
@@ -0,0 +1,331 @@
+"""
+This module provides the ``solarnet-validate`` command-line interface to validate
+FITS files against the SOLARNET schema.
+
+"""
+
+import argparse
+import glob
+import json
+import logging
+import sys
+import time
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple, Union
+
+from solarnet_metadata import __version__
+from solarnet_metadata.batch import EXECUTOR_TYPES, map_files
+from solarnet_metadata.cache import ValidationCache
+from solarnet_metadata.findings import Finding
+from solarnet_metadata.headers import CARD_SIZE
+from solarnet_metadata.schema import get_schema
+from solarnet_metadata.validation import iter_file_headers, validate_file_headers
+
+if TYPE_CHECKING:
+    from astropy.io import fits
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["main", "find_files"]
+
+DEFAULT_FILE_PATTERNS = ("*.fits", "*.fit", "*.fts")
+
+
+def find_files(
+    paths: List[str],
+    recursive: bool = False,
+    patterns: Tuple[str, ...] = DEFAULT_FILE_PATTERNS,
+) -> Iterator[Path]:
+    """
+    Function to find the FITS files to validate from a list of files, directories and
+    glob patterns.
+
+    Files are yielded lazily, so the validation can start before all of the files
+    have been found. Each file is yielded once, even if it is matched by several paths.
+
+    Parameters
+    ----------
+    paths : `List[str]`
+        The files, directories and glob patterns to search.
+    recursive : `bool`, default False
+        Whether to search directories recursively. For glob patterns, this enables
+        the ``**`` pattern to match any number of directories.
+    patterns : `Tuple[str, ...]`
+        The file name patterns of FITS files to find in directories.
+
+    Yields
+    ------
+    file_path : `Path`
+        The path of each file found.
+    """
+    seen = set()
+    for file_path in _iter_paths(paths, recursive=recursive, patterns=patterns):
+        resolved_path = file_path.resolve()
+        if resolved_path in seen:
+            continue
+        seen.add(resolved_path)
+        yield file_path
+
+
+def _iter_paths(
+    paths: List[str], recursive: bool, patterns: Tuple[str, ...]
+) -> Iterator[Path]:
+    """
+    Iterates over the files matched by each of the paths. See `find_files`.
+    """
+    for path in paths:
+        if Path(path).is_dir():
+            for pattern in patterns:
+                if recursive:
+                    yield from Path(path).rglob(pattern)
+                else:
+                    yield from Path(path).glob(pattern)
+        elif glob.has_magic(path):
+            for match in glob.iglob(path, recursive=recursive):
+                if Path(match).is_dir():
+                    yield from _iter_paths(
+                        [match], recursive=recursive, patterns=patterns
+                    )
+                else:
+                    yield Path(match)
+        else:
+            yield Path(path)
+
+
+class _CardCounter:
+    """
+    Counts the header cards of the headers of a file as they are validated, so the file
+    is only read once.
+    """
+
+    def __init__(self, headers: Iterable[Union["fits.Header", bytes]]):
+        self.headers = headers
+        self.n_cards = 0
+
+    def __iter__(self) -> Iterator[Union["fits.Header", bytes]]:
+        for header in self.headers:
+            if isinstance(header, (bytes, bytearray)):
+                self.n_cards += len(header) // CARD_SIZE
+            else:
+                self.n_cards += len(header)
+            yield header
+
+
+def _validate_file_with_stats(
+    file_path: Path, header_only: bool = False, raw_cards: bool = False, **kwargs
+) -> Tuple[List[Finding], int]:
+    """
+    Validate a file, and count the number of header cards in it.
+    """
+    headers = _CardCounter(
+        iter_file_headers(file_path, header_only=header_only, raw_cards=raw_cards)
+    )
+    try:
+        findings = validate_file_headers(headers, structured=True, **kwargs)
+    except Exception as e:
+        return [Finding("unreadable-file", args=(e,))], 0
+    return findings, headers.n_cards
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="solarnet-validate",
+        description=(
+            "Validate FITS files against the SOLARNET metadata schema. Findings are "
+            "written as JSON Lines, one record per file with the code, severity, HDU, "
+            "keyword and message of each finding, followed by a summary record with "
+            "the validation throughput on stderr."
+        ),
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="FITS files, directories or glob patterns to validate.",
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Search directories recursively, and allow ** in glob patterns.",
+    )
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        dest="patterns",
+        help=(
+            "File name pattern of FITS files to find in directories. May be given more "
+            f"than once. Defaults to {', '.join(DEFAULT_FILE_PATTERNS)}."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files to validate in parallel. Defaults to 1.",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=EXECUTOR_TYPES,
+        default="process",
+        help="Type of worker pool used to validate files in parallel.",
+    )
+    parser.add_argument(
+        "--warn-empty-keyword",
+        action="store_true",
+        help="Report warnings for empty keywords.",
+    )
+    parser.add_argument(
+        "--warn-no-comment",
+        action="store_true",
+        help="Report warnings for keywords missing comments.",
+    )
+    parser.add_argument(
+        "--warn-data-type",
+        action="store_true",
+        help="Validate and report warnings about incorrect data types.",
+    )
+    parser.add_argument(
+        "--warn-missing-optional",
+        action="store_true",
+        help="Report warnings for optional keywords that aren't included.",
+    )
+    parser.add_argument(
+        "--schema-layer",
+        action="append",
+        dest="schema_layers",
+        type=Path,
+        help="Schema layer file to add on top of the schema. May be given more than once.",
+    )
+    parser.add_argument(
+        "--no-defaults",
+        action="store_true",
+        help="Do not use the default SOLARNET schema as the base schema layer.",
+    )
+    parser.add_argument(
+        "--header-only",
+        action="store_true",
+        help="Read only the headers of the files, skipping the HDU data.",
+    )
+    parser.add_argument(
+        "--raw-cards",
+        action="store_true",
+        help="Validate the raw header cards from a memory map of the files.",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help=(
+            "SQLite file to cache the findings of each header in. Headers that are "
+            "byte-identical to a cached header are not validated again."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="File to write the findings to. Defaults to stdout.",
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the ``solarnet-validate`` command.
+
+    Parameters
+    ----------
+    argv : `Optional[List[str]]`
+        The command-line arguments. If None, the arguments of the process are used.
+
+    Returns
+    -------
+    exit_code : `int`
+        0 if no issues were found in any of the files, 1 if issues were found, or 2 if
+        the arguments were invalid.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    try:
+        schema = get_schema(
+            schema_layers=args.schema_layers, use_defaults=not args.no_defaults
+        )
+    except (OSError, ValueError) as e:
+        parser.error(f"Could not load schema: {e}")
+
+    task = partial(
+        _validate_file_with_stats,
+        warn_empty_keyword=args.warn_empty_keyword,
+        warn_no_comment=args.warn_no_comment,
+        warn_data_type=args.warn_data_type,
+        warn_missing_optional=args.warn_missing_optional,
+        schema=schema,
+        header_only=args.header_only,
+        raw_cards=args.raw_cards,
+        cache=ValidationCache(args.cache) if args.cache else None,
+    )
+    file_paths = find_files(
+        args.paths,
+        recursive=args.recursive,
+        patterns=tuple(args.patterns) if args.patterns else DEFAULT_FILE_PATTERNS,
+    )
+
+    n_files = 0
+    n_files_with_findings = 0
+    n_findings = 0
+    n_findings_by_code = Counter()
+    n_cards = 0
+    start_time = time.perf_counter()
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        # Validate in this process when not running in parallel
+        results = (
+            map_files(task, file_paths, workers=args.jobs, executor=args.executor)
+            if args.jobs > 1
+            else ((file_path, task(file_path)) for file_path in file_paths)
+        )
+        for file_path, (findings, file_cards) in results:
+            n_files += 1
+            n_files_with_findings += bool(findings)
+            n_findings += len(findings)
+            n_findings_by_code.update(finding.code for finding in findings)
+            n_cards += file_cards
+            record = {
+                "file": str(file_path),
+                "valid": not findings,
+                "findings": [finding.to_dict() for finding in findings],
+            }
+            output.write(json.dumps(record) + "\n")
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = time.perf_counter() - start_time
+    summary = {
+        "files": n_files,
+        "files_with_findings": n_files_with_findings,
+        "findings": n_findings,
+        "findings_by_code": dict(n_findings_by_code),
+        "cards": n_cards,
+        "elapsed": elapsed,
+        "files_per_second": n_files / elapsed if elapsed > 0 else None,
+        "cards_per_second": n_cards / elapsed if elapsed > 0 else None,
+    }
+    sys.stderr.write(json.dumps({"summary": summary}) + "\n")
+
+    return 1 if n_files_with_findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
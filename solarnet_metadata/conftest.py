@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path, monkeypatch):
+    """Keep the compiled schema files written by the tests out of the user cache"""
+    cache_directory = tmp_path / "solarnet_metadata_cache"
+    monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", str(cache_directory))
+    return cache_directory
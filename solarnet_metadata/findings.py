@@ -0,0 +1,230 @@
+"""
+This module provides the structured findings reported by the validation functions.
+
+"""
+
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+__all__ = ["FindingSeverity", "Finding", "FINDING_MESSAGES", "FINDING_SEVERITIES"]
+
+
+class FindingSeverity(Enum):
+    """
+    Enum to represent the severity of a validation finding.
+
+    Valid values are:
+    - `error`: The header does not meet the SOLARNET requirements.
+    - `warning`: The header could be improved, reported by the optional `warn_*` checks.
+    """
+
+    ERROR = "error"
+    WARNING = "warning"
+
+
+# Message templates for each finding code. `{keyword}` is the keyword of the finding and
+# `{0}`, `{1}` are the additional arguments of the finding.
+FINDING_MESSAGES = {
+    "invalid-obs-hdu": "Invalid OBS_HDU value: {0}. Must be 0 or 1.",
+    "missing-required": "Missing Required Attribute: {keyword}",
+    "missing-required-pattern": "Missing Required Attribute: {keyword}. No pattern match for {keyword} with pattern {0}",
+    "missing-conditional": "Missing Conditionally Required Attribute: {keyword}. Required when {0} is '{1}'",
+    "missing-conditional-pattern": "Missing Conditionally Required Attribute: {keyword}. Required when {0} is '{1}'. No pattern match for {keyword} with pattern {2}",
+    "missing-optional": "Missing Optional Attribute: {keyword}",
+    "missing-optional-pattern": "Missing Optional Attribute: {keyword}. No pattern match for {keyword} with pattern {0}",
+    "empty-keyword": "Invalid keyword '{keyword}': Must be 1-8 characters, containing only A-Z, 0-9, -, _.",
+    "invalid-keyword": "Invalid keyword '{keyword}': Must be 1-8 characters, containing only A-Z, 0-9, -, _.",
+    "no-comment": "Keyword '{keyword}' has no comment.",
+    "value-not-string": "Value for '{keyword}' cannot be cast to a string: {0}",
+    "comment-not-string": "Comment for '{keyword}' must be a string (got {0}).",
+    "card-too-long": "FITS card for '{keyword}' exceeds 80 characters (length: {0}).",
+    "invalid-value": "Value '{0}' for keyword '{keyword}' is not in the list of valid values: {1}.",
+    "unknown-keyword": "Keyword '{keyword}' not found in the schema. Cannot Validate Data Type.",
+    "no-data-type": "Keyword '{keyword}' has no data type. Cannot Validate Data Type.",
+    "unknown-data-type": "Unknown data type '{0}' for keyword '{keyword}'.",
+    "invalid-data-type": "Value for '{keyword}' cannot be cast to data type '{0}': {1}",
+    "unreadable-file": "Could not validate file: {0}",
+}
+
+# Severity of each finding code
+FINDING_SEVERITIES = {
+    "invalid-obs-hdu": FindingSeverity.ERROR,
+    "missing-required": FindingSeverity.ERROR,
+    "missing-required-pattern": FindingSeverity.ERROR,
+    "missing-conditional": FindingSeverity.ERROR,
+    "missing-conditional-pattern": FindingSeverity.ERROR,
+    "missing-optional": FindingSeverity.WARNING,
+    "missing-optional-pattern": FindingSeverity.WARNING,
+    "empty-keyword": FindingSeverity.WARNING,
+    "invalid-keyword": FindingSeverity.ERROR,
+    "no-comment": FindingSeverity.WARNING,
+    "value-not-string": FindingSeverity.ERROR,
+    "comment-not-string": FindingSeverity.ERROR,
+    "card-too-long": FindingSeverity.ERROR,
+    "invalid-value": FindingSeverity.ERROR,
+    "unknown-keyword": FindingSeverity.WARNING,
+    "no-data-type": FindingSeverity.WARNING,
+    "unknown-data-type": FindingSeverity.WARNING,
+    "invalid-data-type": FindingSeverity.WARNING,
+    "unreadable-file": FindingSeverity.ERROR,
+}
+
+
+class Finding:
+    """
+    Class representing a single validation finding.
+
+    Findings are compact records of the issue found, and the message describing the issue
+    is only formatted when it is first needed. This makes it cheap to count and aggregate
+    findings, for example by `code` or `keyword`, across many headers and files.
+
+    Parameters
+    ----------
+    code : `str`
+        The code of the finding, one of the keys of `FINDING_MESSAGES`.
+    keyword : `Optional[str]`
+        The keyword the finding is about, if any.
+    args : `Tuple[Any, ...]`
+        The additional arguments used to format the message of the finding.
+    hdu : `Optional[int]`
+        The index of the HDU the finding is in, or None for findings in a single header.
+    severity : `Optional[FindingSeverity]`
+        The severity of the finding. Defaults to the severity of the `code`.
+    message : `Optional[str]`
+        The message of the finding. Defaults to formatting the message template of the
+        `code` when the message is first needed.
+
+    Examples
+    --------
+    >>> from solarnet_metadata.findings import Finding
+    >>> finding = Finding("missing-required", keyword="AUTHOR", hdu=0)
+    >>> finding.message
+    'Missing Required Attribute: AUTHOR'
+    >>> str(finding)
+    'Primary Header: Missing Required Attribute: AUTHOR'
+    """
+
+    __slots__ = ("code", "keyword", "args", "hdu", "severity", "_message")
+
+    def __init__(
+        self,
+        code: str,
+        keyword: Optional[str] = None,
+        args: Tuple[Any, ...] = (),
+        hdu: Optional[int] = None,
+        severity: Optional[FindingSeverity] = None,
+        message: Optional[str] = None,
+    ):
+        self.code = code
+        self.keyword = keyword
+        self.args = args
+        self.hdu = hdu
+        self.severity = (
+            severity
+            if severity is not None
+            else FINDING_SEVERITIES.get(code, FindingSeverity.ERROR)
+        )
+        self._message = message
+
+    @property
+    def message(self) -> str:
+        """(`str`) The message describing the finding, without the HDU."""
+        if self._message is None:
+            self._message = FINDING_MESSAGES[self.code].format(
+                *self.args, keyword=self.keyword
+            )
+        return self._message
+
+    @property
+    def hdu_name(self) -> Optional[str]:
+        """(`str`) The name of the header the finding is in, or None."""
+        if self.hdu is None:
+            return None
+        if self.hdu == 0:
+            return "Primary Header"
+        return f"Observation Header {self.hdu}"
+
+    def with_hdu(self, hdu: Optional[int]) -> "Finding":
+        """
+        Function to get a copy of the finding in the given HDU.
+
+        Parameters
+        ----------
+        hdu : `Optional[int]`
+            The index of the HDU the finding is in.
+
+        Returns
+        -------
+        finding : `Finding`
+            A copy of the finding with the given HDU.
+        """
+        return Finding(
+            self.code,
+            keyword=self.keyword,
+            args=self.args,
+            hdu=hdu,
+            severity=self.severity,
+            message=self._message,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Function to get a JSON-serializable dictionary representation of the finding.
+
+        Returns
+        -------
+        finding : `Dict[str, Any]`
+            The code, severity, HDU, keyword and message of the finding.
+        """
+        return {
+            "code": self.code,
+            "severity": self.severity.value,
+            "hdu": self.hdu,
+            "keyword": self.keyword,
+            "message": self.message,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Finding":
+        """
+        Function to create a finding from its dictionary representation.
+
+        Parameters
+        ----------
+        data : `Dict[str, Any]`
+            The dictionary representation of the finding, as returned by `to_dict`.
+
+        Returns
+        -------
+        finding : `Finding`
+            The finding.
+        """
+        return cls(
+            data["code"],
+            keyword=data.get("keyword", None),
+            hdu=data.get("hdu", None),
+            severity=FindingSeverity(data["severity"]),
+            message=data["message"],
+        )
+
+    def _key(self) -> tuple:
+        return (self.code, self.severity, self.hdu, self.keyword, self.message)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __str__(self) -> str:
+        if self.hdu is None:
+            return self.message
+        return f"{self.hdu_name}: {self.message}"
+
+    def __repr__(self) -> str:
+        return (
+            f"Finding(code={self.code!r}, severity={self.severity.value!r}, "
+            f"hdu={self.hdu!r}, keyword={self.keyword!r}, message={self.message!r})"
+        )
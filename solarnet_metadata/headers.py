@@ -0,0 +1,459 @@
+"""
+This module provides functions to read FITS headers without loading the HDU data.
+
+"""
+
+import logging
+import mmap
+import re
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from astropy.io import fits
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "BLOCK_SIZE",
+    "CARD_SIZE",
+    "read_header_bytes",
+    "get_data_size",
+    "iter_header_bytes",
+    "iter_headers",
+    "iter_raw_headers",
+    "is_compressed_image",
+    "parse_card",
+    "parse_header_cards",
+]
+
+# Size of a FITS logical record, in bytes
+BLOCK_SIZE = 2880
+# Size of a FITS header card, in bytes
+CARD_SIZE = 80
+
+_END_CARD = b"END" + b" " * 5
+
+# Keywords describing the size of the HDU data
+_STRUCTURAL_KEYWORDS = {b"BITPIX", b"NAXIS", b"PCOUNT", b"GCOUNT", b"GROUPS"}
+# Extensions storing tile-compressed images, marked by `ZIMAGE = T`
+_COMPRESSED_IMAGE_XTENSIONS = ("BINTABLE", "A3DTABLE")
+# Keywords parsed as commentary cards, without a value indicator
+_COMMENTARY_KEYWORDS = {"COMMENT", "HISTORY", ""}
+
+_KEYWORD_RE = re.compile(r"[A-Z0-9_-]*")
+_INT_RE = re.compile(r"[+-]?[0-9]+")
+_FLOAT_RE = re.compile(r"[+-]?(\.[0-9]+|[0-9]+(\.[0-9]*)?)([DE][+-]?[0-9]+)?")
+_PRINTABLE_RE = re.compile(r"[ -~]*")
+
+
+def read_header_bytes(fileobj: BinaryIO) -> Optional[bytes]:
+    """
+    Function to read the raw bytes of the next FITS header from a file.
+
+    The file is read one 2880-byte block at a time until the block containing the `END`
+    card. The file is left positioned at the start of the data following the header.
+
+    Parameters
+    ----------
+    fileobj : `BinaryIO`
+        A binary file object positioned at the start of a FITS header.
+
+    Returns
+    -------
+    header_bytes : `bytes` | `None`
+        The raw header blocks, including the `END` card and the padding after it, or None
+        if the end of the file was reached before any header block.
+
+    Raises
+    ------
+    OSError: If the file ends before the `END` card of the header.
+    """
+    blocks = []
+    while True:
+        block = fileobj.read(BLOCK_SIZE)
+        if not block:
+            if blocks:
+                raise OSError("FITS header is missing the END card.")
+            return None
+        if len(block) < BLOCK_SIZE:
+            raise OSError(
+                f"FITS header block is truncated ({len(block)} of {BLOCK_SIZE} bytes)."
+            )
+        blocks.append(block)
+        # The END card must start at the beginning of a card
+        for offset in range(0, BLOCK_SIZE, CARD_SIZE):
+            if block.startswith(_END_CARD, offset):
+                return b"".join(blocks)
+
+
+def get_data_size(header) -> int:
+    """
+    Function to compute the size of the data following a FITS header, including padding.
+
+    The size is computed from the `BITPIX`, `NAXIS`, `NAXISn`, `PCOUNT`, `GCOUNT` and
+    `GROUPS` keywords following the FITS standard:
+    ``|BITPIX| * GCOUNT * (PCOUNT + NAXIS1 * ... * NAXISn) / 8``, rounded up to a whole
+    number of 2880-byte blocks. For random groups data `NAXIS1` is ignored.
+
+    Parameters
+    ----------
+    header : `fits.Header` | `dict`
+        The FITS header, or a mapping of its keywords to values.
+
+    Returns
+    -------
+    data_size : `int`
+        The number of bytes of data (and padding) following the header.
+    """
+    naxis = int(header.get("NAXIS", 0))
+    if naxis == 0:
+        return 0
+
+    first_axis = 1
+    if header.get("GROUPS", False) and int(header.get("NAXIS1", 0)) == 0:
+        # Random groups data does not count the first axis
+        first_axis = 2
+    n_elements = 1
+    for i in range(first_axis, naxis + 1):
+        n_elements *= int(header.get(f"NAXIS{i}", 0))
+
+    n_bits = (
+        abs(int(header.get("BITPIX", 8)))
+        * int(header.get("GCOUNT", 1))
+        * (int(header.get("PCOUNT", 0)) + n_elements)
+    )
+    n_bytes = (n_bits + 7) // 8
+    # Pad to a whole number of blocks
+    return ((n_bytes + BLOCK_SIZE - 1) // BLOCK_SIZE) * BLOCK_SIZE
+
+
+def iter_header_bytes(fileobj: BinaryIO, name: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Function to iterate over the raw header bytes of each HDU in a binary file object.
+
+    Each header is read block by block with `read_header_bytes`, and the data following it
+    is skipped by seeking past it, using the structural keywords parsed from the raw
+    header. Only the headers are read from the file, so this works with any seekable file
+    object, e.g. a file on a network filesystem.
+
+    Parameters
+    ----------
+    fileobj : `BinaryIO`
+        A seekable binary file object positioned at the start of the primary header.
+    name : `Optional[str]`
+        The name of the file, used in error messages.
+
+    Yields
+    ------
+    header_bytes : `bytes`
+        The raw header blocks of each HDU in the file, starting with the primary HDU.
+
+    Raises
+    ------
+    OSError: If the file does not start with a valid FITS primary header.
+    """
+    if name is None:
+        name = getattr(fileobj, "name", repr(fileobj))
+    index = 0
+    while True:
+        # Check the first keyword of the next HDU before reading its header
+        first_keyword = fileobj.read(8)
+        if not first_keyword and index > 0:
+            break
+        fileobj.seek(-len(first_keyword), 1)
+        expected_keyword = b"SIMPLE" if index == 0 else b"XTENSION"
+        if first_keyword.rstrip() != expected_keyword:
+            if index == 0:
+                raise OSError(f"Empty or corrupt FITS file: {name}")
+            logger.warning(f"Ignoring unexpected data after HDU {index - 1} in {name}.")
+            break
+
+        header_bytes = read_header_bytes(fileobj)
+        yield header_bytes
+
+        # Skip over the data of the HDU
+        fileobj.seek(get_data_size(_parse_structural_keywords(header_bytes)), 1)
+        index += 1
+
+
+def iter_headers(file_path: Path) -> Iterator["fits.Header"]:
+    """
+    Function to iterate over the headers of a FITS file without reading the HDU data.
+
+    Each header is read block by block, and the data following it is skipped by seeking
+    past it, so the amount of I/O scales with the size of the headers rather than the size
+    of the file.
+
+    Parameters
+    ----------
+    file_path : `Path`
+        The path to the FITS file.
+
+    Yields
+    ------
+    header : `fits.Header`
+        The header of each HDU in the file, starting with the primary HDU.
+
+    Raises
+    ------
+    OSError: If the file does not start with a valid FITS primary header.
+    """
+    from astropy.io import fits
+
+    with open(file_path, "rb") as f:
+        for header_bytes in iter_header_bytes(f, name=str(file_path)):
+            yield fits.Header.fromstring(header_bytes)
+
+
+def iter_raw_headers(file_path: Path) -> Iterator[bytes]:
+    """
+    Function to iterate over the raw header bytes of each HDU of a FITS file.
+
+    The file is memory-mapped, and the headers are located by scanning for the `END` card
+    of each header and skipping over the HDU data. Only the header bytes are copied out of
+    the memory map; the data is never read.
+
+    Parameters
+    ----------
+    file_path : `Path`
+        The path to the FITS file.
+
+    Yields
+    ------
+    header_bytes : `bytes`
+        The raw 80-byte cards of each header, up to and including the `END` card.
+
+    Raises
+    ------
+    OSError: If the file does not start with a valid FITS primary header, or a header
+        is missing its `END` card.
+    """
+    with open(file_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            raise OSError(f"Empty or corrupt FITS file: {file_path}")
+
+        with mm:
+            size = len(mm)
+            offset = 0
+            index = 0
+            while offset < size:
+                # Check the first keyword of the next HDU before reading its header
+                expected_keyword = b"SIMPLE" if index == 0 else b"XTENSION"
+                keyword_end = offset + 8
+                if mm[offset:keyword_end].rstrip() != expected_keyword:
+                    if index == 0:
+                        raise OSError(f"Empty or corrupt FITS file: {file_path}")
+                    logger.warning(
+                        f"Ignoring unexpected data after HDU {index - 1} in {file_path}."
+                    )
+                    break
+
+                # Find the END card of the header
+                end = mm.find(_END_CARD, offset)
+                while end != -1 and (end - offset) % CARD_SIZE != 0:
+                    end = mm.find(_END_CARD, end + 1)
+                if end == -1:
+                    raise OSError("FITS header is missing the END card.")
+                header_end = end + CARD_SIZE
+                header_bytes = mm[offset:header_end]
+                yield header_bytes
+
+                # Skip over the header padding and the data of the HDU
+                header_size = ((end - offset) // BLOCK_SIZE + 1) * BLOCK_SIZE
+                offset += header_size + get_data_size(
+                    _parse_structural_keywords(header_bytes)
+                )
+                index += 1
+
+
+def _iter_cards(header_bytes: bytes) -> Iterator[bytes]:
+    """
+    Function to split raw header bytes into 80-byte cards.
+    """
+    for card_start in range(0, len(header_bytes), CARD_SIZE):
+        card_end = card_start + CARD_SIZE
+        yield header_bytes[card_start:card_end]
+
+
+def is_compressed_image(header: Union[bytes, "fits.Header"]) -> bool:
+    """
+    Function to check whether a header is the binary table of a tile-compressed image.
+
+    `astropy.io.fits` presents these HDUs as images, with a header built from the `Z*`
+    keywords of the binary table (e.g. `ZBITPIX` and `ZNAXISn`), rather than the header
+    stored in the file.
+
+    Parameters
+    ----------
+    header : `Union[bytes, fits.Header]`
+        The raw 80-byte cards of the header, or the header read as a `fits.Header`.
+
+    Returns
+    -------
+    is_compressed : `bool`
+        True if the header is a binary table with `ZIMAGE = T`.
+    """
+    if not isinstance(header, bytes):
+        return (
+            header.get("XTENSION", None) in _COMPRESSED_IMAGE_XTENSIONS
+            and header.get("ZIMAGE", False) is True
+        )
+    if b"ZIMAGE" not in header:
+        return False
+    if parse_card(header[:CARD_SIZE])[1] not in _COMPRESSED_IMAGE_XTENSIONS:
+        return False
+    for card in _iter_cards(header):
+        if card[:8] == b"ZIMAGE  ":
+            return parse_card(card)[1] is True
+    return False
+
+
+def _parse_structural_keywords(header_bytes: bytes) -> dict:
+    """
+    Function to parse only the keywords needed to compute the size of the HDU data.
+    """
+    structural = {}
+    for card in _iter_cards(header_bytes):
+        keyword = card[:8].rstrip()
+        if keyword in _STRUCTURAL_KEYWORDS or (
+            keyword.startswith(b"NAXIS") and keyword[5:].isdigit()
+        ):
+            keyword, value, _ = parse_card(card)
+            structural.setdefault(keyword, value)
+    return structural
+
+
+def parse_card(card: bytes) -> Tuple[str, Any, str]:
+    """
+    Function to parse the keyword, value and comment of a raw 80-byte FITS card.
+
+    Common card formats (commentary cards, strings, logicals, integers and floats) are
+    parsed directly from the bytes. Any other card is parsed with `astropy.io.fits.Card`,
+    so the result is always the same as the keyword, value and comment of the
+    corresponding astropy card.
+
+    Parameters
+    ----------
+    card : `bytes`
+        The raw FITS card.
+
+    Returns
+    -------
+    card : `Tuple[str, Any, str]`
+        The keyword, value and comment of the card.
+    """
+    try:
+        text = card.decode("ascii")
+    except UnicodeDecodeError:
+        return _parse_card_astropy(card)
+    parsed = _parse_card_text(text) if _PRINTABLE_RE.fullmatch(text) else None
+    if parsed is None:
+        return _parse_card_astropy(card)
+    return parsed
+
+
+def _parse_card_astropy(card: bytes) -> Tuple[str, Any, str]:
+    """
+    Function to parse a raw FITS card with `astropy.io.fits.Card`.
+    """
+    from astropy.io import fits
+
+    astropy_card = fits.Card.fromstring(card)
+    return astropy_card.keyword, astropy_card.value, astropy_card.comment
+
+
+def _parse_card_text(text: str) -> Optional[Tuple[str, Any, str]]:
+    """
+    Function to parse a FITS card of printable ASCII characters, or return None if the
+    card is not in one of the common formats.
+    """
+    keyword = text[:8].rstrip(" ")
+    if not _KEYWORD_RE.fullmatch(keyword):
+        return None
+
+    # Commentary cards have the rest of the card as their value
+    if keyword in _COMMENTARY_KEYWORDS:
+        return keyword, text[8:].rstrip(" "), ""
+    if text[8:10] != "= ":
+        return None
+
+    field = text[10:].lstrip(" ")
+    if field.startswith("'"):
+        # Find the closing quote, skipping escaped (doubled) quotes
+        start = 1
+        while True:
+            end = field.find("'", start)
+            if end == -1:
+                return None
+            if not field.startswith("'", end + 1):
+                break
+            start = end + 2
+        value = field[1:end].replace("''", "'").rstrip(" ")
+        value_end = end + 1
+        rest = field[value_end:].lstrip(" ")
+        if rest and not rest.startswith("/"):
+            return None
+    else:
+        token, separator, rest = field.partition("/")
+        token = token.rstrip(" ")
+        rest = separator + rest
+        if token == "T":
+            value = True
+        elif token == "F":
+            value = False
+        elif _INT_RE.fullmatch(token):
+            value = int(token)
+        elif _FLOAT_RE.fullmatch(token):
+            value = float(token.replace("D", "E"))
+        else:
+            return None
+
+    comment = rest[1:].lstrip(" ").rstrip(" ") if rest else ""
+    return keyword, value, comment
+
+
+def parse_header_cards(header_bytes: bytes) -> List[Tuple[str, Any, str]]:
+    """
+    Function to parse the cards of a raw FITS header, up to the `END` card.
+
+    Each card is parsed with `parse_card`, without building astropy `Card` or `Header`
+    objects. Headers with long-string `CONTINUE` cards are parsed with
+    `astropy.io.fits.Header`.
+
+    Parameters
+    ----------
+    header_bytes : `bytes`
+        The raw FITS header, a sequence of 80-byte cards.
+
+    Returns
+    -------
+    cards : `List[Tuple[str, Any, str]]`
+        The keyword, value and comment of each card in the header, the same as iterating
+        over the `cards` of the corresponding `fits.Header`.
+    """
+    header_bytes = bytes(header_bytes)
+    raw_cards = []
+    for card in _iter_cards(header_bytes):
+        if card.startswith(_END_CARD):
+            break
+        if card.startswith(b"CONTINUE"):
+            # Long string values span several cards, let astropy join them together
+            from astropy.io import fits
+
+            header = fits.Header.fromstring(header_bytes)
+            return [(card.keyword, card.value, card.comment) for card in header.cards]
+        raw_cards.append(card)
+    return [parse_card(card) for card in raw_cards]
@@ -0,0 +1,261 @@
+"""
+This module provides a registry of schemas for many instruments, sharing the default
+schema between them.
+
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from solarnet_metadata.headers import iter_raw_headers, parse_header_cards
+from solarnet_metadata.schema import SOLARNETSchema, get_schema
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["SchemaRegistry"]
+
+# Keywords used to route a header to the schema of its instrument
+ROUTING_KEYWORDS = ("INSTRUME", "TELESCOP")
+
+
+def _normalize_route_value(value: Any) -> Optional[str]:
+    """
+    Function to normalize an `INSTRUME` or `TELESCOP` value for routing, ignoring case
+    and surrounding whitespace.
+    """
+    if value is None:
+        return None
+    value = str(value).strip().upper()
+    return value or None
+
+
+class SchemaRegistry:
+    """
+    Class representing a registry of the schemas of many instruments in one process.
+
+    Each instrument registers its own `schema_layers`, routed by the `INSTRUME` and
+    `TELESCOP` values of its headers. The schema for a set of layers is built on first
+    use with `~solarnet_metadata.schema.get_schema`, and the registry keeps at most
+    `max_size` schemas, evicting the least recently used. The schema layer files, including the default
+    schema, are loaded once per process and the parts of the default schema that an
+    instrument's layers do not change are shared by all of the schemas, so building a
+    schema for an instrument is cheap. A schema is built again if any of its layer files,
+    including the default schema, are modified on disk.
+
+    Headers are routed to the schema registered for both their `INSTRUME` and `TELESCOP`,
+    then for their `INSTRUME` alone, then for their `TELESCOP` alone, and otherwise to the
+    base schema. Values are compared ignoring case and surrounding whitespace.
+
+    This class is thread-safe. The returned schemas are shared and should not be modified.
+
+    Parameters
+    ----------
+    max_size : `int`, default 32
+        The maximum number of schemas to keep.
+    use_defaults : `bool`, default True
+        Whether the schemas are layered on top of the default SOLARNET schema.
+    schema_layers : `Optional[Sequence[Path]]`
+        Schema layer files used by all of the schemas, e.g. the keywords of an archive,
+        under the layers of each instrument.
+
+    Examples
+    --------
+    >>> from solarnet_metadata.registry import SchemaRegistry
+    >>> from solarnet_metadata.validation import validate_file
+    >>> registry = SchemaRegistry(max_size=8)
+    >>> registry.register(["crisp_layer.yaml"], instrument="CRISP")  # doctest: +SKIP
+    >>> schema = registry.schema_for_file("my_file.fits")  # doctest: +SKIP
+    >>> findings = validate_file("my_file.fits", schema=schema)  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        max_size: int = 32,
+        use_defaults: bool = True,
+        schema_layers: Optional[Sequence[Path]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be positive.")
+        if not use_defaults and not schema_layers:
+            raise ValueError(
+                "Not enough information to create schemas. You must either use the defaults or provide base layers for attribute schemas."
+            )
+        self.max_size = max_size
+        self.use_defaults = use_defaults
+        self.schema_layers = tuple(Path(path) for path in (schema_layers or ()))
+
+        # Layers of the schema for each (instrument, telescope) route
+        self._routes: Dict[Tuple[Optional[str], Optional[str]], Tuple[Path, ...]] = {}
+        # Schemas used for each set of layers, in order of least to most recently used
+        self._schemas: "OrderedDict[Tuple[Path, ...], SOLARNETSchema]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        schema_layers: Sequence[Path],
+        instrument: Optional[str] = None,
+        telescope: Optional[str] = None,
+    ) -> None:
+        """
+        Function to register the schema layers of an instrument.
+
+        The schema is not built until it is first needed. Registering layers for the same
+        `instrument` and `telescope` again replaces the previous layers.
+
+        Parameters
+        ----------
+        schema_layers : `Sequence[Path]`
+            The schema layer files of the instrument, layered on top of the base layers of
+            the registry.
+        instrument : `Optional[str]`
+            The `INSTRUME` value of the headers to validate with these layers.
+        telescope : `Optional[str]`
+            The `TELESCOP` value of the headers to validate with these layers.
+
+        Raises
+        ------
+        ValueError: If neither `instrument` nor `telescope` is given.
+        FileNotFoundError: If any of the schema layer files do not exist.
+        """
+        route = (_normalize_route_value(instrument), _normalize_route_value(telescope))
+        if route == (None, None):
+            raise ValueError("Either instrument or telescope must be given.")
+        layers = tuple(Path(path) for path in schema_layers)
+        for path in layers:
+            if not path.exists():
+                raise FileNotFoundError(f"Cannot find YAML file: {path}")
+        with self._lock:
+            self._routes[route] = layers
+
+    def get_schema(
+        self, schema_layers: Optional[Sequence[Path]] = None
+    ) -> SOLARNETSchema:
+        """
+        Function to get the schema for the given layers, on top of the base layers of the
+        registry, building it if it is not in the registry.
+
+        Parameters
+        ----------
+        schema_layers : `Optional[Sequence[Path]]`
+            The schema layer files. If None, the base schema is returned.
+
+        Returns
+        -------
+        schema : `SOLARNETSchema`
+            The shared schema for the given layers.
+        """
+        layer_paths = self.schema_layers + tuple(
+            Path(path) for path in (schema_layers or ())
+        )
+        key = tuple(path.resolve() for path in layer_paths)
+        # The shared schema cache builds the schema, and builds it again if any of the
+        # layer files, including the default schema, are modified
+        schema = get_schema(schema_layers=list(key), use_defaults=self.use_defaults)
+
+        with self._lock:
+            # Evict the Least Recently Used Schemas from the registry only, as the shared
+            # schema cache is used by other callers
+            self._schemas[key] = schema
+            self._schemas.move_to_end(key)
+            while len(self._schemas) > self.max_size:
+                evicted, _ = self._schemas.popitem(last=False)
+                logger.debug(f"Evicted schema for layers {evicted} from the registry")
+            return schema
+
+    def get_schema_layers(
+        self, instrument: Optional[str] = None, telescope: Optional[str] = None
+    ) -> Tuple[Path, ...]:
+        """
+        Function to get the schema layers registered for an instrument and telescope.
+
+        Parameters
+        ----------
+        instrument : `Optional[str]`
+            The `INSTRUME` value of a header.
+        telescope : `Optional[str]`
+            The `TELESCOP` value of a header.
+
+        Returns
+        -------
+        schema_layers : `Tuple[Path, ...]`
+            The registered schema layers, or an empty tuple to use the base schema.
+        """
+        instrument = _normalize_route_value(instrument)
+        telescope = _normalize_route_value(telescope)
+        routes = [(instrument, telescope), (instrument, None), (None, telescope)]
+        with self._lock:
+            for route in routes:
+                if route != (None, None) and route in self._routes:
+                    return self._routes[route]
+        return ()
+
+    def schema_for_header(self, header: Mapping[str, Any]) -> SOLARNETSchema:
+        """
+        Function to get the schema for a header, routed by its `INSTRUME` and `TELESCOP`.
+
+        Parameters
+        ----------
+        header : `Mapping[str, Any]`
+            The header, e.g. a `fits.Header`, or a dictionary of keyword values.
+
+        Returns
+        -------
+        schema : `SOLARNETSchema`
+            The schema registered for the instrument and telescope of the header, or the
+            base schema.
+        """
+        instrument, telescope = (
+            header.get(keyword, None) for keyword in ROUTING_KEYWORDS
+        )
+        return self.get_schema(self.get_schema_layers(instrument, telescope))
+
+    def schema_for_file(self, file_path: Path) -> SOLARNETSchema:
+        """
+        Function to get the schema for a FITS file, routed by the `INSTRUME` and
+        `TELESCOP` of its primary header.
+
+        Only the raw cards of the primary header are read, without opening the file with
+        `astropy.io.fits`.
+
+        Parameters
+        ----------
+        file_path : `Path`
+            The path to the FITS file.
+
+        Returns
+        -------
+        schema : `SOLARNETSchema`
+            The schema registered for the instrument and telescope of the file, or the
+            base schema.
+        """
+        raw_headers = iter_raw_headers(file_path)
+        try:
+            primary_header_bytes = next(raw_headers, b"")
+        finally:
+            raw_headers.close()
+        header = {}
+        for keyword, value, _ in parse_header_cards(primary_header_bytes):
+            if keyword in ROUTING_KEYWORDS and keyword not in header:
+                header[keyword] = value
+        return self.schema_for_header(header)
+
+    def clear(self) -> None:
+        """
+        Function to remove all of the built schemas from the registry. The registered
+        schema layers are kept.
+        """
+        with self._lock:
+            self._schemas.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._schemas)
+
+    def __repr__(self) -> str:
+        return (
+            f"SchemaRegistry(max_size={self.max_size}, "
+            f"use_defaults={self.use_defaults}, routes={len(self._routes)})"
+        )
@@ -3,23 +3,59 @@ This module provides schema metadata templates an information.
 
 """
 
+import hashlib
+import json
 import logging
+import os
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-import astropy.io.fits as fits
-from astropy.table import Table
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from solarnet_metadata import data_directory
 from solarnet_metadata.util import DATA_TYPE_MAP, KeywordRequirement, load_yaml_data
 
+if TYPE_CHECKING:
+    # astropy is slow to import and not needed for schema lookups or validation, so the
+    # modules of this package import it only in the functions that use it
+    import astropy.io.fits as fits
+
 logger = logging.getLogger(__name__)
 
-__all__ = ["SOLARNETSchema"]
+__all__ = ["SOLARNETSchema", "get_schema", "clear_schema_cache"]
 
 DEFAULT_ATTRS_SCHEMA_FILE = "SOLARNET_attr_schema.yaml"
 
+# Process-wide registry of constructed schemas, keyed by the layer files used to build them
+_SCHEMA_CACHE: Dict[tuple, tuple] = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+# Process-wide registry of loaded schema layers, keyed by the resolved path of each layer
+# file, so that schemas built on the same layers share their (unmodified) structure
+_LAYER_CACHE: Dict[str, tuple] = {}
+_LAYER_CACHE_LOCK = threading.Lock()
+
+# Named groups in attribute patterns, e.g. `(?P<i>` in `CTYPE(?P<i>[1-9])(?P<a>[A-Z])?`
+_NAMED_GROUP_RE = re.compile(r"\(\?P<[A-Za-z_][A-Za-z0-9_]*>")
+# Back-references that cannot be safely merged into a combined pattern
+_BACKREF_RE = re.compile(r"\(\?P=|\\[1-9]")
+
+# Types of the lists in schema layers, which are tuples once the layers are frozen
+_LIST_TYPES = (list, tuple)
+
 
 class SOLARNETSchema:
     """
@@ -54,6 +90,14 @@ class SOLARNETSchema:
         Whether or not to load the default attribute schema files. These
         default schema files contain only the requirements for SOLARNET validation.
 
+    Notes
+    -----
+    Schema layers are loaded once per process and merged without modifying them, so the
+    parts of the `attribute_schema` that a layer does not change are shared with the layers
+    below it and with other schemas built on the same layers. The `attribute_schema` is
+    therefore read-only: its dictionaries are `types.MappingProxyType` views and its lists
+    are tuples.
+
     Examples
     --------
     >>> from solarnet_metadata.schema import SOLARNETSchema
@@ -87,38 +131,289 @@ class SOLARNETSchema:
         if schema_layers is not None:
             # Merge each successive custom layer on top of the existing schema
             for schema_layer_path in schema_layers:
-                attr_layer = load_yaml_data(yaml_file_path=schema_layer_path)
+                attr_layer = _load_schema_layer(schema_layer_path)
                 _attr_schema = self._merge(
                     base_layer=_attr_schema, new_layer=attr_layer
                 )
-        # Set Final Member
-        self._attr_schema = _attr_schema
+        # Set Final Member, freezing the parts created by merging the layers
+        self._attr_schema = _freeze(_attr_schema)
+
+        # Derived structures (e.g. compiled keyword indexes) built on first use
+        self._cache: Dict[Hashable, Any] = {}
+        self._cache_source: Optional[dict] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Read-only views cannot be pickled, e.g. to send the schema to worker processes,
+        # and derived structures are rebuilt on first use
+        return {"attr_schema": _thaw(self._attr_schema)}
 
-        # Load Default Attributes
-        self._default_attributes: fits.Header = self.load_default_attributes()
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._attr_schema = _freeze(state["attr_schema"])
+        self._cache = {}
+        self._cache_source = None
 
     @property
-    def attribute_schema(self) -> Dict[str, Any]:
-        """(`dict`) Schema for attributes of the file."""
+    def attribute_schema(self) -> Mapping[str, Any]:
+        """(`Mapping`) Schema for attributes of the file. Read-only."""
         return self._attr_schema
 
     @property
-    def attribute_key(self) -> Dict[str, Any]:
-        """(`dict`) The attribute_key section of the schema."""
+    def attribute_key(self) -> Mapping[str, Any]:
+        """(`Mapping`) The attribute_key section of the schema. Read-only."""
         return self._attr_schema.get("attribute_key", {})
 
     @property
-    def default_attributes(self) -> fits.Header:
-        """(`fits.Header`) Default Attributes applied for all Data Files"""
-        return self._default_attributes
+    def default_attributes(self) -> "fits.Header":
+        """
+        (`fits.Header`) Default Attributes applied for all Data Files
+
+        The header is built with `load_default_attributes` on first access, so schemas used
+        only for validation never build it.
+        """
+        return self._cached("default_attributes", self.load_default_attributes)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        (`str`) A stable hash of the content of the merged attribute schema.
+
+        Schemas with the same content have the same fingerprint, in any process or run.
+        The fingerprint does not depend on the order of the attributes in the schema, but
+        does depend on the order of the items of its lists (e.g. `valid_values` and
+        `conditional_requirements`), so schema layers that extend the same lists or set
+        conflicting values in a different order give different fingerprints. The
+        fingerprint is computed once per schema, which is read-only, and can be used to
+        key caches of structures derived from the schema.
+        """
+        return self._cached("fingerprint", self._build_fingerprint)
+
+    def _build_fingerprint(self) -> str:
+        """
+        Function to compute the fingerprint of the schema.
+
+        The attribute schema is serialized as JSON with sorted keys, so the fingerprint
+        does not depend on the order in which attributes were merged into the schema.
+        Lists are serialized in order, as their order is part of the schema.
+        """
+        content = json.dumps(self._attr_schema, sort_keys=True, default=_json_default)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _cached(self, name: Hashable, builder) -> Any:
+        """
+        Function to get a derived structure of the schema, building it on first use.
+
+        Derived structures are discarded if the attribute schema is replaced.
+        """
+        if self._cache_source is not self._attr_schema:
+            self._cache = {}
+            self._cache_source = self._attr_schema
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = builder()
+            self._cache[name] = value
+            return value
+
+    def _build_keyword_index(self) -> tuple:
+        """
+        Function to build the compiled index used to resolve keywords to schema attributes.
+
+        Returns
+        -------
+        index : `tuple`
+            A tuple of the individually compiled patterns for each attribute with a pattern
+            (`dict`), the combined alternation pattern (`re.Pattern` or `None` if the patterns
+            could not be combined), and the mapping of group names in the combined pattern to
+            attribute names (`dict`).
+        """
+        patterns = {
+            attr_name: info["pattern"]
+            for attr_name, info in self.attribute_key.items()
+            if isinstance(info, Mapping) and info.get("pattern", None)
+        }
+        compiled_patterns = {
+            attr_name: re.compile(pattern) for attr_name, pattern in patterns.items()
+        }
+
+        # Merge all patterns into a single alternation, with one named group per attribute.
+        # The named groups inside each pattern are made non-capturing so they do not conflict.
+        combined_pattern = None
+        group_names = {}
+        if patterns and not any(_BACKREF_RE.search(p) for p in patterns.values()):
+            alternatives = []
+            for i, (attr_name, pattern) in enumerate(patterns.items()):
+                group_name = f"_attr{i}"
+                group_names[group_name] = attr_name
+                alternatives.append(
+                    f"(?P<{group_name}>{_NAMED_GROUP_RE.sub('(?:', pattern)})"
+                )
+            try:
+                combined_pattern = re.compile("|".join(alternatives))
+            except re.error as e:
+                logger.debug(f"Could not combine attribute patterns: {e}")
+                combined_pattern = None
+                group_names = {}
+
+        return compiled_patterns, combined_pattern, group_names
+
+    def match_attribute(self, keyword: str) -> Optional[str]:
+        """
+        Function to resolve a keyword to the name of the schema attribute that describes it.
+
+        Keywords are first matched against attribute names exactly, then against the
+        attribute `pattern` entries (e.g. `CTYPE1A` matches the `CTYPEia` attribute).
+        If several patterns match, the first attribute in the schema is used.
+
+        Parameters
+        ----------
+        keyword : `str`
+            The keyword to resolve.
+
+        Returns
+        -------
+        attribute_name : `str` | `None`
+            The name of the matching attribute in the schema, or None if there is no match.
+        """
+        if keyword in self.attribute_key:
+            return keyword
+        return self.match_pattern(keyword)
+
+    def match_pattern(self, keyword: str) -> Optional[str]:
+        """
+        Function to resolve a keyword to the name of the first schema attribute whose
+        `pattern` matches the keyword.
+
+        All attribute patterns are compiled once per schema into a single alternation,
+        so resolving a keyword is a single regular expression match.
+
+        Parameters
+        ----------
+        keyword : `str`
+            The keyword to resolve.
+
+        Returns
+        -------
+        attribute_name : `str` | `None`
+            The name of the matching attribute in the schema, or None if no pattern matches.
+        """
+        if not isinstance(keyword, str):
+            return None
+
+        compiled_patterns, combined_pattern, group_names = self._cached(
+            "keyword_index", self._build_keyword_index
+        )
+        if combined_pattern is not None:
+            res = combined_pattern.fullmatch(keyword)
+            return group_names[res.lastgroup] if res else None
+        for attr_name, pattern in compiled_patterns.items():
+            if pattern.fullmatch(keyword):
+                return attr_name
+        return None
+
+    def pattern_matches(self, attribute_name: str, keywords) -> bool:
+        """
+        Function to check whether any of the given keywords match an attribute's pattern.
+
+        Parameters
+        ----------
+        attribute_name : `str`
+            The name of the attribute with a `pattern` in the schema.
+        keywords : `Iterable[str]`
+            The keywords to check against the pattern.
+
+        Returns
+        -------
+        found_match : `bool`
+            True if any of the keywords match the pattern of the attribute.
+        """
+        compiled_patterns, _, _ = self._cached(
+            "keyword_index", self._build_keyword_index
+        )
+        pattern = compiled_patterns.get(attribute_name, None)
+        if pattern is None:
+            return False
+        return any(
+            isinstance(keyword, str) and pattern.fullmatch(keyword)
+            for keyword in keywords
+        )
+
+    def _build_valid_values_index(
+        self,
+    ) -> Dict[str, Tuple[Optional[FrozenSet], Sequence]]:
+        """
+        Function to build the index of the valid values of each attribute.
 
-    def _load_default_attr_schema(self) -> dict:
+        Returns
+        -------
+        index : `Dict[str, Tuple[Optional[FrozenSet], Sequence]]`
+            A mapping of each attribute with `valid_values` to the set of its normalized
+            valid values (or None if they are not hashable) and the list of valid values.
+        """
+        index = {}
+        for attr_name, info in self.attribute_key.items():
+            valid_values = info.get("valid_values", None) if info else None
+            if not valid_values:
+                continue
+            try:
+                value_set = frozenset(_normalize_value(value) for value in valid_values)
+            except TypeError:
+                value_set = None
+            index[attr_name] = (value_set, valid_values)
+        return index
+
+    def get_valid_values(self, keyword: str) -> Optional[Tuple[Any, ...]]:
+        """
+        Function to get the valid values of a keyword.
+
+        Parameters
+        ----------
+        keyword : `str`
+            The keyword to get the valid values of.
+
+        Returns
+        -------
+        valid_values : `Tuple[Any, ...]` | `None`
+            The valid values of the keyword, as a read-only tuple, or None if the schema
+            does not restrict the values of the keyword.
+        """
+        index = self._cached("valid_values_index", self._build_valid_values_index)
+        entry = index.get(keyword, None)
+        return entry[1] if entry is not None else None
+
+    def is_valid_value(self, keyword: str, value: Any) -> bool:
+        """
+        Function to check whether a value is one of the valid values of a keyword.
+
+        The valid values of each attribute are compiled once per schema into a set, so the
+        check does not depend on the number of valid values. Values are compared as with
+        `in` on the list of valid values, e.g. `1`, `1.0` and `True` are equal.
+
+        Parameters
+        ----------
+        keyword : `str`
+            The keyword the value is for.
+        value : `Any`
+            The value to check.
+
+        Returns
+        -------
+        is_valid : `bool`
+            True if the value is valid, or the schema does not restrict the values of the
+            keyword.
+        """
+        index = self._cached("valid_values_index", self._build_valid_values_index)
+        entry = index.get(keyword, None)
+        if entry is None:
+            return True
+        return _is_valid_value(value, *entry)
+
+    def _load_default_attr_schema(self) -> Mapping:
         # The Default Schema file is contained in the `solarnet_metadata/data` directory
         default_schema_path = str(Path(data_directory) / DEFAULT_ATTRS_SCHEMA_FILE)
-        # Load the Schema
-        return load_yaml_data(yaml_file_path=default_schema_path)
+        # Load the Schema, compiling it for fast loading in other processes
+        return _load_schema_layer(default_schema_path, write_compiled=True)
 
-    def load_default_attributes(self) -> fits.Header:
+    def load_default_attributes(self) -> "fits.Header":
         """
         Function to load the default attributes for a SOLARNET-compliant data file.
 
@@ -127,6 +422,8 @@ class SOLARNETSchema:
         header : `fits.Header`
             A FITS header containing the default attributes.
         """
+        import astropy.io.fits as fits
+
         header = fits.Header()
 
         # Add Default Attributes to Header
@@ -165,6 +462,109 @@ class SOLARNETSchema:
 
         return header
 
+    def _build_requirement_partitions(self) -> Dict[Any, Tuple[str, ...]]:
+        """
+        Function to partition the attribute names of the schema by requirement level.
+
+        Returns
+        -------
+        partitions : `dict`
+            A mapping of each `KeywordRequirement` to the attribute names with that
+            requirement level, and of each `(primary, obs)` combination to the attribute
+            names required for that kind of HDU. Attribute names are kept in schema order.
+        """
+        requirements = {
+            keyword: KeywordRequirement(info["required"])
+            for keyword, info in self.attribute_key.items()
+        }
+        partitions = {requirement: [] for requirement in KeywordRequirement}
+        for keyword, requirement in requirements.items():
+            partitions[requirement].append(keyword)
+        partitions = {
+            requirement: tuple(keywords) for requirement, keywords in partitions.items()
+        }
+
+        # Combine the requirement levels for each kind of HDU, keeping schema order
+        for primary in (False, True):
+            for obs in (False, True):
+                levels = {KeywordRequirement.ALL}
+                if primary:
+                    levels.add(KeywordRequirement.PRIMARY)
+                if obs:
+                    levels.add(KeywordRequirement.OBS)
+                partitions[(primary, obs)] = tuple(
+                    keyword
+                    for keyword, requirement in requirements.items()
+                    if requirement in levels
+                )
+        return partitions
+
+    def get_required_keyword_names(
+        self, primary: Optional[bool] = False, obs: Optional[bool] = False
+    ) -> Tuple[str, ...]:
+        """
+        Function to get the names of the required keywords based on whether the HDU is
+        a primary and/or an observation HDU.
+
+        The partitions of keywords by requirement level are computed once per schema.
+
+        Parameters
+        ----------
+        primary: `bool`, optional, default False
+            Whether or not the HDU is a primary HDU.
+        obs: `bool`, optional, default False
+            Whether or not the HDU is an observation HDU.
+
+        Returns
+        -------
+        required_keywords : `Tuple[str, ...]`
+            The names of the required keywords, in schema order.
+        """
+        partitions = self._cached(
+            "requirement_partitions", self._build_requirement_partitions
+        )
+        return partitions[(bool(primary), bool(obs))]
+
+    def get_required_keyword_set(
+        self, primary: Optional[bool] = False, obs: Optional[bool] = False
+    ) -> FrozenSet[str]:
+        """
+        Function to get the set of required keyword names based on whether the HDU is
+        a primary and/or an observation HDU.
+
+        Parameters
+        ----------
+        primary: `bool`, optional, default False
+            Whether or not the HDU is a primary HDU.
+        obs: `bool`, optional, default False
+            Whether or not the HDU is an observation HDU.
+
+        Returns
+        -------
+        required_keywords : `FrozenSet[str]`
+            The names of the required keywords.
+        """
+        return self._cached(
+            ("required_keyword_set", bool(primary), bool(obs)),
+            lambda: frozenset(
+                self.get_required_keyword_names(primary=primary, obs=obs)
+            ),
+        )
+
+    def get_optional_keyword_names(self) -> Tuple[str, ...]:
+        """
+        Function to get the names of the optional keywords.
+
+        Returns
+        -------
+        optional_keywords : `Tuple[str, ...]`
+            The names of the optional keywords, in schema order.
+        """
+        partitions = self._cached(
+            "requirement_partitions", self._build_requirement_partitions
+        )
+        return partitions[KeywordRequirement.OPTIONAL]
+
     def get_required_keywords(
         self, primary: Optional[bool] = False, obs: Optional[bool] = False
     ) -> Dict[str, Dict[str, Any]]:
@@ -185,15 +585,10 @@ class SOLARNETSchema:
         required_keywords : `Dict[str, Dict[str, Any]]`
             A dictionary of required keywords and their associated information.
         """
+        attribute_key = self.attribute_key
         required_attributes = {
-            keyword: info
-            for keyword, info in self.attribute_key.items()
-            if KeywordRequirement(info["required"]) == KeywordRequirement.ALL
-            or (
-                KeywordRequirement(info["required"]) == KeywordRequirement.PRIMARY
-                and primary
-            )
-            or (KeywordRequirement(info["required"]) == KeywordRequirement.OBS and obs)
+            keyword: attribute_key[keyword]
+            for keyword in self.get_required_keyword_names(primary=primary, obs=obs)
         }
         return required_attributes
 
@@ -206,20 +601,124 @@ class SOLARNETSchema:
         optional_keywords : `Dict[str, Dict[str, Any]]`
             A dictionary of optional keywords and their associated information.
         """
+        attribute_key = self.attribute_key
         optional_attributes = {
-            keyword: info
-            for keyword, info in self.attribute_key.items()
-            if KeywordRequirement(info["required"]) == KeywordRequirement.OPTIONAL
+            keyword: attribute_key[keyword]
+            for keyword in self.get_optional_keyword_names()
         }
         return optional_attributes
 
+    def _build_conditional_index(self) -> Dict[str, Dict[Any, Tuple[str, ...]]]:
+        """
+        Function to index the conditional requirements of the schema by their condition.
+
+        Returns
+        -------
+        index : `Dict[str, Dict[Any, Tuple[str, ...]]]`
+            A mapping of each condition key to a mapping of each condition value to the
+            attribute names required when the condition key has that value, in schema order.
+            Requirements without a `condition_value` are not indexed, as no header value
+            meets them.
+        """
+        index = {}
+        for requirement in (
+            self.attribute_schema.get("conditional_requirements", None) or []
+        ):
+            condition_value = requirement.get("condition_value", None)
+            if condition_value is None:
+                continue
+            values = index.setdefault(requirement["condition_key"], {})
+            values[condition_value] = values.get(condition_value, ()) + tuple(
+                requirement["required_attributes"]
+            )
+        return index
+
+    def get_conditional_keyword_names(
+        self, condition_key: str, condition_value: Any
+    ) -> Tuple[str, ...]:
+        """
+        Function to get the names of the keywords required by the conditional requirements
+        of the schema when a keyword has a given value.
+
+        The conditional requirements are indexed by condition key and value once per
+        schema, so this is a dictionary lookup.
+
+        Parameters
+        ----------
+        condition_key : `str`
+            The keyword the conditional requirements depend on, e.g. `OBS_TYPE`.
+        condition_value : `Any`
+            The value of the keyword, e.g. `ground-based`.
+
+        Returns
+        -------
+        required_keywords : `Tuple[str, ...]`
+            The names of the required keywords, or an empty tuple if no conditional
+            requirement applies.
+        """
+        index = self._cached("conditional_index", self._build_conditional_index)
+        # Keywords without a value (e.g. blank template cards) meet no condition
+        if condition_value is None:
+            return ()
+        try:
+            return index.get(condition_key, {}).get(condition_value, ())
+        except TypeError:
+            # Unhashable values cannot match a condition
+            return ()
+
+    def get_condition_keys(self) -> FrozenSet[str]:
+        """
+        Function to get the keywords that the conditional requirements of the schema
+        depend on the values of.
+
+        Returns
+        -------
+        condition_keys : `FrozenSet[str]`
+            The condition keys of the conditional requirements, e.g. `OBS_TYPE`.
+        """
+        index = self._cached("conditional_index", self._build_conditional_index)
+        return frozenset(index)
+
+    def get_conditional_requirements(
+        self, header: Mapping[str, Any]
+    ) -> Dict[str, Tuple[str, Any]]:
+        """
+        Function to evaluate the conditional requirements of the schema against the values
+        of a header.
+
+        Only the condition keys of the schema are looked up in the header, so the cost is
+        one dictionary lookup per condition key rather than a scan of all requirements.
+
+        Parameters
+        ----------
+        header : `Mapping[str, Any]`
+            The header, or a mapping of its keywords to values.
+
+        Returns
+        -------
+        required_keywords : `Dict[str, Tuple[str, Any]]`
+            A mapping of the names of the keywords required by the values of the header, in
+            schema order, to the condition key and value that require them.
+        """
+        index = self._cached("conditional_index", self._build_conditional_index)
+        required_keywords = {}
+        for condition_key in index:
+            if condition_key not in header:
+                continue
+            condition_value = header[condition_key]
+            for keyword in self.get_conditional_keyword_names(
+                condition_key, condition_value
+            ):
+                required_keywords.setdefault(keyword, (condition_key, condition_value))
+        return required_keywords
+
     def attribute_template(
         self,
         primary: Optional[bool] = False,
         obs: Optional[bool] = False,
         observatory_type: Optional[str] = None,
         instrument_type: Optional[str] = None,
-    ) -> fits.Header:
+    ) -> "fits.Header":
         """
         Function to generate a template of required attributes
         that must be set for a valid data file.
@@ -248,51 +747,61 @@ class SOLARNETSchema:
         template : `fits.Header`
             A template for required attributes that must be provided.
         """
+        # Types that are not valid values of OBS_TYPE / INST_TYP add no requirements
+        if observatory_type not in self._get_valid_condition_values("OBS_TYPE"):
+            observatory_type = None
+        if instrument_type not in self._get_valid_condition_values("INST_TYP"):
+            instrument_type = None
+
+        # Build the template once for each combination, and return copies of it
+        key = (
+            "attribute_template",
+            bool(primary),
+            bool(obs),
+            observatory_type,
+            instrument_type,
+        )
+        template = self._cached(
+            key,
+            lambda: self._build_attribute_template(
+                bool(primary), bool(obs), observatory_type, instrument_type
+            ),
+        )
+        return template.copy()
+
+    def _get_valid_condition_values(self, condition_key: str) -> Sequence:
+        """
+        Function to get the valid values of an attribute used as a condition key.
+        """
+        if condition_key not in self.attribute_key:
+            return []
+        return self.attribute_key[condition_key].get("valid_values", None) or []
+
+    def _build_attribute_template(
+        self,
+        primary: bool,
+        obs: bool,
+        observatory_type: Optional[str],
+        instrument_type: Optional[str],
+    ) -> "fits.Header":
+        """
+        Function to build the template of required attributes for a combination of the
+        `attribute_template` parameters. See `attribute_template`.
+        """
         # Add Default Attributes to Header
         header = self.default_attributes.copy()
 
         # Add globally Required Attributes as BLANK keywords in header
-        required_attributes = self.get_required_keywords(primary=primary, obs=obs)
-        for keyword in required_attributes:
-            header[keyword] = (header.get(keyword, None), self.get_comment(keyword))
+        required_attributes = self.get_required_keyword_names(primary=primary, obs=obs)
 
         # Get required attributes for the conditional requirements based on observatory
-        if (
-            observatory_type
-            and "OBS_TYPE" in self.attribute_key
-            and observatory_type in self.attribute_key["OBS_TYPE"]["valid_values"]
-        ):
-            applicable_conditional_requirements: list[list[str]] = [
-                requirement["required_attributes"]
-                for requirement in self.attribute_schema["conditional_requirements"]
-                if requirement["condition_key"] == "OBS_TYPE"
-                and requirement["condition_value"] == observatory_type
-            ]
-            for conditional_requirement in applicable_conditional_requirements:
-                for required_attribute in conditional_requirement:
-                    header[required_attribute] = (
-                        header.get(required_attribute, None),
-                        self.get_comment(required_attribute),
-                    )
-
-        # Get required attributes for the conditional requirements based on instrument
-        if (
-            instrument_type
-            and "INST_TYP" in self.attribute_key
-            and instrument_type in self.attribute_key["INST_TYP"]["valid_values"]
-        ):
-            applicable_conditional_requirements: list[list[str]] = [
-                requirement["required_attributes"]
-                for requirement in self.attribute_schema["conditional_requirements"]
-                if requirement["condition_key"] == "INST_TYP"
-                and requirement["condition_value"] == instrument_type
-            ]
-            for conditional_requirement in applicable_conditional_requirements:
-                for required_attribute in conditional_requirement:
-                    header[required_attribute] = (
-                        header.get(required_attribute, None),
-                        self.get_comment(required_attribute),
-                    )
+        # and instrument
+        conditional_attributes = self.get_conditional_keyword_names(
+            "OBS_TYPE", observatory_type
+        ) + self.get_conditional_keyword_names("INST_TYP", instrument_type)
+
+        for keyword in required_attributes + conditional_attributes:
+            header[keyword] = (header.get(keyword, None), self.get_comment(keyword))
 
         return header
 
@@ -329,32 +838,50 @@ class SOLARNETSchema:
         ------
         KeyError: If attribute_name is not a recognized attribute.
         """
+        # The table is built once per schema, and copies of it are returned
+        info, row_index = self._cached(
+            "attribute_info_table", self._build_attribute_info_table
+        )
 
-        # Strip the Description of New Lines
-        for attr_name in self.attribute_key.keys():
-            self.attribute_key[attr_name]["description"] = self.attribute_key[
-                attr_name
-            ]["description"].strip()
+        # Filter to specific attribute if requested
+        if attribute_name is not None:
+            if attribute_name not in row_index:
+                raise KeyError(f"Cannot find attribute name: {attribute_name}")
+            return info[[row_index[attribute_name]]]
+
+        return info.copy()
+
+    def _build_attribute_info_table(self) -> tuple:
+        """
+        Function to build the table of information about each attribute.
+
+        Returns
+        -------
+        info : `tuple`
+            The `astropy.table.Table` of information about each attribute, and a mapping of
+            each attribute name to its row in the table (`dict`).
+        """
+        from astropy.table import Table
 
         # Create rows for the table
         rows = []
         for attr_name, attr_info in self.attribute_key.items():
             # Add the attribute name to the info dictionary
             row_data = {"Attribute": attr_name}
-            row_data.update(attr_info)
+            # Lists are stored as tuples in the read-only schema
+            row_data.update(
+                (key, list(value) if isinstance(value, tuple) else value)
+                for key, value in attr_info.items()
+            )
+            # Strip the Description of New Lines, without modifying the schema
+            if isinstance(row_data.get("description", None), str):
+                row_data["description"] = row_data["description"].strip()
             rows.append(row_data)
 
         # Create the Table
         info = Table(rows=rows)
-
-        # Filter to specific attribute if requested
-        if attribute_name is not None:
-            mask = info["Attribute"] == attribute_name
-            if not any(mask):
-                raise KeyError(f"Cannot find attribute name: {attribute_name}")
-            info = info[mask]
-
-        return info
+        row_index = {row["Attribute"]: i for i, row in enumerate(rows)}
+        return info, row_index
 
     def get_comment(self, attribute_name: str) -> Optional[str]:
         """
@@ -372,48 +899,278 @@ class SOLARNETSchema:
         """
         return self.attribute_key.get(attribute_name, {}).get("human_readable", None)
 
-    def _merge(self, base_layer: dict, new_layer: dict, path: list = None) -> None:
+    def _merge(
+        self, base_layer: Mapping, new_layer: Mapping, path: list = None
+    ) -> Mapping:
         """
-        Function to do in-place merging and updating of two dictionaries.
+        Function to merge two dictionaries without modifying either of them.
         This is an improvemnent over the built-in dict.update() method, as it allows for nested dictionaries and lists.
 
+        The merged dictionary shares the values that are not changed by the new layer
+        with the base layer, and the values that are only in the new layer with the new
+        layer. Nested dictionaries are merged recursively, and lists are extended with the
+        items of the new layer that are not already in the base layer.
+
         Parameters
         ----------
-        base_layer : `dict`
+        base_layer : `Mapping`
             The base dictionary to merge into.
-        new_layer : `dict`
+        new_layer : `Mapping`
             The new dictionary to merge into the base.
         path : `list`
             The path to the current dictionary being merged. Used for recursion.
 
         Returns
         -------
-        None - operation is done in-place.
+        merged_layer : `Mapping`
+            The merged dictionary, or `base_layer` itself if the new layer changes nothing.
         """
         # If we are at the top of the recursion, and we don't have a path, create a new one
         if not path:
             path = []
-        # for each key in the base layer
-        for key in new_layer:
+        # Copy the base layer only once the new layer changes something
+        merged_layer = None
+        # for each key in the new layer
+        for key, new_value in new_layer.items():
             # If its a shared key
             if key in base_layer:
+                base_value = base_layer[key]
                 # If both are dictionaries
-                if isinstance(base_layer[key], dict) and isinstance(
-                    new_layer[key], dict
-                ):
+                if isinstance(base_value, Mapping) and isinstance(new_value, Mapping):
                     # Merge the two nested dictionaries together
-                    self._merge(base_layer[key], new_layer[key], path + [str(key)])
+                    value = self._merge(base_value, new_value, path + [str(key)])
                 # If both are lists
-                elif isinstance(base_layer[key], list) and isinstance(
-                    new_layer[key], list
+                elif isinstance(base_value, _LIST_TYPES) and isinstance(
+                    new_value, _LIST_TYPES
                 ):
-                    # Extend the list of the base layer by the new layer
-                    base_layer[key].extend(new_layer[key])
+                    # Extend the list of the base layer by the new items of the new layer
+                    value = _merge_lists(base_value, new_value)
                 # If they are not lists or dicts (scalars)
-                elif base_layer[key] != new_layer[key]:
-                    # We've reached a conflict, may want to overwrite the base with the new layer.
-                    base_layer[key] = new_layer[key]
+                elif base_value != new_value:
+                    # We've reached a conflict, overwrite the base with the new layer.
+                    value = new_value
+                else:
+                    value = base_value
+                if value is base_value:
+                    continue
             # If its not a shared key
             else:
-                base_layer[key] = new_layer[key]
-        return base_layer
+                value = new_value
+            if merged_layer is None:
+                merged_layer = dict(base_layer)
+            merged_layer[key] = value
+        return base_layer if merged_layer is None else merged_layer
+
+
+def _merge_lists(base_list: Sequence, new_list: Sequence) -> Sequence:
+    """
+    Function to extend a list by the items of another list that are not already in it,
+    without modifying either list.
+
+    Items are compared by type as well as value, so that e.g. `1` and `True` are both
+    kept, with frozen and unfrozen dictionaries and lists of the same kind. Returns
+    `base_list` itself if all of the items of `new_list` are already in it.
+    """
+    merged_list = None
+    for item in new_list:
+        items = base_list if merged_list is None else merged_list
+        kind = _item_kind(item)
+        if any(_item_kind(other) is kind and other == item for other in items):
+            continue
+        if merged_list is None:
+            merged_list = list(base_list)
+        merged_list.append(item)
+    return base_list if merged_list is None else merged_list
+
+
+def _item_kind(item: Any) -> type:
+    """
+    Function to get the type of a list item for comparison when merging lists.
+    """
+    if isinstance(item, Mapping):
+        return Mapping
+    if isinstance(item, _LIST_TYPES):
+        return list
+    return type(item)
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Function to make a schema structure read-only, so that it can be shared.
+
+    Dictionaries are wrapped in `types.MappingProxyType` views and lists are converted to
+    tuples, recursively. Structures that are already read-only are returned as they are,
+    so freezing a merged schema only copies the parts created by the merge.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """
+    Function to get a modifiable copy of a schema structure frozen with `_freeze`.
+    """
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, _LIST_TYPES):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Function to serialize the values of a schema that `json` does not support.
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def _load_schema_layer(
+    schema_layer_path: Path, write_compiled: bool = False
+) -> Mapping:
+    """
+    Function to load a schema layer file, shared by all of the schemas in the process.
+
+    The loaded layer is re-used as long as the file has not been modified on disk (based
+    on the file modification time and size), and is frozen with `_freeze` so that it
+    cannot be modified. The layer is loaded from a compiled copy if there is one, but only
+    compiled to the cache directory with `write_compiled`, so custom layers are compiled
+    only when requested with `compile_yaml_data`.
+    """
+    key = str(Path(schema_layer_path).resolve())
+    with _LAYER_CACHE_LOCK:
+        stamp = _layer_stamp(schema_layer_path)
+        cached = _LAYER_CACHE.get(key, None)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        attr_layer = _freeze(
+            load_yaml_data(
+                yaml_file_path=schema_layer_path,
+                use_compiled=True,
+                write_compiled=write_compiled,
+            )
+        )
+        _LAYER_CACHE[key] = (stamp, attr_layer)
+        return attr_layer
+
+
+def _normalize_value(value: Any) -> Any:
+    """
+    Function to normalize a header value for comparison with valid values.
+
+    NumPy scalars are converted to the equivalent Python scalar. Python's `bool`, `int`
+    and `float` values that compare equal also hash equal, so no other conversion is
+    needed for set membership to match list membership.
+    """
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _is_valid_value(
+    value: Any, value_set: Optional[FrozenSet], valid_values: Sequence
+) -> bool:
+    """
+    Function to check whether a value is in a set of normalized valid values, or in the
+    list of valid values if either is not hashable.
+    """
+    if value_set is not None:
+        try:
+            return _normalize_value(value) in value_set
+        except TypeError:
+            pass
+    return value in valid_values
+
+
+def _layer_stamp(schema_layer_path: Path) -> tuple:
+    """
+    Function to get the modification stamp of a schema layer file.
+
+    The stamp is the modification time (in nanoseconds) and size of the file, and
+    changes whenever the file is edited on disk.
+    """
+    if not Path(schema_layer_path).exists():
+        raise FileNotFoundError(f"Cannot find YAML file: {schema_layer_path}")
+    stat = os.stat(schema_layer_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_schema(
+    schema_layers: Optional[list[Path]] = None,
+    use_defaults: Optional[bool] = True,
+) -> SOLARNETSchema:
+    """
+    Function to get a shared `SOLARNETSchema` for the given schema layers.
+
+    Schemas are cached process-wide, keyed by the resolved paths of the schema layer files.
+    A cached schema is re-used as long as none of its layer files have been modified on disk
+    (based on the file modification time and size); otherwise it is rebuilt. This avoids
+    re-parsing the YAML schema files each time a schema is needed, for example when
+    validating many headers or keywords with the default schema.
+
+    This function is thread-safe. The returned schema is shared and should not be modified.
+
+    Parameters
+    ----------
+    schema_layers :  `Optional[list[Path]]`
+        Absolute file paths to attribute schema files. See `SOLARNETSchema`.
+    use_defaults: `Optional[bool]`
+        Whether or not to load the default attribute schema files. See `SOLARNETSchema`.
+
+    Returns
+    -------
+    schema : `SOLARNETSchema`
+        The cached schema for the given schema layers.
+
+    Examples
+    --------
+    >>> from solarnet_metadata.schema import get_schema
+    >>> schema = get_schema()
+    >>> schema is get_schema()
+    True
+    """
+    key, layer_paths = _schema_cache_key(schema_layers, use_defaults)
+
+    with _SCHEMA_CACHE_LOCK:
+        stamps = tuple(_layer_stamp(path) for path in layer_paths)
+        cached = _SCHEMA_CACHE.get(key, None)
+        if cached is not None and cached[0] == stamps:
+            return cached[1]
+
+        # Build the Schema and Cache it with the Stamps of the Layer Files
+        schema = SOLARNETSchema(schema_layers=schema_layers, use_defaults=use_defaults)
+        _SCHEMA_CACHE[key] = (stamps, schema)
+        return schema
+
+
+def _schema_cache_key(
+    schema_layers: Optional[list[Path]], use_defaults: Optional[bool]
+) -> Tuple[tuple, List[Path]]:
+    """
+    Function to get the key of a schema in the cache used by `get_schema`, and the paths
+    of all of its layer files, including the default schema.
+    """
+    layer_paths = []
+    if use_defaults:
+        layer_paths.append(Path(data_directory) / DEFAULT_ATTRS_SCHEMA_FILE)
+    if schema_layers is not None:
+        layer_paths.extend(Path(schema_layer) for schema_layer in schema_layers)
+
+    key = (bool(use_defaults), tuple(str(path.resolve()) for path in layer_paths))
+    return key, layer_paths
+
+
+def clear_schema_cache() -> None:
+    """
+    Function to clear the process-wide cache of schemas used by `get_schema`.
+
+    Subsequent calls to `get_schema` will re-load the schema layer files.
+    """
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE.clear()
+    with _LAYER_CACHE_LOCK:
+        _LAYER_CACHE.clear()
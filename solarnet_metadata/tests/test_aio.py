@@ -0,0 +1,200 @@
+import asyncio
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from solarnet_metadata.aio import avalidate_file, avalidate_files
+from solarnet_metadata.validation import validate_file
+
+
+class ConcurrencyTracker:
+    """Counter of the calls in progress at once, and of the most at any time."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *args):
+        with self._lock:
+            self.active -= 1
+
+
+class SlowFile:
+    """Binary file wrapper adding latency to each read and seek, like a network filesystem."""
+
+    def __init__(self, path, latency, tracker=None):
+        self._file = open(path, "rb")
+        self.latency = latency
+        self.name = str(path)
+        self._tracker = tracker if tracker is not None else ConcurrencyTracker()
+
+    def _wait(self):
+        with self._tracker:
+            time.sleep(self.latency)
+
+    def read(self, size=-1):
+        self._wait()
+        return self._file.read(size)
+
+    def seek(self, offset, whence=0):
+        self._wait()
+        return self._file.seek(offset, whence)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._file.close()
+
+
+def create_test_files(directory, n_files):
+    """Create FITS files with data and a varying number of observation HDUs."""
+    file_paths = []
+    for i in range(n_files):
+        primary_hdu = fits.PrimaryHDU(data=np.zeros((10, 10), dtype=np.int16))
+        primary_hdu.header["AUTHOR"] = ("Test Author", "Author name")
+        hdul = fits.HDUList([primary_hdu])
+        for j in range(i % 3):
+            image_hdu = fits.ImageHDU(data=np.ones((20, 5), dtype=np.float32))
+            image_hdu.header["OBS_HDU"] = (1, "Observation HDU flag")
+            image_hdu.header["SOMEKEY"] = (j, "")
+            hdul.append(image_hdu)
+        file_path = Path(directory) / f"test_file_{i}.fits"
+        hdul.writeto(file_path)
+        file_paths.append(file_path)
+    return file_paths
+
+
+def test_avalidate_file():
+    """Test that validating a file asynchronously gives the same findings"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for file_path in create_test_files(temp_dir, 3):
+            kwargs = dict(warn_no_comment=True, warn_data_type=True)
+            findings = asyncio.run(avalidate_file(file_path, **kwargs))
+            assert findings == validate_file(file_path, **kwargs)
+
+            structured = asyncio.run(
+                avalidate_file(file_path, structured=True, **kwargs)
+            )
+            assert structured == validate_file(file_path, structured=True, **kwargs)
+
+
+def test_avalidate_file_compressed_image():
+    """Test that tile-compressed images are validated as images, as with astropy"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "test_file.fits"
+        image_hdu = fits.CompImageHDU(data=np.ones((64, 32), dtype=np.float32))
+        image_hdu.header["OBS_HDU"] = (1, "Observation HDU flag")
+        fits.HDUList([fits.PrimaryHDU(), image_hdu]).writeto(file_path)
+
+        kwargs = dict(warn_no_comment=True, warn_data_type=True)
+        findings = asyncio.run(avalidate_file(file_path, **kwargs))
+        assert findings == validate_file(file_path, **kwargs)
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_avalidate_files(executor):
+    """Test that validating files asynchronously gives the same findings as in series"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir, 5)
+        bad_path = Path(temp_dir) / "bad_file.fits"
+        bad_path.write_bytes(b"not a FITS file")
+
+        async def sweep():
+            return {
+                file_path: findings
+                async for file_path, findings in avalidate_files(
+                    file_paths + [bad_path],
+                    max_concurrency=2,
+                    workers=2,
+                    executor=executor,
+                    warn_no_comment=True,
+                )
+            }
+
+        results = asyncio.run(sweep())
+        assert set(results) == set(file_paths) | {bad_path}
+        for file_path in file_paths:
+            assert results[file_path] == validate_file(file_path, warn_no_comment=True)
+        assert len(results[bad_path]) == 1
+        assert "Could not validate file" in results[bad_path][0]
+
+
+def test_avalidate_files_latency():
+    """Test that the header reads of many files on a slow filesystem are overlapped"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir, 8)
+        tracker = ConcurrencyTracker()
+
+        def slow_opener(file_path):
+            return SlowFile(file_path, latency=0.05, tracker=tracker)
+
+        async def sweep():
+            return {
+                file_path: findings
+                async for file_path, findings in avalidate_files(
+                    file_paths,
+                    max_concurrency=8,
+                    workers=1,
+                    executor="thread",
+                    opener=slow_opener,
+                )
+            }
+
+        results = asyncio.run(sweep())
+
+        for file_path in file_paths:
+            assert results[file_path] == validate_file(file_path)
+        # The reads of several files were waiting on the filesystem at once
+        assert tracker.peak > 1
+        assert tracker.peak <= 8
+
+
+def test_avalidate_files_early_exit():
+    """Test that stopping the iteration stops the validation of the remaining files"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir, 3)
+        opened = []
+
+        def counting_opener(file_path):
+            opened.append(file_path)
+            return open(file_path, "rb")
+
+        async def first_result():
+            results = avalidate_files(
+                (file_path for file_path in file_paths * 10),
+                max_concurrency=1,
+                executor="thread",
+                opener=counting_opener,
+            )
+            async for result in results:
+                await results.aclose()
+                return result
+
+        file_path, _ = asyncio.run(first_result())
+        assert file_path in file_paths
+        assert len(opened) < len(file_paths) * 10
+
+
+def test_avalidate_files_errors():
+    """Test the errors of invalid arguments"""
+
+    async def sweep(**kwargs):
+        return [result async for result in avalidate_files([], **kwargs)]
+
+    assert asyncio.run(sweep(executor="thread")) == []
+    with pytest.raises(ValueError):
+        asyncio.run(sweep(executor="unknown"))
+    with pytest.raises(ValueError):
+        asyncio.run(sweep(max_concurrency=0))
@@ -0,0 +1,83 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from astropy.io import fits
+
+from solarnet_metadata.batch import validate_files
+from solarnet_metadata.schema import get_schema
+from solarnet_metadata.validation import validate_file
+
+
+def create_test_files(directory, n_files):
+    """Create FITS files with a varying number of observation HDUs."""
+    file_paths = []
+    for i in range(n_files):
+        primary_hdu = fits.PrimaryHDU()
+        primary_hdu.header["AUTHOR"] = ("Test Author", "Author name")
+        hdul = fits.HDUList([primary_hdu])
+        for _ in range(i % 3):
+            image_hdu = fits.ImageHDU()
+            image_hdu.header["OBS_HDU"] = (1, "Observation HDU flag")
+            hdul.append(image_hdu)
+        file_path = Path(directory) / f"test_file_{i}.fits"
+        hdul.writeto(file_path)
+        file_paths.append(file_path)
+    return file_paths
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+@pytest.mark.parametrize("max_in_flight", [None, 1])
+def test_validate_files(executor, max_in_flight):
+    """Test that validating files in parallel gives the same findings as in series"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir, 5)
+
+        results = dict(
+            validate_files(
+                (file_path for file_path in file_paths),
+                workers=2,
+                executor=executor,
+                max_in_flight=max_in_flight,
+                warn_data_type=True,
+                schema=get_schema(),
+            )
+        )
+
+        assert set(results) == set(file_paths)
+        for file_path in file_paths:
+            assert results[file_path] == validate_file(file_path, warn_data_type=True)
+
+
+def test_validate_files_unreadable_file():
+    """Test that unreadable files are reported as findings"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir, 1)
+        missing_path = Path(temp_dir) / "missing.fits"
+
+        results = dict(
+            validate_files(file_paths + [missing_path], workers=1, executor="thread")
+        )
+
+        assert results[file_paths[0]] == validate_file(file_paths[0])
+        assert len(results[missing_path]) == 1
+        assert results[missing_path][0].startswith("Could not validate file:")
+
+
+def test_validate_files_empty():
+    """Test validating an empty list of files"""
+    assert list(validate_files([], workers=1)) == []
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"executor": "unknown"},
+        {"workers": 0},
+        {"workers": 1, "max_in_flight": 0},
+    ],
+)
+def test_validate_files_invalid_params(kwargs):
+    """Test validating files with invalid parameters"""
+    with pytest.raises(ValueError):
+        _ = list(validate_files([], **kwargs))
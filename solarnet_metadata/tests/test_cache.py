@@ -0,0 +1,172 @@
+import pickle
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+from astropy.io import fits
+
+import solarnet_metadata.validation as validation
+from solarnet_metadata.batch import validate_files
+from solarnet_metadata.cache import ValidationCache
+from solarnet_metadata.schema import clear_schema_cache, get_schema
+from solarnet_metadata.validation import (
+    iter_header_findings,
+    validate_file,
+    validate_header,
+)
+
+
+def create_test_file(file_path):
+    """Create a FITS file with a primary and an observation header."""
+    primary_hdu = fits.PrimaryHDU()
+    primary_hdu.header["AUTHOR"] = ("Test Author", "Author name")
+    obs_hdu = fits.ImageHDU()
+    obs_hdu.header["OBS_HDU"] = (1, "Observation HDU flag")
+    obs_hdu.header["BTYPE"] = ("phot.count", "")
+    fits.HDUList([primary_hdu, obs_hdu]).writeto(file_path)
+    return file_path
+
+
+@pytest.fixture
+def count_validations(monkeypatch):
+    """Count the number of headers validated without the cache."""
+    calls = []
+    iter_cards = validation._iter_cards
+
+    def counting_iter_cards(*args, **kwargs):
+        calls.append(kwargs.get("is_primary", False))
+        return iter_cards(*args, **kwargs)
+
+    monkeypatch.setattr(validation, "_iter_cards", counting_iter_cards)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "mode", [{}, {"header_only": True}, {"raw_cards": True}], ids=["hdul", "header_only", "raw_cards"]
+)  # fmt: skip
+def test_validate_file_cache(mode, count_validations):
+    """Test that cached findings are the same as validating the file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = create_test_file(Path(temp_dir) / "test_file.fits")
+        cache = ValidationCache(Path(temp_dir) / "cache.sqlite")
+        expected = validate_file(file_path, warn_no_comment=True, **mode)
+        assert len(count_validations) == 2
+
+        findings = validate_file(file_path, warn_no_comment=True, cache=cache, **mode)
+        assert findings == expected
+        assert len(count_validations) == 4
+        assert len(cache) == 2
+
+        # Validate again, with the findings from the cache
+        findings = validate_file(file_path, warn_no_comment=True, cache=cache, **mode)
+        assert findings == expected
+        assert len(count_validations) == 4
+
+        # The cache persists across connections
+        cache.close()
+        cache = ValidationCache(Path(temp_dir) / "cache.sqlite")
+        structured = validate_file(
+            file_path, warn_no_comment=True, cache=cache, structured=True, **mode
+        )
+        assert [str(finding) for finding in structured] == expected
+        assert len(count_validations) == 4
+
+        # Different options are cached separately
+        _ = validate_file(file_path, warn_data_type=True, cache=cache, **mode)
+        assert len(count_validations) == 6
+        assert len(cache) == 4
+
+        cache.clear()
+        assert len(cache) == 0
+        cache.close()
+
+
+def test_validate_header_cache(count_validations):
+    """Test validating headers with the cache"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ValidationCache(Path(temp_dir) / "cache.sqlite")
+        header = fits.Header()
+        header["AUTHOR"] = ("Test Author", "Author name")
+
+        expected = validate_header(header, is_primary=True)
+        assert validate_header(header, is_primary=True, cache=cache) == expected
+        assert validate_header(header, is_primary=True, cache=cache) == expected
+        assert len(count_validations) == 2
+
+        # The requirements of a primary header are different
+        assert validate_header(header, cache=cache) == validate_header(header)
+        assert len(count_validations) == 4
+
+        # A modified header is validated again
+        header["AUTHOR"] = ("Another Author", "Author name")
+        _ = validate_header(header, is_primary=True, cache=cache)
+        assert len(count_validations) == 5
+        cache.close()
+
+
+def test_cache_schema_change(count_validations):
+    """Test that editing a schema layer invalidates the cached findings"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ValidationCache(Path(temp_dir) / "cache.sqlite")
+        layer_path = Path(temp_dir) / "layer.yaml"
+        layer = {"attribute_key": {"NEWKEY": {"data_type": "str", "required": "all"}}}
+        layer_path.write_text(yaml.dump(layer))
+        header = fits.Header()
+
+        findings = validate_header(header, schema=get_schema([layer_path]), cache=cache)
+        assert "Missing Required Attribute: NEWKEY" in findings
+        _ = validate_header(header, schema=get_schema([layer_path]), cache=cache)
+        assert len(count_validations) == 1
+
+        layer["attribute_key"]["NEWKEY"]["required"] = "optional"
+        layer_path.write_text(yaml.dump(layer, default_flow_style=True))
+        findings = validate_header(header, schema=get_schema([layer_path]), cache=cache)
+        assert "Missing Required Attribute: NEWKEY" not in findings
+        assert len(count_validations) == 2
+        cache.close()
+    clear_schema_cache()
+
+
+def test_cache_pickle():
+    """Test that the cache can be sent to worker processes"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = create_test_file(Path(temp_dir) / "test_file.fits")
+        cache = ValidationCache(Path(temp_dir) / "cache.sqlite")
+        _ = validate_file(file_path, cache=cache)
+
+        restored = pickle.loads(pickle.dumps(cache))
+        assert restored.path == cache.path
+        assert len(restored) == 2
+
+        results = dict(validate_files([file_path], workers=1, cache=cache))
+        assert results[file_path] == validate_file(file_path)
+        assert len(cache) == 2
+        restored.close()
+        cache.close()
+
+
+def test_cache_partial_findings(count_validations):
+    """Test that the findings of a header are only cached when all were found"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ValidationCache(Path(temp_dir) / "cache.sqlite")
+        header = fits.Header()
+        header["AUTHOR"] = ("Test Author", "")
+        header["BTYPE"] = ("phot.count", "")
+        expected = validate_header(header, warn_no_comment=True)
+        assert len(expected) > 1
+
+        findings = iter_header_findings(header, warn_no_comment=True, cache=cache)
+        assert next(findings) == expected[0]
+        findings.close()
+        assert len(cache) == 0
+
+        findings = list(iter_header_findings(header, warn_no_comment=True, cache=cache))
+        assert findings == expected
+        assert len(cache) == 1
+        assert (
+            list(iter_header_findings(header, warn_no_comment=True, cache=cache))
+            == expected
+        )
+        assert len(count_validations) == 3
+        cache.close()
@@ -0,0 +1,157 @@
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+from astropy.io import fits
+
+from solarnet_metadata.cli import find_files, main
+from solarnet_metadata.validation import validate_file
+
+
+def create_test_files(directory):
+    """Create FITS files in a directory and a sub-directory."""
+    file_paths = []
+    for sub_directory in ["", "sub"]:
+        (Path(directory) / sub_directory).mkdir(exist_ok=True)
+        for name in ["a.fits", "b.fts"]:
+            hdu = fits.PrimaryHDU()
+            hdu.header["AUTHOR"] = ("Test Author", "Author name")
+            file_path = Path(directory) / sub_directory / name
+            hdu.writeto(file_path)
+            file_paths.append(file_path)
+    # A file that is not matched by the default patterns
+    (Path(directory) / "notes.txt").write_text("not a FITS file")
+    return file_paths
+
+
+def test_find_files():
+    """Test finding files from files, directories and glob patterns"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir)
+
+        assert set(find_files([temp_dir])) == set(file_paths[:2])
+        assert set(find_files([temp_dir], recursive=True)) == set(file_paths)
+        assert set(find_files([temp_dir], patterns=("*.fits",))) == {file_paths[0]}
+        assert set(find_files([f"{temp_dir}/*.fits"])) == {file_paths[0]}
+        assert set(find_files([f"{temp_dir}/**/*.fts"], recursive=True)) == {
+            file_paths[1],
+            file_paths[3],
+        }
+        assert list(find_files([str(file_paths[0])])) == [file_paths[0]]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_main(jobs, capsys):
+    """Test validating files from the command line"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir)
+
+        exit_code = main(
+            [temp_dir, "--recursive", "--jobs", str(jobs), "--warn-data-type"]
+        )
+        captured = capsys.readouterr()
+
+        records = [json.loads(line) for line in captured.out.splitlines()]
+        assert {record["file"] for record in records} == {
+            str(file_path) for file_path in file_paths
+        }
+        for record in records:
+            expected = validate_file(
+                Path(record["file"]), warn_data_type=True, structured=True
+            )
+            assert record["findings"] == [finding.to_dict() for finding in expected]
+            assert record["valid"] == (not expected)
+        assert exit_code == (1 if any(record["findings"] for record in records) else 0)
+
+        summary = json.loads(captured.err.splitlines()[-1])["summary"]
+        assert summary["files"] == len(file_paths)
+        assert summary["findings"] == sum(len(r["findings"]) for r in records)
+        assert summary["cards"] > 0
+        assert summary["files_per_second"] > 0
+        assert summary["cards_per_second"] > 0
+
+
+def test_main_output_file(capsys):
+    """Test writing the findings to a file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir)
+        output_path = Path(temp_dir) / "findings.jsonl"
+
+        main([str(file_paths[0]), "--raw-cards", "--output", str(output_path)])
+        captured = capsys.readouterr()
+
+        assert captured.out == ""
+        records = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert len(records) == 1
+        assert [finding["message"] for finding in records[0]["findings"]] == [
+            finding.message for finding in validate_file(file_paths[0], structured=True)
+        ]
+
+
+def test_main_cache(capsys):
+    """Test validating files with a cache of findings"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir)
+        cache_path = Path(temp_dir) / "cache.sqlite"
+
+        outputs = []
+        for _ in range(2):
+            main([str(file_paths[0]), "--cache", str(cache_path)])
+            outputs.append(capsys.readouterr().out)
+
+        assert cache_path.exists()
+        assert outputs[0] == outputs[1]
+        record = json.loads(outputs[0])
+        assert record["findings"] == [
+            finding.to_dict()
+            for finding in validate_file(file_paths[0], structured=True)
+        ]
+
+
+def test_find_files_overlapping_patterns():
+    """Test that files matched by several paths are found once"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_test_files(temp_dir)
+
+        found = list(find_files([temp_dir, f"{temp_dir}/*.fits", str(file_paths[0])]))
+        assert sorted(found) == sorted(file_paths[:2])
+
+
+def test_main_compressed_file(capsys):
+    """Test that the findings of files that cannot be memory-mapped are reported"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "a.fits.gz"
+        hdu = fits.PrimaryHDU()
+        hdu.header["AUTHOR"] = ("Test Author", "Author name")
+        hdu.writeto(file_path)
+
+        main([str(file_path)])
+        captured = capsys.readouterr()
+
+        record = json.loads(captured.out)
+        assert record["findings"] == [
+            finding.to_dict() for finding in validate_file(file_path, structured=True)
+        ]
+        summary = json.loads(captured.err.splitlines()[-1])["summary"]
+        assert summary["cards"] == len(hdu.header)
+
+
+def test_main_unreadable_file(capsys):
+    """Test validating a file that cannot be read"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        exit_code = main([str(Path(temp_dir) / "missing.fits")])
+        captured = capsys.readouterr()
+
+        assert exit_code == 1
+        record = json.loads(captured.out)
+        assert not record["valid"]
+        assert record["findings"][0]["code"] == "unreadable-file"
+        assert record["findings"][0]["message"].startswith("Could not validate file:")
+
+
+def test_main_invalid_jobs():
+    """Test invalid command-line arguments"""
+    with pytest.raises(SystemExit) as e:
+        main(["file.fits", "--jobs", "0"])
+    assert e.value.code == 2
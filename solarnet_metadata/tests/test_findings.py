@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from solarnet_metadata.findings import (
+    FINDING_MESSAGES,
+    FINDING_SEVERITIES,
+    Finding,
+    FindingSeverity,
+)
+
+
+def test_finding_codes_have_severities():
+    """Test that every finding code has a message and a severity"""
+    assert set(FINDING_MESSAGES) == set(FINDING_SEVERITIES)
+
+
+@pytest.mark.parametrize(
+    "hdu, expected_str",
+    [
+        (None, "Value 'D' for keyword 'VALIDKEY' is not in the list of valid values: ['A', 'B']."),
+        (0, "Primary Header: Value 'D' for keyword 'VALIDKEY' is not in the list of valid values: ['A', 'B']."),
+        (2, "Observation Header 2: Value 'D' for keyword 'VALIDKEY' is not in the list of valid values: ['A', 'B']."),
+    ],
+)  # fmt: skip
+def test_finding_str(hdu, expected_str):
+    """Test rendering findings as strings"""
+    finding = Finding("invalid-value", keyword="VALIDKEY", args=("D", ["A", "B"]))
+    finding = finding.with_hdu(hdu)
+    assert finding.hdu == hdu
+    assert finding.severity == FindingSeverity.ERROR
+    assert str(finding) == expected_str
+
+
+def test_finding_message_is_lazy():
+    """Test that the message of a finding is only formatted when needed"""
+
+    class CountingValue:
+        n_formatted = 0
+
+        def __str__(self):
+            CountingValue.n_formatted += 1
+            return "value"
+
+    finding = Finding("invalid-value", keyword="KEY", args=(CountingValue(), []))
+    assert CountingValue.n_formatted == 0
+    assert (
+        finding.message
+        == "Value 'value' for keyword 'KEY' is not in the list of valid values: []."
+    )
+    _ = finding.message
+    _ = str(finding.with_hdu(1))
+    assert CountingValue.n_formatted == 1
+
+
+def test_finding_dict_round_trip():
+    """Test converting findings to and from dictionaries"""
+    finding = Finding("no-comment", keyword="AUTHOR", hdu=1)
+    data = finding.to_dict()
+    assert data == {
+        "code": "no-comment",
+        "severity": "warning",
+        "hdu": 1,
+        "keyword": "AUTHOR",
+        "message": "Keyword 'AUTHOR' has no comment.",
+    }
+    assert json.loads(json.dumps(data)) == data
+
+    restored = Finding.from_dict(data)
+    assert restored == finding
+    assert hash(restored) == hash(finding)
+    assert str(restored) == str(finding)
+
+
+def test_finding_equality():
+    """Test comparing findings"""
+    finding = Finding("missing-required", keyword="AUTHOR")
+    assert finding == Finding("missing-required", keyword="AUTHOR")
+    assert finding != Finding("missing-required", keyword="AUTHOR", hdu=0)
+    assert finding != Finding("missing-optional", keyword="AUTHOR")
+    assert finding != str(finding)
+    assert "AUTHOR" in repr(finding)
@@ -0,0 +1,283 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from solarnet_metadata.headers import (
+    BLOCK_SIZE,
+    get_data_size,
+    is_compressed_image,
+    iter_headers,
+    iter_raw_headers,
+    parse_card,
+    parse_header_cards,
+    read_header_bytes,
+)
+from solarnet_metadata.validation import validate_file
+
+
+def create_multi_extension_file(filepath):
+    """Create a FITS file with data in the primary HDU and several extensions."""
+    primary_hdu = fits.PrimaryHDU(data=np.arange(100, dtype=np.int16).reshape(10, 10))
+    primary_hdu.header["AUTHOR"] = ("Test Author", "Author name")
+    image_hdu = fits.ImageHDU(data=np.ones((3, 50, 7), dtype=np.float64), name="CUBE")
+    image_hdu.header["OBS_HDU"] = (1, "Observation HDU flag")
+    table_hdu = fits.BinTableHDU.from_columns(
+        [
+            fits.Column(name="a", format="J", array=np.arange(5)),
+            fits.Column(
+                name="b",
+                format="PJ()",
+                array=np.array([[0], [0, 1], [0, 1, 2], [1], [2, 3]], dtype=object),
+            ),
+        ],
+        name="TABLE",
+    )
+    empty_hdu = fits.ImageHDU(name="EMPTY")
+    hdul = fits.HDUList([primary_hdu, image_hdu, table_hdu, empty_hdu])
+    hdul.writeto(filepath, overwrite=True)
+    return filepath
+
+
+def create_compressed_file(filepath):
+    """Create a FITS file with a tile-compressed image extension."""
+    image_hdu = fits.CompImageHDU(data=np.ones((64, 32), dtype=np.float32))
+    image_hdu.header["OBS_HDU"] = (1, "Observation HDU flag")
+    image_hdu.header["BTYPE"] = ("phot.count", "Type of data")
+    hdul = fits.HDUList([fits.PrimaryHDU(), image_hdu])
+    hdul.writeto(filepath, overwrite=True)
+    return filepath
+
+
+def test_iter_headers_matches_astropy():
+    """Test that the header-only reader returns the same headers as astropy"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_multi_extension_file(Path(temp_dir) / "test_file.fits")
+
+        headers = list(iter_headers(filepath))
+        with fits.open(filepath) as hdul:
+            assert len(headers) == len(hdul)
+            for header, hdu in zip(headers, hdul):
+                assert header == hdu.header
+
+
+def test_iter_headers_trailing_data():
+    """Test that unexpected data after the last HDU is ignored"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_multi_extension_file(Path(temp_dir) / "test_file.fits")
+        with open(filepath, "ab") as f:
+            f.write(b"\0" * BLOCK_SIZE)
+
+        headers = list(iter_headers(filepath))
+        assert len(headers) == 4
+
+
+@pytest.mark.parametrize("content", [b"", b"NOT A FITS FILE" * 200])
+def test_iter_headers_invalid_file(content):
+    """Test reading headers from a file that is not a FITS file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = Path(temp_dir) / "test_file.fits"
+        with open(filepath, "wb") as f:
+            f.write(content)
+
+        with pytest.raises(OSError):
+            _ = list(iter_headers(filepath))
+
+
+def test_read_header_bytes_missing_end():
+    """Test reading a header that ends before the END card"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = Path(temp_dir) / "test_file.fits"
+        header = fits.Header([("SIMPLE", True), ("NAXIS", 0)])
+        with open(filepath, "wb") as f:
+            f.write(header.tostring(endcard=False, padding=True).encode("ascii"))
+
+        with open(filepath, "rb") as f:
+            with pytest.raises(OSError):
+                _ = read_header_bytes(f)
+
+
+@pytest.mark.parametrize(
+    "header, expected_size",
+    [
+        ({"NAXIS": 0}, 0),
+        ({"BITPIX": 8, "NAXIS": 1, "NAXIS1": 1}, BLOCK_SIZE),
+        ({"BITPIX": 16, "NAXIS": 2, "NAXIS1": 1440, "NAXIS2": 1}, BLOCK_SIZE),
+        ({"BITPIX": -64, "NAXIS": 2, "NAXIS1": 10, "NAXIS2": 37}, 2 * BLOCK_SIZE),
+        (
+            {"BITPIX": 8, "NAXIS": 2, "NAXIS1": 4, "NAXIS2": 10, "PCOUNT": 2840},
+            BLOCK_SIZE,
+        ),
+        (
+            {
+                "BITPIX": -32,
+                "NAXIS": 2,
+                "NAXIS1": 0,
+                "NAXIS2": 3,
+                "GROUPS": True,
+                "PCOUNT": 2,
+                "GCOUNT": 10,
+            },
+            BLOCK_SIZE,
+        ),
+    ],
+)
+def test_get_data_size(header, expected_size):
+    """Test computing the padded size of the data following a header"""
+    assert get_data_size(header) == expected_size
+
+
+def test_validate_file_header_only():
+    """Test that header-only validation gives the same findings as astropy"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_multi_extension_file(Path(temp_dir) / "test_file.fits")
+
+        findings = validate_file(filepath, warn_data_type=True)
+        assert findings
+        assert validate_file(filepath, warn_data_type=True, header_only=True) == (
+            findings
+        )
+
+
+# fmt: off
+@pytest.mark.parametrize(
+    "card",
+    [
+        "SIMPLE  =                    T / conforms to FITS standard",
+        "EXTEND  =                    F",
+        "NAXIS   =                    0",
+        "INT     =                  +12 / signed",
+        "INT     =                  007",
+        "FLT     =                1.5E3 / exponent",
+        "FLT     =                1.5D3",
+        "FLT     =                   1.",
+        "FLT     =                   .5",
+        "FLT     =                 -0.0",
+        "FLT     = 1.0e3 / lowercase exponent",
+        "AUTHOR  = 'O''Brien   '         / name   ",
+        "AUTHOR  = '  leading spaces'/no space before comment",
+        "AUTHOR  = ''",
+        "AUTHOR  = '    '",
+        "SLASH   = 'a/b' / c/d",
+        "SPC     =   1 /",
+        "COMMENT   indented comment   ",
+        "HISTORY history entry",
+        "        blank keyword text",
+        "",
+        "lower   = 1",
+        "NOVALUE this card has no value indicator",
+        "EQ      =1",
+        "UNDEF   =                      / undefined value",
+        "CPLX    = (1, 2)",
+        "HIERARCH LONG KEYWORD = 'value' / hierarch card",
+    ],
+)
+# fmt: on
+def test_parse_card_matches_astropy(card):
+    """Test that parsing raw cards gives the same results as astropy"""
+    card = card.ljust(80)
+    astropy_card = fits.Card.fromstring(card)
+    keyword, value, comment = parse_card(card.encode("ascii"))
+
+    assert keyword == astropy_card.keyword
+    assert type(value) is type(astropy_card.value)
+    assert value == astropy_card.value
+    assert comment == astropy_card.comment
+
+
+def test_parse_header_cards_matches_astropy():
+    """Test that parsing a raw header gives the same cards as astropy"""
+    header = fits.Header()
+    header["SIMPLE"] = (True, "conforms to FITS standard")
+    header["BITPIX"] = 8
+    header["NAXIS"] = 0
+    header["AUTHOR"] = ("O'Brien", "Author name")
+    header["LONGSTR"] = ("x" * 100, "A long string value using CONTINUE cards")
+    header["EXPTIME"] = (1.5, "[s] exposure time")
+    header["COMMENT"] = "A comment"
+    header.append(fits.Card())
+    header["HISTORY"] = "A history entry"
+    header_bytes = header.tostring().encode("ascii")
+
+    expected = [(card.keyword, card.value, card.comment) for card in header.cards]
+    assert parse_header_cards(header_bytes) == expected
+    del header["LONGSTR"]
+    expected = [(card.keyword, card.value, card.comment) for card in header.cards]
+    assert parse_header_cards(header.tostring().encode("ascii")) == expected
+
+
+def test_iter_raw_headers_matches_astropy():
+    """Test that the memory-mapped reader returns the same headers as astropy"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_multi_extension_file(Path(temp_dir) / "test_file.fits")
+        with open(filepath, "ab") as f:
+            f.write(b"\0" * BLOCK_SIZE)
+
+        raw_headers = list(iter_raw_headers(filepath))
+        with fits.open(filepath) as hdul:
+            assert len(raw_headers) == len(hdul)
+            for raw_header, hdu in zip(raw_headers, hdul):
+                assert fits.Header.fromstring(raw_header) == hdu.header
+                assert parse_header_cards(raw_header) == [
+                    (card.keyword, card.value, card.comment)
+                    for card in hdu.header.cards
+                ]
+
+
+@pytest.mark.parametrize("content", [b"", b"NOT A FITS FILE" * 200])
+def test_iter_raw_headers_invalid_file(content):
+    """Test reading raw headers from a file that is not a FITS file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = Path(temp_dir) / "test_file.fits"
+        with open(filepath, "wb") as f:
+            f.write(content)
+
+        with pytest.raises(OSError):
+            _ = list(iter_raw_headers(filepath))
+
+
+@pytest.mark.parametrize(
+    "warn_params", [(False, False, False, False), (True, True, True, True)]
+)
+def test_validate_file_raw_cards(warn_params):
+    """Test that raw-card validation gives the same findings as astropy"""
+    warn_empty, warn_comment, warn_data_type, warn_optional = warn_params
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_multi_extension_file(Path(temp_dir) / "test_file.fits")
+
+        kwargs = dict(
+            warn_empty_keyword=warn_empty,
+            warn_no_comment=warn_comment,
+            warn_data_type=warn_data_type,
+            warn_missing_optional=warn_optional,
+        )
+        findings = validate_file(filepath, **kwargs)
+        assert findings
+        assert validate_file(filepath, raw_cards=True, **kwargs) == findings
+
+
+def test_is_compressed_image():
+    """Test detecting the binary tables of tile-compressed images"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_compressed_file(Path(temp_dir) / "test_file.fits")
+        raw_headers = list(iter_raw_headers(filepath))
+        assert [is_compressed_image(header) for header in raw_headers] == [False, True]
+        headers = list(iter_headers(filepath))
+        assert [is_compressed_image(header) for header in headers] == [False, True]
+
+        filepath = create_multi_extension_file(Path(temp_dir) / "other_file.fits")
+        assert not any(is_compressed_image(h) for h in iter_raw_headers(filepath))
+
+
+@pytest.mark.parametrize("read_option", ["header_only", "raw_cards"])
+def test_validate_file_compressed_image(read_option):
+    """Test that tile-compressed images are validated as images, as with astropy"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_compressed_file(Path(temp_dir) / "test_file.fits")
+
+        kwargs = dict(warn_no_comment=True, warn_data_type=True)
+        findings = validate_file(filepath, **kwargs)
+        assert not any("ZIMAGE" in finding for finding in findings)
+        assert validate_file(filepath, **{read_option: True}, **kwargs) == findings
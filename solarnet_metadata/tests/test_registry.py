@@ -0,0 +1,207 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+from astropy.io import fits
+
+import solarnet_metadata.schema
+from solarnet_metadata import data_directory
+from solarnet_metadata.registry import SchemaRegistry
+from solarnet_metadata.schema import (
+    DEFAULT_ATTRS_SCHEMA_FILE,
+    SOLARNETSchema,
+    get_schema,
+)
+from solarnet_metadata.validation import validate_header
+
+
+def create_layer(directory, name, attributes):
+    """Create a schema layer file with the given attributes."""
+    layer_path = Path(directory) / f"{name}.yaml"
+    layer_path.write_text(yaml.dump({"attribute_key": attributes}))
+    return layer_path
+
+
+def required_layer(directory, keyword):
+    """Create a schema layer file requiring a keyword in all headers."""
+    return create_layer(
+        directory, keyword.lower(), {keyword: {"data_type": "str", "required": "all"}}
+    )
+
+
+def test_registry_routing():
+    """Test routing headers to schemas by INSTRUME and TELESCOP"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry = SchemaRegistry()
+        crisp_layer = required_layer(temp_dir, "CRISPKEY")
+        sst_layer = required_layer(temp_dir, "SSTKEY")
+        chromis_layer = required_layer(temp_dir, "CHROMKEY")
+        registry.register([crisp_layer], instrument="CRISP")
+        registry.register([sst_layer], telescope="SST")
+        registry.register([chromis_layer], instrument="CHROMIS", telescope="SST")
+
+        def route(header):
+            return set(registry.schema_for_header(header).attribute_key)
+
+        assert "CRISPKEY" in route({"INSTRUME": "CRISP", "TELESCOP": "SST"})
+        assert "CRISPKEY" in route({"INSTRUME": " crisp  "})
+        assert "CHROMKEY" in route({"INSTRUME": "CHROMIS", "TELESCOP": "SST"})
+        assert "CHROMKEY" in route({"INSTRUME": "chromis", "TELESCOP": "sst"})
+        assert "SSTKEY" not in route({"INSTRUME": "CHROMIS", "TELESCOP": "SST"})
+        assert "SSTKEY" in route({"INSTRUME": "OTHER", "TELESCOP": "SST"})
+        assert route({"INSTRUME": "OTHER"}) == set(get_schema().attribute_key)
+        assert registry.schema_for_header({}) is registry.get_schema()
+        assert len(registry) == 4
+
+        # Headers of the same instrument share the schema
+        schema = registry.schema_for_header({"INSTRUME": "CRISP"})
+        assert registry.schema_for_header({"INSTRUME": "crisp"}) is schema
+        header = fits.Header()
+        header["INSTRUME"] = ("CRISP", "Instrument name")
+        assert registry.schema_for_header(header) is schema
+        assert "Missing Required Attribute: CRISPKEY" in validate_header(
+            header, schema=registry.schema_for_header(header)
+        )
+
+
+def test_registry_lru():
+    """Test that the least recently used schemas are evicted"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry = SchemaRegistry(max_size=2)
+        for instrument in ["A", "B", "C"]:
+            layer = required_layer(temp_dir, f"KEY{instrument}")
+            registry.register([layer], instrument=instrument)
+
+        schema_a = registry.schema_for_header({"INSTRUME": "A"})
+        schema_b = registry.schema_for_header({"INSTRUME": "B"})
+        assert registry.schema_for_header({"INSTRUME": "A"}) is schema_a
+        _ = registry.schema_for_header({"INSTRUME": "C"})
+        assert len(registry) == 2
+
+        # B was the least recently used schema
+        layers_b = registry.get_schema_layers(instrument="B")
+        assert [layers[-1] for layers in registry._schemas] == [
+            registry.get_schema_layers(instrument=instrument)[0].resolve()
+            for instrument in ["A", "C"]
+        ]
+        assert registry.schema_for_header({"INSTRUME": "A"}) is schema_a
+
+        # Evicting a schema from the registry leaves it in the shared schema cache
+        assert get_schema(schema_layers=layers_b) is schema_b
+        assert registry.schema_for_header({"INSTRUME": "B"}) is schema_b
+
+        # The schemas share the default schema
+        assert schema_a.attribute_key["AUTHOR"] is schema_b.attribute_key["AUTHOR"]
+
+        registry.clear()
+        assert len(registry) == 0
+
+
+def test_registry_eviction_keeps_shared_schemas():
+    """Test that evicting a schema from a registry does not rebuild it for other users"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry = SchemaRegistry(max_size=1)
+        default_schema = get_schema()
+        assert registry.get_schema() is default_schema
+        _ = registry.get_schema([required_layer(temp_dir, "LAYERKEY")])
+        assert len(registry) == 1
+        assert get_schema() is default_schema
+        assert registry.get_schema() is default_schema
+
+
+def test_registry_resolved_layers(monkeypatch):
+    """Test that the same layer file given by different paths is kept once"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        required_layer(temp_dir, "LAYERKEY")
+        monkeypatch.chdir(temp_dir)
+        registry = SchemaRegistry()
+        schema = registry.get_schema(["layerkey.yaml"])
+        assert registry.get_schema(["./layerkey.yaml"]) is schema
+        assert registry.get_schema([Path(temp_dir) / "layerkey.yaml"]) is schema
+        assert len(registry) == 1
+
+
+def test_registry_layer_change():
+    """Test that a schema is built again when its layer file is modified"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry = SchemaRegistry()
+        layer = required_layer(temp_dir, "NEWKEY")
+        registry.register([layer], instrument="NEW")
+        schema = registry.schema_for_header({"INSTRUME": "NEW"})
+        assert schema.attribute_key["NEWKEY"]["required"] == "all"
+
+        time.sleep(0.01)
+        create_layer(temp_dir, "newkey", {"NEWKEY": {"required": "optional"}})
+        schema = registry.schema_for_header({"INSTRUME": "NEW"})
+        assert schema.attribute_key["NEWKEY"]["required"] == "optional"
+
+
+def test_registry_default_layer_change(monkeypatch):
+    """Test that the schemas are built again when the default schema is modified"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        default_layer = Path(temp_dir) / DEFAULT_ATTRS_SCHEMA_FILE
+        shutil.copy(Path(data_directory) / DEFAULT_ATTRS_SCHEMA_FILE, default_layer)
+        monkeypatch.setattr(solarnet_metadata.schema, "data_directory", temp_dir)
+
+        registry = SchemaRegistry()
+        registry.register([required_layer(temp_dir, "INSTKEY")], instrument="INST")
+        schema = registry.schema_for_header({"INSTRUME": "INST"})
+        assert "DEFKEY" not in schema.attribute_key
+
+        time.sleep(0.01)
+        default_schema = yaml.safe_load(default_layer.read_text())
+        default_schema["attribute_key"]["DEFKEY"] = {
+            "data_type": "str",
+            "required": "all",
+        }
+        default_layer.write_text(yaml.dump(default_schema))
+        schema = registry.schema_for_header({"INSTRUME": "INST"})
+        assert schema.attribute_key["DEFKEY"]["required"] == "all"
+        assert "INSTKEY" in schema.attribute_key
+
+
+def test_registry_base_layers():
+    """Test the base layers shared by all of the schemas of a registry"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_layer = required_layer(temp_dir, "ARCHKEY")
+        registry = SchemaRegistry(use_defaults=False, schema_layers=[base_layer])
+        registry.register([required_layer(temp_dir, "INSTKEY")], instrument="INST")
+
+        assert set(registry.get_schema().attribute_key) == {"ARCHKEY"}
+        schema = registry.schema_for_header({"INSTRUME": "INST"})
+        assert set(schema.attribute_key) == {"ARCHKEY", "INSTKEY"}
+        assert isinstance(schema, SOLARNETSchema)
+
+
+def test_registry_schema_for_file():
+    """Test routing a file by the INSTRUME and TELESCOP of its primary header"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry = SchemaRegistry()
+        registry.register([required_layer(temp_dir, "INSTKEY")], instrument="INST")
+
+        file_path = Path(temp_dir) / "test_file.fits"
+        primary_hdu = fits.PrimaryHDU()
+        primary_hdu.header["INSTRUME"] = ("INST", "Instrument name")
+        image_hdu = fits.ImageHDU()
+        image_hdu.header["INSTRUME"] = ("OTHER", "Instrument name")
+        fits.HDUList([primary_hdu, image_hdu]).writeto(file_path)
+
+        schema = registry.schema_for_file(file_path)
+        assert schema is registry.schema_for_header({"INSTRUME": "INST"})
+
+
+def test_registry_errors():
+    """Test the errors of invalid registry arguments"""
+    with pytest.raises(ValueError):
+        _ = SchemaRegistry(max_size=0)
+    with pytest.raises(ValueError):
+        _ = SchemaRegistry(use_defaults=False)
+
+    registry = SchemaRegistry()
+    with pytest.raises(ValueError):
+        registry.register([])
+    with pytest.raises(FileNotFoundError):
+        registry.register(["non_existant_layer.yaml"], instrument="INST")
@@ -1,13 +1,32 @@
+import os
+import pickle
+import subprocess
+import sys
 import tempfile
+from collections.abc import Mapping
+from datetime import datetime
 from pathlib import Path
 
 import astropy.io.fits as fits
+import numpy as np
 import pytest
 import yaml
 from astropy.table import Table
 
-from solarnet_metadata.schema import SOLARNETSchema
-from solarnet_metadata.util import KeywordRequirement, load_yaml_data
+from solarnet_metadata import data_directory, util
+from solarnet_metadata.schema import (
+    SOLARNETSchema,
+    _thaw,
+    clear_schema_cache,
+    get_schema,
+)
+from solarnet_metadata.util import (
+    KeywordRequirement,
+    compile_yaml_data,
+    get_cache_directory,
+    load_yaml_data,
+)
+from solarnet_metadata.validation import validate_file, validate_header
 
 
 def test_schema_default():
@@ -16,11 +35,11 @@ def test_schema_default():
 
     # Attribute Schema
     assert schema.attribute_schema is not None
-    assert isinstance(schema.attribute_schema, dict)
+    assert isinstance(schema.attribute_schema, Mapping)
 
     # Attribute Key
     assert schema.attribute_key is not None
-    assert isinstance(schema.attribute_key, dict)
+    assert isinstance(schema.attribute_key, Mapping)
 
     # Default Attributes
     assert schema.default_attributes is not None
@@ -94,6 +113,192 @@ def test_load_yaml_data_bad_data():
             _ = load_yaml_data(tmpdirname + "test.yaml")
 
 
+@pytest.mark.parametrize("use_compiled", [False, True])
+def test_load_yaml_data_bad_data_compiled(use_compiled, monkeypatch):
+    """Test that invalid YAML is not compiled"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", tmpdirname)
+        yaml_path = Path(tmpdirname) / "test.yaml"
+        yaml_path.write_text("name: John Doe\nage 30\n")
+
+        with pytest.raises(yaml.YAMLError):
+            _ = load_yaml_data(yaml_path, use_compiled=use_compiled)
+        assert not list(Path(tmpdirname).glob("*.json"))
+
+
+def test_load_yaml_data_compiled(monkeypatch):
+    """Test loading YAML data from a compiled copy of the YAML file"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", tmpdirname)
+        yaml_path = Path(tmpdirname) / "layer.yaml"
+        yaml_path.write_text(
+            """
+            attribute_key:
+                DATE-OBS:
+                    data_type: date
+                    default: 2024-01-01T12:00:00
+                    valid_values: [2024-01-01, 1.5, true, null]
+            """
+        )
+        expected = load_yaml_data(yaml_path)
+
+        # The YAML file is compiled on first use
+        assert load_yaml_data(yaml_path, use_compiled=True) == expected
+        compiled_paths = list(Path(tmpdirname).glob("layer-*.json"))
+        assert len(compiled_paths) == 1
+
+        # The compiled copy is used without parsing the YAML file, including by copies
+        # of the YAML file in other places
+        copied_path = Path(tmpdirname) / "copy" / "layer.yaml"
+        copied_path.parent.mkdir()
+        copied_path.write_bytes(yaml_path.read_bytes())
+        with monkeypatch.context() as m:
+            m.setattr(yaml, "load", None)
+            assert load_yaml_data(yaml_path, use_compiled=True) == expected
+            assert load_yaml_data(copied_path, use_compiled=True) == expected
+        assert list(Path(tmpdirname).glob("layer-*.json")) == compiled_paths
+
+        # The YAML file is parsed again when it changes
+        yaml_path.write_text("attribute_key: {}\n")
+        assert load_yaml_data(yaml_path, use_compiled=True) == {"attribute_key": {}}
+        compiled_paths = set(Path(tmpdirname).glob("layer-*.json")) - set(
+            compiled_paths
+        )
+        assert len(compiled_paths) == 1
+
+        # Invalid compiled files are ignored and replaced
+        compiled_paths.pop().write_text("not json")
+        assert load_yaml_data(yaml_path, use_compiled=True) == {"attribute_key": {}}
+        with monkeypatch.context() as m:
+            m.setattr(yaml, "load", None)
+            assert load_yaml_data(yaml_path, use_compiled=True) == {"attribute_key": {}}
+
+
+def test_load_yaml_data_compiled_opt_in(monkeypatch):
+    """Test that YAML files are only compiled on request with `write_compiled=False`"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        cache_directory = Path(tmpdirname) / "cache"
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", str(cache_directory))
+        yaml_path = Path(tmpdirname) / "layer.yaml"
+        yaml_path.write_text("attribute_key: {}\n")
+
+        assert load_yaml_data(yaml_path, use_compiled=True, write_compiled=False) == {
+            "attribute_key": {}
+        }
+        assert not cache_directory.exists()
+
+        # Copies compiled ahead of time are used
+        compile_yaml_data(yaml_path)
+        with monkeypatch.context() as m:
+            m.setattr(yaml, "load", None)
+            assert load_yaml_data(
+                yaml_path, use_compiled=True, write_compiled=False
+            ) == {"attribute_key": {}}
+
+
+def test_compile_yaml_data(monkeypatch):
+    """Test compiling YAML files ahead of time"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", tmpdirname)
+        yaml_path = Path(tmpdirname) / "layer.yaml"
+        yaml_path.write_text("attribute_key: {}\n")
+
+        compiled_path = compile_yaml_data(yaml_path)
+        assert compiled_path.parent == Path(tmpdirname)
+        custom_path = compile_yaml_data(yaml_path, Path(tmpdirname) / "out.json")
+        assert custom_path.read_text() == compiled_path.read_text()
+
+        # Data that cannot be represented exactly is not compiled
+        yaml_path.write_text("1: one\n")
+        assert compile_yaml_data(yaml_path) is None
+        assert load_yaml_data(yaml_path, use_compiled=True) == {1: "one"}
+
+        # Compiled files can be disabled
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", "")
+        assert get_cache_directory() is None
+        assert compile_yaml_data(yaml_path) is None
+        assert load_yaml_data(yaml_path, use_compiled=True) == {1: "one"}
+
+
+def test_compile_yaml_data_write_error(monkeypatch):
+    """Test that no temporary file is left behind if a compiled file is not written"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", tmpdirname)
+        yaml_path = Path(tmpdirname) / "layer.yaml"
+        yaml_path.write_text("attribute_key: {}\n")
+
+        def failing_replace(src, dst):
+            raise OSError("Cannot replace file")
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            compile_yaml_data(yaml_path)
+        assert load_yaml_data(yaml_path, use_compiled=True) == {"attribute_key": {}}
+        assert sorted(path.name for path in Path(tmpdirname).iterdir()) == [
+            "layer.yaml"
+        ]
+
+
+def test_schema_compiled_default(monkeypatch):
+    """Test that the default schema is the same when loaded from the compiled schema"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", tmpdirname)
+        # Load the schema layers again rather than from the layers loaded before
+        clear_schema_cache()
+        schema = SOLARNETSchema()
+        clear_schema_cache()
+        compiled_schema = SOLARNETSchema()
+        assert list(Path(tmpdirname).glob("*.json"))
+        assert compiled_schema.attribute_schema == schema.attribute_schema
+        # The schema is read-only, with tuples in place of the lists of the YAML file
+        assert _thaw(compiled_schema.attribute_schema) == load_yaml_data(
+            Path(data_directory) / "SOLARNET_attr_schema.yaml"
+        )
+
+
+def test_schema_custom_layers_not_compiled(cache_directory):
+    """Test that custom schema layers are not compiled to the cache directory"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        layer_path = Path(tmpdirname) / "layer.yaml"
+        layer_path.write_text(
+            yaml.dump({"attribute_key": {"AUTHOR": {"required": "all"}}})
+        )
+        clear_schema_cache()
+        schema = SOLARNETSchema(schema_layers=[layer_path])
+        assert schema.attribute_key["AUTHOR"]["required"] == "all"
+        assert not list(cache_directory.glob("layer-*.json"))
+
+
+@pytest.mark.parametrize("loader", [yaml.SafeLoader, util.YAML_LOADER])
+def test_schema_yaml_loaders(loader, monkeypatch):
+    """Test that the C and pure-Python YAML loaders give the same schemas"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        monkeypatch.setenv("SOLARNET_METADATA_CACHE_DIR", "")
+        layer_path = Path(tmpdirname) / "layer.yaml"
+        layer_path.write_text(
+            """
+            attribute_key:
+                DATE-OBS:
+                    data_type: date
+                    default: 2024-01-01T12:00:00
+                    description: Start of the observation
+                    human_readable: Observation Start
+                    required: optional
+            """
+        )
+        expected = SOLARNETSchema(schema_layers=[layer_path])
+        monkeypatch.setattr(util, "YAML_LOADER", loader)
+        clear_schema_cache()
+        schema = SOLARNETSchema(schema_layers=[layer_path])
+
+        assert util.YAML_LOADER.__name__ in ("CSafeLoader", "SafeLoader")
+        assert schema.attribute_schema == expected.attribute_schema
+        assert schema.fingerprint == expected.fingerprint
+        assert schema.attribute_key["DATE-OBS"]["default"] == datetime(2024, 1, 1, 12)
+        assert schema.default_attributes["DATE-OBS"] == "2024-01-01T12:00:00"
+        assert schema.default_attributes == expected.default_attributes
+
+
 def test_schema_load_default_attributes():
     """Test Getting the Default Attributes from the Schema"""
     schema = SOLARNETSchema()
@@ -110,6 +315,50 @@ def test_schema_load_default_attributes():
             assert keyword not in header
 
 
+def test_schema_default_attributes_lazy(monkeypatch):
+    """Test that the default attributes are built on first access only"""
+    calls = []
+    load_default_attributes = SOLARNETSchema.load_default_attributes
+
+    def counting_load_default_attributes(self):
+        calls.append(self)
+        return load_default_attributes(self)
+
+    monkeypatch.setattr(
+        SOLARNETSchema, "load_default_attributes", counting_load_default_attributes
+    )
+    schema = SOLARNETSchema()
+    _ = schema.get_required_keyword_set(primary=True)
+    assert calls == []
+
+    header = schema.default_attributes
+    assert schema.default_attributes is header
+    _ = schema.attribute_template()
+    assert calls == [schema]
+
+
+def test_schema_validation_without_astropy():
+    """Test that a schema used only for validating raw cards does not import astropy"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        file_path = Path(tmpdirname) / "test_file.fits"
+        hdu = fits.PrimaryHDU()
+        hdu.header["VALIDKEY"] = ("value", "")
+        hdu.writeto(file_path)
+
+        code = (
+            "import sys\n"
+            "from solarnet_metadata.validation import validate_file\n"
+            f"print(validate_file({str(file_path)!r}, raw_cards=True))\n"
+            "print([name for name in sys.modules if name.startswith('astropy')])\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        findings, astropy_modules = result.stdout.splitlines()
+        assert findings == str(validate_file(file_path, warn_data_type=False))
+        assert astropy_modules == "[]"
+
+
 def test_default_schema_keyword_origins_are_populated():
     """Test that default schema keyword origins are always set to a known code."""
     schema = SOLARNETSchema()
@@ -517,6 +766,48 @@ def test_attribute_template_combined_parameters():
         assert "SPECSYS" in template
 
 
+def test_attribute_template_memoized():
+    """Test that attribute templates are built once and returned as copies"""
+    schema = SOLARNETSchema()
+    template = schema.attribute_template(
+        primary=True, observatory_type="ground-based", instrument_type="Spectrograph"
+    )
+    for keyword in ["OBSGEO-X", "SPECSYS", "WAVEUNIT"]:
+        assert keyword in template
+
+    # Modifying a template does not modify the next template
+    template["OBSGEO-X"] = 1.0
+    template["NEWKEY"] = "value"
+    new_template = schema.attribute_template(
+        primary=True, observatory_type="ground-based", instrument_type="Spectrograph"
+    )
+    assert new_template is not template
+    assert new_template["OBSGEO-X"] is None
+    assert "NEWKEY" not in new_template
+
+    # Unknown observatory and instrument types add no requirements
+    template = schema.attribute_template(
+        primary=True, observatory_type="unknown", instrument_type=["unknown"]
+    )
+    assert [tuple(card) for card in template.cards] == [
+        tuple(card) for card in schema.attribute_template(primary=True).cards
+    ]
+
+
+def test_get_conditional_keyword_names():
+    """Test getting the keywords required by conditional requirements"""
+    schema = SOLARNETSchema()
+    assert schema.get_conditional_keyword_names("OBS_TYPE", "ground-based") == (
+        "OBSGEO-X",
+        "OBSGEO-Y",
+        "OBSGEO-Z",
+    )
+    assert "WAVEMIN" in schema.get_conditional_keyword_names("INST_TYP", "Spectrograph")
+    assert schema.get_conditional_keyword_names("INST_TYP", "Imager") == ()
+    assert schema.get_conditional_keyword_names("UNKNOWN", "value") == ()
+    assert schema.get_conditional_keyword_names("OBS_TYPE", ["unhashable"]) == ()
+
+
 def test_attribute_info_all():
     """Test getting info for all attributes"""
     schema = SOLARNETSchema()
@@ -581,3 +872,372 @@ def test_attribute_info_nonexistent():
     # Should raise KeyError for nonexistent attribute
     with pytest.raises(KeyError, match="Cannot find attribute name: NONEXISTENT"):
         schema.attribute_info(attribute_name="NONEXISTENT")
+
+
+def test_attribute_info_does_not_modify_schema():
+    """Test that attribute_info does not modify the schema or the cached table"""
+    schema = SOLARNETSchema()
+    name, description = next(
+        (name, info["description"])
+        for name, info in schema.attribute_key.items()
+        if info["description"] != info["description"].strip()
+    )
+
+    info = schema.attribute_info()
+    assert info[list(info["Attribute"]).index(name)]["description"] == (
+        description.strip()
+    )
+    assert schema.attribute_key[name]["description"] == description
+
+    # Returned tables are copies of the cached table
+    info["description"][:] = ""
+    attr_info = schema.attribute_info(name)
+    assert attr_info["description"][0] == description.strip()
+    attr_info["description"][0] = ""
+    assert schema.attribute_info(name)["description"][0] == description.strip()
+    assert schema.attribute_info().colnames == attr_info.colnames
+
+
+def test_get_schema_cached():
+    """Test that get_schema returns a shared schema instance"""
+    clear_schema_cache()
+    schema = get_schema()
+    assert isinstance(schema, SOLARNETSchema)
+    assert get_schema() is schema
+    assert get_schema(use_defaults=True) is schema
+
+    # Clearing the cache forces a new schema to be built
+    clear_schema_cache()
+    assert get_schema() is not schema
+
+
+def test_get_schema_invalidated_on_layer_change():
+    """Test that get_schema rebuilds the schema when a layer file changes"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        test_path = Path(tmpdirname) / "layer_test.yaml"
+        with open(test_path, "w") as file:
+            file.write("attribute_key: {}\n")
+
+        schema = get_schema(schema_layers=[test_path], use_defaults=False)
+        assert len(schema.attribute_key) == 0
+        assert get_schema(schema_layers=[test_path], use_defaults=False) is schema
+
+        # Modify the Layer File
+        with open(test_path, "w") as file:
+            file.write(
+                """
+                attribute_key:
+                    TEST_ATTR:
+                        data_type: str
+                        default: null
+                        human_readable: Test Attribute
+                        required: optional
+                """
+            )
+        stat = test_path.stat()
+        os.utime(test_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        new_schema = get_schema(schema_layers=[test_path], use_defaults=False)
+        assert new_schema is not schema
+        assert "TEST_ATTR" in new_schema.attribute_key
+
+
+def test_get_schema_missing_layer():
+    """Test get_schema with a non-existant layer file"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        with pytest.raises(FileNotFoundError):
+            _ = get_schema(schema_layers=[Path(tmpdirname) / "missing.yaml"])
+
+
+@pytest.mark.parametrize(
+    "keyword, expected_attribute",
+    [
+        ("AUTHOR", "AUTHOR"),
+        ("CTYPE1A", "CTYPEia"),
+        ("CTYPE1", "CTYPEia"),
+        ("PC1_2", "PCi_ja"),
+        ("PRSTEP3", "PRSTEPn"),
+        ("NAXIS1", "NAXISn"),
+        ("NOTAKEY", None),
+        ("", None),
+    ],
+)
+def test_match_attribute_default_schema(keyword, expected_attribute):
+    """Test resolving keywords to attributes in the default schema"""
+    schema = get_schema()
+    assert schema.match_attribute(keyword) == expected_attribute
+
+
+def test_match_attribute_pattern_order():
+    """Test that overlapping and back-referencing patterns resolve in schema order"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        schema_content = """
+        attribute_key:
+            KEYn:
+                data_type: str
+                required: optional
+                pattern: KEY(?P<n>[1-9])
+            KEYab:
+                data_type: str
+                required: optional
+                pattern: KEY(?P<a>[0-9])(?P<b>[A-Z])?
+        """
+        test_path = Path(tmpdirname) / "test_schema.yaml"
+        with open(test_path, "w") as file:
+            file.write(schema_content)
+        schema = SOLARNETSchema(schema_layers=[test_path], use_defaults=False)
+
+        assert schema.match_attribute("KEY1") == "KEYn"
+        assert schema.match_attribute("KEY0") == "KEYab"
+        assert schema.match_attribute("KEY1A") == "KEYab"
+        assert schema.match_pattern("KEYn") is None
+
+        # Both patterns match KEY1, even though it resolves to the first attribute
+        assert schema.pattern_matches("KEYab", ["KEY1"])
+        assert not schema.pattern_matches("KEYab", ["OTHER"])
+        assert not schema.pattern_matches("NOTAKEY", ["KEY1"])
+
+        # Patterns with back-references are matched individually
+        attribute_key = dict(schema.attribute_key)
+        attribute_key["REPab"] = {
+            "required": "optional",
+            "pattern": "REP(?P<a>[A-Z])(?P=a)",
+        }
+        schema._attr_schema = {**schema._attr_schema, "attribute_key": attribute_key}
+        assert schema.match_attribute("REPAA") == "REPab"
+        assert schema.match_attribute("REPAB") is None
+        assert schema.match_attribute("KEY1") == "KEYn"
+
+
+@pytest.mark.parametrize("primary", [False, True])
+@pytest.mark.parametrize("obs", [False, True])
+def test_required_keyword_partitions(primary, obs):
+    """Test the precomputed requirement partitions match the required keywords"""
+    schema = get_schema()
+    required_keywords = schema.get_required_keywords(primary=primary, obs=obs)
+
+    names = schema.get_required_keyword_names(primary=primary, obs=obs)
+    assert isinstance(names, tuple)
+    assert names == tuple(required_keywords.keys())
+    assert schema.get_required_keyword_set(primary=primary, obs=obs) == frozenset(names)
+
+    # Partitions are computed once and shared between calls
+    assert schema.get_required_keyword_names(primary=primary, obs=obs) is names
+
+
+def test_optional_keyword_partition():
+    """Test the precomputed optional partition matches the optional keywords"""
+    schema = get_schema()
+    names = schema.get_optional_keyword_names()
+    assert names == tuple(schema.get_optional_keywords().keys())
+    assert all(
+        KeywordRequirement(schema.attribute_key[keyword]["required"])
+        == KeywordRequirement.OPTIONAL
+        for keyword in names
+    )
+
+
+def test_schema_fingerprint():
+    """Test that the schema fingerprint depends only on the content of the schema"""
+    layer_a = {"attribute_key": {"KEY_A": {"data_type": "str", "required": "optional"}}}
+    layer_b = {"attribute_key": {"KEY_B": {"data_type": "int", "required": "all"}}}
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        path_a = Path(tmpdirname) / "layer_a.yaml"
+        path_b = Path(tmpdirname) / "layer_b.yaml"
+        path_a.write_text(yaml.dump(layer_a))
+        path_b.write_text(yaml.dump(layer_b))
+
+        schema_ab = SOLARNETSchema(schema_layers=[path_a, path_b])
+        schema_ba = SOLARNETSchema(schema_layers=[path_b, path_a])
+        assert list(schema_ab.attribute_key) != list(schema_ba.attribute_key)
+        assert schema_ab.fingerprint == schema_ba.fingerprint
+        assert schema_ab.fingerprint != SOLARNETSchema().fingerprint
+        assert SOLARNETSchema().fingerprint == get_schema().fingerprint
+
+        # The order of list items is part of the content of the schema
+        path_a.write_text(yaml.dump({"attribute_key": {"KEY": {"valid_values": [1]}}}))
+        path_b.write_text(yaml.dump({"attribute_key": {"KEY": {"valid_values": [2]}}}))
+        assert (
+            SOLARNETSchema(schema_layers=[path_a, path_b]).fingerprint
+            != SOLARNETSchema(schema_layers=[path_b, path_a]).fingerprint
+        )
+
+        # The fingerprint is updated if the attribute schema is replaced
+        fingerprint = schema_ab.fingerprint
+        schema_ab._attr_schema = {"attribute_key": {}}
+        assert schema_ab.fingerprint != fingerprint
+
+    # The fingerprint is the same in another process
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from solarnet_metadata.schema import get_schema; print(get_schema().fingerprint)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == get_schema().fingerprint
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "solarnet_metadata.schema",
+        "solarnet_metadata.headers",
+        "solarnet_metadata.validation",
+        "solarnet_metadata.cli",
+    ],
+)
+def test_import_time_without_astropy(module):
+    """Test that importing the package does not import astropy"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Each line is "import time: self [us] | cumulative | imported package"
+    import_times = {}
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        import_times[name.strip()] = int(cumulative)
+    assert module in import_times
+    assert not [name for name in import_times if name.startswith("astropy")]
+
+
+@pytest.mark.parametrize(
+    "valid_values",
+    [
+        ["A", "B", "C"],
+        [0, 1],
+        [1.0, 0.5, 0],
+        [True],
+        [["unhashable"], "A"],
+    ],
+)
+@pytest.mark.parametrize(
+    "value",
+    ["A", "a", "", 0, 1, 2, 0.5, 1.0, 0.0, True, False, None, np.int64(1), np.float32(0.5), np.bool_(True), ["unhashable"], float("nan")],
+)  # fmt: skip
+def test_is_valid_value(valid_values, value):
+    """Test that checking valid values with sets matches checking the list"""
+    schema = SOLARNETSchema()
+    schema._attr_schema = {
+        "attribute_key": {"KEY": {"data_type": "str", "valid_values": valid_values}}
+    }
+    assert schema.is_valid_value("KEY", value) == (value in valid_values)
+    assert schema.get_valid_values("KEY") == valid_values
+
+    # Keywords without valid values accept any value
+    assert schema.is_valid_value("OTHER", value)
+    assert schema.get_valid_values("OTHER") is None
+
+
+def test_schema_merge_shares_structure():
+    """Test that merging schema layers shares the unchanged structure of the layers"""
+    schema = SOLARNETSchema()
+    fingerprint = schema._build_fingerprint()
+    requirement = schema.attribute_schema["conditional_requirements"][0]
+    new_layer = {
+        "attribute_key": {
+            "AUTHOR": {"required": "all"},
+            "OBS_TYPE": {"valid_values": ["ground-based", "new-type", "new-type"]},
+            "NEWKEY": {"data_type": "str", "required": "all"},
+        },
+        "conditional_requirements": [dict(requirement)],
+    }
+
+    merged = schema._merge(schema.attribute_schema, new_layer)
+    # The layers are not modified
+    assert schema._build_fingerprint() == fingerprint
+    assert merged["attribute_key"]["AUTHOR"]["required"] == "all"
+    assert schema.attribute_key["AUTHOR"]["required"] != "all"
+    assert merged["attribute_key"]["NEWKEY"] is new_layer["attribute_key"]["NEWKEY"]
+
+    # Lists are extended by the new items only
+    valid_values = schema.attribute_key["OBS_TYPE"]["valid_values"]
+    assert "ground-based" in valid_values
+    assert merged["attribute_key"]["OBS_TYPE"]["valid_values"] == list(valid_values) + [
+        "new-type"
+    ]
+    assert (
+        merged["conditional_requirements"]
+        is schema.attribute_schema["conditional_requirements"]
+    )
+
+    # Unchanged attributes are shared with the base layer
+    assert merged["attribute_key"]["DATE-BEG"] is schema.attribute_key["DATE-BEG"]
+    assert schema._merge(schema.attribute_schema, {}) is schema.attribute_schema
+    assert schema._merge({"a": [1]}, {"a": [True, 1]}) == {"a": [1, True]}
+
+
+def test_schema_read_only():
+    """Test that modifying one schema cannot affect other schemas"""
+    schema = SOLARNETSchema()
+    other_schema = SOLARNETSchema()
+    required = other_schema.attribute_key["AUTHOR"]["required"]
+
+    with pytest.raises(TypeError):
+        schema.attribute_key["AUTHOR"]["required"] = "all"
+    with pytest.raises(TypeError):
+        schema.attribute_key["NEWKEY"] = {"required": "all"}
+    with pytest.raises(AttributeError):
+        schema.attribute_key["OBS_TYPE"]["valid_values"].append("new-type")
+    with pytest.raises(AttributeError):
+        schema.attribute_schema["conditional_requirements"].append({})
+
+    # Schemas built afterwards are not affected
+    assert other_schema.attribute_key["AUTHOR"]["required"] == required
+    assert SOLARNETSchema().attribute_key["AUTHOR"]["required"] == required
+    assert "new-type" not in SOLARNETSchema().get_valid_values("OBS_TYPE")
+    assert validate_header(fits.Header()) == []
+
+    # Schemas can still be sent to worker processes
+    copied_schema = pickle.loads(pickle.dumps(schema))
+    assert copied_schema.fingerprint == schema.fingerprint
+    with pytest.raises(TypeError):
+        copied_schema.attribute_key["AUTHOR"]["required"] = "all"
+
+    # The merged parts of layered schemas are read-only too
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        layer_path = Path(tmpdirname) / "layer.yaml"
+        layer_path.write_text(
+            yaml.dump({"attribute_key": {"AUTHOR": {"valid_values": ["me"]}}})
+        )
+        layered_schema = SOLARNETSchema(schema_layers=[layer_path])
+        with pytest.raises(TypeError):
+            layered_schema.attribute_key["AUTHOR"]["required"] = "all"
+        assert layered_schema.get_valid_values("AUTHOR") == ("me",)
+
+
+def test_schema_layers_shared():
+    """Test that schemas built on the same layers share their structure"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        layer_path = Path(tmpdirname) / "layer.yaml"
+        layer_path.write_text(
+            yaml.dump({"attribute_key": {"AUTHOR": {"required": "all"}}})
+        )
+        schema = SOLARNETSchema(schema_layers=[layer_path])
+        other_schema = SOLARNETSchema(schema_layers=[layer_path])
+        default_schema = SOLARNETSchema()
+
+        assert schema.attribute_schema == other_schema.attribute_schema
+        assert (
+            schema.attribute_key["DATE-BEG"] is other_schema.attribute_key["DATE-BEG"]
+        )
+        assert (
+            schema.attribute_key["AUTHOR"] is not default_schema.attribute_key["AUTHOR"]
+        )
+        assert (
+            schema.attribute_key["DATE-BEG"] is default_schema.attribute_key["DATE-BEG"]
+        )
+        assert default_schema.attribute_key["AUTHOR"]["required"] != "all"
+
+        # Editing the layer file loads the layer again
+        layer_path.write_text(
+            yaml.dump({"attribute_key": {"AUTHOR": {"required": "primary"}}})
+        )
+        schema = SOLARNETSchema(schema_layers=[layer_path])
+        assert schema.attribute_key["AUTHOR"]["required"] == "primary"
@@ -5,13 +5,20 @@ from pathlib import Path
 import pytest
 from astropy.io import fits
 
+import solarnet_metadata.validation as validation
+
+from solarnet_metadata.findings import Finding, FindingSeverity
 from solarnet_metadata.schema import SOLARNETSchema
 from solarnet_metadata.validation import (
+    ValidationSession,
     check_obs_hdu,
+    iter_findings,
+    iter_header_findings,
     validate_file,
     validate_fits_keyword_data_type,
     validate_fits_keyword_value_comment,
     validate_header,
+    validate_headers,
 )
 
 # Mock schema for testing
@@ -51,7 +58,6 @@ MOCK_SCHEMA = {
 def mock_schema():
     schema = SOLARNETSchema()
     schema._attr_schema = MOCK_SCHEMA
-    schema._default_attributes = schema.load_default_attributes
     return schema
 
 
@@ -460,6 +466,125 @@ def test_validate_header(
     assert findings == expected_findings
 
 
+@pytest.mark.parametrize(
+    "header_dict, expected_findings",
+    [
+        # Ground-based observatory without its location
+        (
+            {"OBS_TYPE": "ground-based", "OBSGEO-X": 1.0},
+            [
+                "Missing Conditionally Required Attribute: OBSGEO-Y. Required when OBS_TYPE is 'ground-based'",
+                "Missing Conditionally Required Attribute: OBSGEO-Z. Required when OBS_TYPE is 'ground-based'",
+            ],
+        ),
+        # Ground-based observatory with its location
+        (
+            {"OBS_TYPE": "ground-based", "OBSGEO-X": 1.0, "OBSGEO-Y": 2.0, "OBSGEO-Z": 3.0},
+            [],
+        ),
+        # Spectrograph without its spectral keywords
+        (
+            {"INST_TYP": "Spectrograph", "OBS_VR": 0.0, "SPECSYS": "TOPOCENT", "SLIT_WID": 1.0, "VELOSYS": 0.0, "WAVEMAX": 2.0, "WAVEMIN": 1.0, "WAVEREF": "air"},
+            [
+                "Missing Conditionally Required Attribute: WAVEUNIT. Required when INST_TYP is 'Spectrograph'",
+            ],
+        ),
+        # No conditional requirements for imagers or unknown values
+        ({"INST_TYP": "Imager", "OBS_TYPE": "unknown"}, []),
+    ],
+)  # fmt: skip
+def test_validate_header_conditional_requirements(header_dict, expected_findings):
+    """Test validating the conditional requirements of the default schema"""
+    header = fits.Header()
+    for keyword, value in header_dict.items():
+        header[keyword] = value
+
+    findings = validate_header(header, is_primary=True)
+    conditional_findings = [
+        finding for finding in findings if "Conditionally Required" in finding
+    ]
+    assert conditional_findings == expected_findings
+
+
+def test_validate_header_custom_conditional_requirements(mock_schema):
+    """Test validating custom conditional requirements"""
+    mock_schema._attr_schema = dict(
+        MOCK_SCHEMA,
+        conditional_requirements=[
+            {
+                "condition_type": "attribute_value",
+                "condition_key": "SOMESTR",
+                "condition_value": "value",
+                "required_attributes": ["OPT_PTRn", "AUTHOR", "SOMEINT"],
+            },
+            {
+                "condition_type": "attribute_value",
+                "condition_key": "SOMESTR",
+                "condition_value": "other",
+                "required_attributes": ["SOMEINT"],
+            },
+        ],
+    )
+    header = fits.Header()
+    header["PATTERN1"] = "value"
+    header["SOMESTR"] = "value"
+
+    findings = validate_header(header, schema=mock_schema, structured=True)
+
+    # AUTHOR is reported once, as a required attribute, and the conditionally required
+    # attributes in schema order
+    assert [(finding.code, finding.keyword) for finding in findings] == [
+        ("missing-required", "AUTHOR"),
+        ("missing-conditional-pattern", "OPT_PTRn"),
+        ("missing-conditional", "SOMEINT"),
+    ]
+    assert findings[2].severity == FindingSeverity.ERROR
+
+    header["OPT_PTR1"] = "value"
+    header["SOMEINT"] = 1
+    header["AUTHOR"] = "John Doe"
+    assert validate_header(header, schema=mock_schema) == []
+
+    header["SOMESTR"] = "other"
+    del header["OPT_PTR1"]
+    assert validate_header(header, schema=mock_schema) == []
+    del header["SOMEINT"]
+    assert validate_header(header, schema=mock_schema) == [
+        "Missing Conditionally Required Attribute: SOMEINT. Required when SOMESTR is 'other'"
+    ]
+
+    # Keywords with other values require nothing
+    header["SOMESTR"] = "unknown"
+    assert validate_header(header, schema=mock_schema) == []
+
+
+def test_validate_header_conditional_requirements_without_value(mock_schema):
+    """Test that conditional requirements without a condition value are not met"""
+    mock_schema._attr_schema = dict(
+        MOCK_SCHEMA,
+        conditional_requirements=[
+            {
+                "condition_type": "attribute_value",
+                "condition_key": "SOMESTR",
+                "required_attributes": ["SOMEINT"],
+            },
+            {
+                "condition_type": "attribute_value",
+                "condition_key": "SOMESTR",
+                "condition_value": None,
+                "required_attributes": ["SOMEINT"],
+            },
+        ],
+    )
+    header = fits.Header()
+    header["PATTERN1"] = "value"
+    header["AUTHOR"] = "John Doe"
+    header["SOMESTR"] = "value"
+
+    assert validate_header(header, schema=mock_schema) == []
+    assert mock_schema.get_conditional_requirements(header) == {}
+
+
 def create_test_fits_file(primary_header_dict, data_headers_list=None, filepath=None):
     """Create a test FITS file with specified headers."""
     # Create primary HDU
@@ -599,3 +724,283 @@ def test_validate_file(
                 assert any(
                     pattern in finding for finding in findings
                 ), f"Pattern '{pattern}' not found in findings: {findings}"
+
+
+def test_validate_file_structured(mock_schema):
+    """Test that structured findings render to the same strings as the string API"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_test_fits_file(
+            {"PATTERN1": ("Value", "Pattern match"), "VALIDKEY": ("D", "")},
+            [{"OBS_HDU": (1, "Observation HDU flag"), "SOMEINT": ("abc", "")}],
+            filepath=Path(temp_dir) / "test_file.fits",
+        )
+        kwargs = dict(warn_no_comment=True, warn_data_type=True, schema=mock_schema)
+
+        findings = validate_file(filepath, structured=True, **kwargs)
+        assert all(isinstance(finding, Finding) for finding in findings)
+        assert [str(finding) for finding in findings] == validate_file(
+            filepath, **kwargs
+        )
+
+        codes = {(finding.hdu, finding.code, finding.keyword) for finding in findings}
+        assert (0, "missing-required", "AUTHOR") in codes
+        assert (0, "invalid-value", "VALIDKEY") in codes
+        assert (0, "no-comment", "VALIDKEY") in codes
+        assert (1, "missing-required", "OBS_ATTR") in codes
+        assert (1, "invalid-data-type", "SOMEINT") in codes
+
+        severities = {finding.code: finding.severity for finding in findings}
+        assert severities["missing-required"] == FindingSeverity.ERROR
+        assert severities["no-comment"] == FindingSeverity.WARNING
+
+
+def test_validate_headers(mock_schema, monkeypatch):
+    """Test that validating a batch of headers is the same as validating each header"""
+    headers = []
+    for i in range(10):
+        header = fits.Header()
+        header["OBS_HDU"] = (1, "Observation HDU flag")
+        header["PATTERN1"] = ("Value", "Pattern match")
+        header["VALIDKEY"] = ("A" if i % 2 else "D", "")
+        header["SOMEINT"] = (i if i % 3 else "abc", "Integer keyword")
+        headers.append(header)
+    kwargs = dict(
+        is_obs=True, warn_no_comment=True, warn_data_type=True, schema=mock_schema
+    )
+    expected = [validate_header(header, **kwargs) for header in headers]
+
+    # Each distinct card is validated once for the whole batch
+    calls = []
+    validate_card = validation._validate_card
+
+    def counting_validate_card(keyword, *args, **kwargs):
+        calls.append(keyword)
+        return validate_card(keyword, *args, **kwargs)
+
+    monkeypatch.setattr(validation, "_validate_card", counting_validate_card)
+    assert validate_headers(headers, **kwargs) == expected
+    assert sorted(calls) == sorted(
+        ["OBS_HDU", "PATTERN1", "VALIDKEY", "VALIDKEY"] + ["SOMEINT"] * 7
+    )
+
+    structured = validate_headers(headers, structured=True, **kwargs)
+    assert [[str(f) for f in findings] for findings in structured] == expected
+    assert validate_headers([], **kwargs) == []
+
+
+def test_validate_headers_equal_values(mock_schema):
+    """Test that equal values of different types are validated separately"""
+    headers = []
+    for value in [1, 1.0, True, 0.0, -0.0, False]:
+        header = fits.Header()
+        header["SOMEINT"] = (value, "Integer keyword")
+        header["VALIDKEY"] = (value, "Valid values keyword")
+        headers.append(header)
+    kwargs = dict(warn_data_type=True, schema=mock_schema)
+    expected = [validate_header(header, **kwargs) for header in headers]
+    assert validate_headers(headers, **kwargs) == expected
+
+
+def test_validate_header_snapshot(mock_schema):
+    """Test that the header is validated from a snapshot of its cards"""
+    header = fits.Header()
+    header["OBS_HDU"] = (1, "Observation HDU flag")
+    header["HIERARCH ESO DET CHIP"] = ("CCD", "Hierarch keyword")
+    header.add_history("First history")
+    header.add_history("Second history")
+    header.append(("VALIDKEY", "D", "Duplicate keyword"))
+    header.append(("VALIDKEY", "A", "Duplicate keyword"))
+
+    cards = validation._snapshot_cards(header)
+    assert cards == [tuple(card) for card in header.cards]
+    header_map = validation._map_cards(cards)
+    assert list(header_map) == list(dict.fromkeys(header.keys()))
+    assert header_map["VALIDKEY"] == header["VALIDKEY"] == "D"
+
+    findings = validate_header(header, is_obs=True, schema=mock_schema)
+    assert "Missing Required Attribute: OBS_ATTR" in findings
+    assert sum("VALIDKEY" in finding for finding in findings) == 1
+
+
+def test_validation_session_edits():
+    """Test that a session gives the same findings as validating the edited header"""
+    header = fits.Header()
+    header["OBS_HDU"] = (1, "Observation HDU flag")
+    header["OBS_TYPE"] = ("ground-based", "")
+    header["BTYPE"] = ("phot.count", "Type of data")
+    header.add_comment("A comment")
+    header["CTYPE1"] = ("HPLN-TAN", "Coordinate type")
+    kwargs = dict(
+        is_obs=True,
+        warn_no_comment=True,
+        warn_data_type=True,
+        warn_missing_optional=True,
+    )
+    session = ValidationSession(header, **kwargs)
+    assert session.validate() == validate_header(header, **kwargs)
+
+    edits = [
+        ("set", "BTYPE", "unknown", None),
+        ("set", "OBS_TYPE", "earth-orbiting", "Type of observatory"),
+        ("set", "OBSGEO-X", 1.0, "Observatory location"),
+        ("set", "obs_hdu", 0, None),
+        ("set", "OBS_HDU", 2, None),
+        ("set", "HISTORY", "Edited", None),
+        ("remove", "CTYPE1", None, None),
+        ("set", "CTYPE1", "HPLT-TAN", "Coordinate type"),
+        ("remove", "OBS_TYPE", None, None),
+        ("set", "NAXIS", "abc", "Number of axes"),
+        ("remove", "COMMENT", None, None),
+    ]
+    for action, keyword, value, comment in edits:
+        if action == "set":
+            session.set(keyword, value, comment)
+        else:
+            session.remove(keyword)
+        assert session.validate() == validate_header(header, **kwargs), (
+            action,
+            keyword,
+        )
+        structured = session.validate(structured=True)
+        assert [str(finding) for finding in structured] == session.validate()
+
+    with pytest.raises(KeyError):
+        session.remove("NOTAKEY")
+
+    # Edits made directly to the header are picked up by refreshing the session
+    header["BTYPE"] = ("phot.flux", "Type of data")
+    session.refresh()
+    assert session.validate() == validate_header(header, **kwargs)
+
+
+def test_validation_session_trailing_blank_cards():
+    """Test that a session follows astropy adding keywords in place of blank cards"""
+    header = fits.Header()
+    header["OBS_HDU"] = (1, "Observation HDU flag")
+    header.append(fits.Card(), bottom=True)
+    header.append(fits.Card(), bottom=True)
+    kwargs = dict(is_obs=True, warn_no_comment=True)
+    session = ValidationSession(header, **kwargs)
+    assert session.validate() == validate_header(header, **kwargs)
+
+    # The first two keywords replace the blank cards, the last one is appended
+    for keyword, length in [("BTYPE", 3), ("OBS_TYPE", 3), ("CTYPE1", 4)]:
+        session.set(keyword, "value", "Test keyword")
+        assert len(header) == length
+        assert session.validate() == validate_header(header, **kwargs), keyword
+    assert "Invalid keyword ''" not in " ".join(session.validate())
+    assert repr(session) == "ValidationSession(cards=4)"
+
+
+def test_validation_session_incremental(monkeypatch):
+    """Test that a session re-checks only the edited cards and requirements"""
+    header = fits.Header()
+    header["OBS_HDU"] = (1, "Observation HDU flag")
+    for i in range(100):
+        header[f"KEY{i}"] = (i, "Test keyword")
+    session = ValidationSession(header, is_obs=True, warn_data_type=True)
+    expected = session.validate()
+
+    card_calls = []
+    requirement_calls = []
+    validate_card = validation._validate_card
+    validate_requirements = validation._validate_requirements
+
+    def counting_validate_card(keyword, *args, **kwargs):
+        card_calls.append(keyword)
+        return validate_card(keyword, *args, **kwargs)
+
+    def counting_validate_requirements(*args, **kwargs):
+        requirement_calls.append(None)
+        return validate_requirements(*args, **kwargs)
+
+    monkeypatch.setattr(validation, "_validate_card", counting_validate_card)
+    monkeypatch.setattr(
+        validation, "_validate_requirements", counting_validate_requirements
+    )
+    assert session.validate() == expected
+    assert not card_calls and not requirement_calls
+
+    # Changing a value only re-checks the card
+    session.set("KEY10", "abc")
+    _ = session.validate()
+    assert card_calls == ["KEY10"] and not requirement_calls
+
+    # Adding a keyword re-checks the card and the required keywords
+    session.set("OBS_TYPE", "ground-based", "Type of observatory")
+    findings = session.validate()
+    assert card_calls == ["KEY10", "OBS_TYPE"] and len(requirement_calls) == 1
+    assert findings == validate_header(header, is_obs=True, warn_data_type=True)
+
+
+@pytest.mark.parametrize(
+    "mode", [{}, {"header_only": True}, {"raw_cards": True}], ids=["hdul", "header_only", "raw_cards"]
+)  # fmt: skip
+def test_iter_findings(mock_schema, mode, monkeypatch):
+    """Test streaming the findings of a file, with early exit"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = create_test_fits_file(
+            {"PATTERN1": ("Value", "Pattern match"), "VALIDKEY": ("D", "")},
+            [{"OBS_HDU": (1, "Observation HDU flag"), "SOMEINT": ("abc", "")}] * 20,
+            filepath=Path(temp_dir) / "test_file.fits",
+        )
+        kwargs = dict(warn_no_comment=True, warn_data_type=True, schema=mock_schema)
+        expected = validate_file(filepath, structured=True, **mode, **kwargs)
+
+        findings = list(iter_findings(filepath, structured=True, **mode, **kwargs))
+        assert findings == expected
+        assert list(iter_findings(filepath, **mode, **kwargs)) == [
+            str(finding) for finding in expected
+        ]
+
+        # Only the headers needed for the findings are validated
+        calls = []
+        iter_cards = validation._iter_cards
+
+        def counting_iter_cards(*args, **kwargs):
+            calls.append(kwargs.get("is_primary", False))
+            return iter_cards(*args, **kwargs)
+
+        monkeypatch.setattr(validation, "_iter_cards", counting_iter_cards)
+        findings = list(
+            iter_findings(filepath, structured=True, fail_fast=True, **mode, **kwargs)
+        )
+        first_error = next(
+            i for i, f in enumerate(expected) if f.severity == FindingSeverity.ERROR
+        )
+        assert findings == expected[: first_error + 1]
+        assert calls == [True]
+
+        findings = list(
+            iter_findings(filepath, structured=True, max_findings=5, **mode, **kwargs)
+        )
+        assert findings == expected[:5]
+        assert len(calls) < 5
+
+        # Stopping the iteration stops the validation
+        calls.clear()
+        findings = iter_findings(filepath, **mode, **kwargs)
+        assert next(findings) == str(expected[0])
+        findings.close()
+        assert calls == [True]
+
+
+def test_iter_header_findings(mock_schema):
+    """Test streaming the findings of a header, with early exit"""
+    header = fits.Header()
+    header["VALIDKEY"] = ("D", "")
+    header["SOMEINT"] = ("abc", "")
+    header["PATTERN1"] = ("Value", "")
+    kwargs = dict(warn_no_comment=True, warn_data_type=True, schema=mock_schema)
+    expected = validate_header(header, structured=True, **kwargs)
+    assert expected[0].severity == FindingSeverity.ERROR
+
+    assert list(iter_header_findings(header, structured=True, **kwargs)) == expected
+    assert list(iter_header_findings(header, fail_fast=True, **kwargs)) == [
+        str(expected[0])
+    ]
+    assert list(iter_header_findings(header, max_findings=2, **kwargs)) == [
+        str(finding) for finding in expected[:2]
+    ]
+    with pytest.raises(ValueError):
+        _ = iter_header_findings(header, max_findings=0)
@@ -1,10 +1,34 @@
-from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import date, datetime
 from enum import Enum
 from pathlib import Path
+from typing import Any, Optional
 
 import yaml
 
-__all__ = ["DATA_TYPE_MAP", "KeywordRequirement"]
+try:
+    # Use the libyaml C loader if PyYAML was built with it
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as YAML_LOADER
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DATA_TYPE_MAP",
+    "KeywordRequirement",
+    "YAML_LOADER",
+    "get_cache_directory",
+    "compile_yaml_data",
+    "load_yaml_data",
+]
+
+# Version of the format of compiled YAML files, incremented when the format changes
+COMPILED_FORMAT_VERSION = 1
 
 
 DATA_TYPE_MAP = {
@@ -33,20 +57,239 @@ class KeywordRequirement(Enum):
     OPTIONAL = "optional"
 
 
-def load_yaml_data(yaml_file_path: Path) -> dict:
+def _parse_yaml(stream) -> Any:
+    """
+    Function to parse YAML data with `YAML_LOADER`, the fastest available safe loader.
+
+    Both `yaml.CSafeLoader` and `yaml.SafeLoader` construct the same Python objects,
+    including `datetime` objects for ISO 8601 timestamps.
+    """
+    return yaml.load(stream, Loader=YAML_LOADER)
+
+
+def load_yaml_data(
+    yaml_file_path: Path, use_compiled: bool = False, write_compiled: bool = True
+) -> dict:
     """
     Function to load data from a Yaml file.
 
+    The file is parsed with `YAML_LOADER`, which is the libyaml `yaml.CSafeLoader` if
+    PyYAML was built with libyaml, and the pure-Python `yaml.SafeLoader` otherwise.
+
     Parameters
     ----------
     yaml_file_path: `Path`
         Path to YAML file to be used for formatting.
+    use_compiled: `bool`, default False
+        Whether to load the data from a compiled copy of the YAML file in the cache
+        directory, see `compile_yaml_data`. If there is no compiled copy of the content
+        of the YAML file, the YAML file is parsed.
+    write_compiled: `bool`, default True
+        Whether to compile the YAML file to the cache directory when it is parsed with
+        `use_compiled`. If False, only a copy compiled ahead of time with
+        `compile_yaml_data` is used.
 
     """
     if not Path(yaml_file_path).exists():
         raise FileNotFoundError(f"Cannot find YAML file: {yaml_file_path}")
+    if use_compiled:
+        return _load_compiled_yaml_data(yaml_file_path, write_compiled=write_compiled)
     # Load the Yaml file to Dict
     yaml_data = {}
     with open(yaml_file_path, "r") as f:
-        yaml_data = yaml.safe_load(f)
+        yaml_data = _parse_yaml(f)
+    return yaml_data
+
+
+def get_cache_directory() -> Optional[Path]:
+    """
+    Function to get the directory where compiled YAML files are stored.
+
+    The directory is given by the `SOLARNET_METADATA_CACHE_DIR` environment variable, and
+    defaults to `solarnet_metadata` in the user cache directory (`XDG_CACHE_HOME`, or
+    `~/.cache`). Setting `SOLARNET_METADATA_CACHE_DIR` to an empty string disables the
+    compiled YAML files.
+
+    Returns
+    -------
+    cache_directory : `Optional[Path]`
+        The cache directory, or None if compiled YAML files are disabled.
+    """
+    cache_directory = os.environ.get("SOLARNET_METADATA_CACHE_DIR", None)
+    if cache_directory is not None:
+        return Path(cache_directory) if cache_directory else None
+    user_cache_directory = os.environ.get("XDG_CACHE_HOME", None) or (
+        Path.home() / ".cache"
+    )
+    return Path(user_cache_directory) / "solarnet_metadata"
+
+
+def _get_compiled_path(yaml_file_path: Path, source: bytes) -> Optional[Path]:
+    """
+    Function to get the path of the compiled copy of a YAML file in the cache directory.
+
+    Compiled files are keyed by a hash of the content of the YAML file, so copies of the
+    same file in different places share one compiled file.
+    """
+    cache_directory = get_cache_directory()
+    if cache_directory is None:
+        return None
+    source_hash = hashlib.sha256(source).hexdigest()[:16]
+    return cache_directory / f"{Path(yaml_file_path).stem}-{source_hash}.json"
+
+
+def _encode_compiled_value(value: Any) -> Any:
+    """
+    Function to encode the values parsed from YAML that are not supported by JSON.
+    """
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Cannot compile value of type {type(value)}")
+
+
+def _decode_compiled_value(value: dict) -> Any:
+    """
+    Function to decode the values encoded by `_encode_compiled_value`.
+    """
+    if len(value) == 1:
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__date__" in value:
+            return date.fromisoformat(value["__date__"])
+    return value
+
+
+def _dump_compiled_data(source: bytes, yaml_data: Any) -> Optional[str]:
+    """
+    Function to serialize the data parsed from a YAML file, or return None if the data
+    cannot be represented exactly in the compiled format.
+    """
+    try:
+        compiled = json.dumps(
+            {
+                "format_version": COMPILED_FORMAT_VERSION,
+                "source_sha256": hashlib.sha256(source).hexdigest(),
+                "data": yaml_data,
+            },
+            default=_encode_compiled_value,
+        )
+    except (TypeError, ValueError) as e:
+        logger.debug(f"Cannot compile YAML data: {e}")
+        return None
+    # e.g. non-string mapping keys are converted to strings by JSON
+    if json.loads(compiled, object_hook=_decode_compiled_value)["data"] != yaml_data:
+        logger.debug("Cannot compile YAML data: data does not round-trip.")
+        return None
+    return compiled
+
+
+def _write_compiled_data(compiled: str, compiled_file_path: Path) -> None:
+    """
+    Function to write a compiled YAML file atomically, so concurrent readers never see a
+    partially written file.
+    """
+    compiled_file_path = Path(compiled_file_path)
+    compiled_file_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=compiled_file_path.parent,
+            prefix=compiled_file_path.name,
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            temporary_path = f.name
+            f.write(compiled)
+        os.replace(temporary_path, compiled_file_path)
+        temporary_path = None
+    finally:
+        # Remove the temporary file if it could not be moved into place
+        if temporary_path is not None:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+
+def compile_yaml_data(
+    yaml_file_path: Path, compiled_file_path: Optional[Path] = None
+) -> Optional[Path]:
+    """
+    Function to compile a YAML file to a format that loads much faster than parsing YAML.
+
+    The compiled file is a JSON document holding the parsed data, the version of the
+    compiled format and a hash of the YAML file it was compiled from. It is used by
+    `load_yaml_data` with `use_compiled=True` for YAML files with the same content.
+    The default schema is compiled automatically on first use; this function can be used
+    to compile it ahead of time, for example when building a container image, and to
+    compile custom schema layers, which are not compiled automatically.
+
+    Parameters
+    ----------
+    yaml_file_path: `Path`
+        Path to the YAML file to compile.
+    compiled_file_path: `Optional[Path]`, default None
+        Path to write the compiled file to. Defaults to the path in the cache directory
+        used by `load_yaml_data`, see `get_cache_directory`.
+
+    Returns
+    -------
+    compiled_file_path : `Optional[Path]`
+        The path of the compiled file, or None if the compiled files are disabled or the
+        YAML data cannot be compiled.
+    """
+    if not Path(yaml_file_path).exists():
+        raise FileNotFoundError(f"Cannot find YAML file: {yaml_file_path}")
+    source = Path(yaml_file_path).read_bytes()
+    if compiled_file_path is None:
+        compiled_file_path = _get_compiled_path(yaml_file_path, source)
+        if compiled_file_path is None:
+            return None
+
+    compiled = _dump_compiled_data(source, _parse_yaml(source))
+    if compiled is None:
+        return None
+    _write_compiled_data(compiled, compiled_file_path)
+    return Path(compiled_file_path)
+
+
+def _load_compiled_yaml_data(yaml_file_path: Path, write_compiled: bool = True) -> Any:
+    """
+    Function to load the data of a YAML file from its compiled copy, compiling it first
+    with `write_compiled` if there is no valid compiled copy.
+    """
+    source = Path(yaml_file_path).read_bytes()
+    compiled_file_path = _get_compiled_path(yaml_file_path, source)
+    if compiled_file_path is None:
+        return _parse_yaml(source)
+
+    # Use the compiled copy if it was compiled from the same YAML content
+    try:
+        with open(compiled_file_path, "r") as f:
+            compiled = json.load(f, object_hook=_decode_compiled_value)
+        if (
+            compiled["format_version"] == COMPILED_FORMAT_VERSION
+            and compiled["source_sha256"] == hashlib.sha256(source).hexdigest()
+        ):
+            return compiled["data"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug(f"Ignoring invalid compiled YAML file {compiled_file_path}: {e}")
+
+    # Parse the YAML file and compile it for next time
+    yaml_data = _parse_yaml(source)
+    if not write_compiled:
+        return yaml_data
+    compiled = _dump_compiled_data(source, yaml_data)
+    if compiled is not None:
+        try:
+            _write_compiled_data(compiled, compiled_file_path)
+        except OSError as e:
+            logger.debug(
+                f"Could not write compiled YAML file {compiled_file_path}: {e}"
+            )
     return yaml_data
@@ -1,18 +1,48 @@
 import logging
 import re
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from astropy.io import fits
-
-from solarnet_metadata.schema import SOLARNETSchema
+from solarnet_metadata.cache import ValidationCache
+from solarnet_metadata.findings import Finding, FindingSeverity
+from solarnet_metadata.headers import (
+    is_compressed_image,
+    iter_headers,
+    iter_raw_headers,
+    parse_header_cards,
+)
+from solarnet_metadata.schema import SOLARNETSchema, get_schema
 from solarnet_metadata.util import DATA_TYPE_MAP
 
+if TYPE_CHECKING:
+    from astropy.io import fits
+
 logger = logging.getLogger(__name__)
 
+# Keywords of commentary cards, which may appear many times in a header
+_COMMENTARY_KEYWORDS = ("", "COMMENT", "HISTORY")
+
 __all__ = [
     "validate_file",
     "validate_header",
+    "validate_headers",
+    "validate_file_headers",
+    "iter_file_headers",
+    "iter_findings",
+    "iter_header_findings",
+    "ValidationSession",
     "check_obs_hdu",
     "validate_fits_keyword_value_comment",
     "validate_fits_keyword_data_type",
@@ -26,15 +56,21 @@ def validate_file(
     warn_data_type: bool = False,
     warn_missing_optional: bool = False,
     schema: Optional[SOLARNETSchema] = None,
-) -> List[str]:
+    header_only: bool = False,
+    raw_cards: bool = False,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+) -> Union[List[str], List[Finding]]:
     """
     Validates a FITS file against the SOLARNET schema requirements.
 
     This function performs multiple validation checks:
     1. Verifies all required keywords are present based on HDU type
     2. Checks for pattern-based keywords when specified in the schema
-    3. Validates each keyword, value, and comment according to FITS standards
-    4. Optionally validates data types against the schema specifications
+    3. Verifies keywords required by the schema's conditional requirements on the
+       values of the header (e.g. `OBS_TYPE`, `INST_TYP`) are present
+    4. Validates each keyword, value, and comment according to FITS standards
+    5. Optionally validates data types against the schema specifications
 
     Parameters
     ----------
@@ -50,57 +86,294 @@ def validate_file(
         Whether to report warnings for optional keywords that aren't included.
     schema : Optional[SOLARNETSchema], default None
         The schema to validate against. If None, the default SOLARNET schema is used.
+    header_only : bool, default False
+        Whether to read only the headers of the file, skipping over the HDU data without
+        opening the file with `astropy.io.fits`. This keeps the I/O proportional to the
+        size of the headers for large files with many extensions. The headers of
+        tile-compressed images are still read with `astropy.io.fits`, so they are
+        validated as images rather than as the binary tables storing them.
+    raw_cards : bool, default False
+        Whether to validate the raw 80-byte header cards read from a memory map of the
+        file, without building `astropy.io.fits` header objects. As with `header_only`,
+        tile-compressed images are read with `astropy.io.fits`, so the findings are the
+        same as when validating the astropy headers. Implies `header_only`.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than
+        strings. The string of each finding is prefixed with the header it was found in.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers. Headers that are
+        byte-identical to a cached header are not validated again.
 
     Returns
     -------
-    validation_findings : List[str]
+    validation_findings : Union[List[str], List[Finding]]
         A list of validation issues found; empty if the file is valid.
     """
-    file_findings = []
+    return validate_file_headers(
+        iter_file_headers(file_path, header_only=header_only, raw_cards=raw_cards),
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+        structured=structured,
+        cache=cache,
+    )
+
+
+def validate_file_headers(
+    headers: Iterable[Union["fits.Header", bytes]],
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+) -> Union[List[str], List[Finding]]:
+    """
+    Validates the headers of a FITS file against the SOLARNET schema requirements.
+
+    The first header is validated as the primary header, and any additional headers as
+    observation headers, as in `validate_file`. This can be used to validate headers that
+    were already read, e.g. from a file on remote storage, or to collect statistics about
+    the headers while they are validated.
 
+    Parameters
+    ----------
+    headers : Iterable[Union[fits.Header, bytes]]
+        The headers of the file, in order, as `fits.Header` objects or as the raw bytes of
+        each header. See `iter_file_headers`.
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than
+        strings. The string of each finding is prefixed with the header it was found in.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers. See `validate_file`.
+
+    Returns
+    -------
+    validation_findings : Union[List[str], List[Finding]]
+        A list of validation issues found; empty if the headers are valid.
+    """
     # Check if Custom Schema is provided
     if schema is None or not isinstance(schema, SOLARNETSchema):
-        # Use the default schema
-        schema = SOLARNETSchema()
+        # Use the shared default schema
+        schema = get_schema()
 
-    # Open the FITS file and get the header
-    with fits.open(file_path) as hdul:
-        primary_header = hdul[0].header
+    file_findings = _iter_file_findings(
+        headers,
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+        cache=cache,
+    )
+    return _as_output(list(file_findings), structured)
 
-        # Validate primary header
-        primary_findings = validate_header(
-            primary_header,
-            is_primary=True,
-            warn_empty_keyword=warn_empty_keyword,
-            warn_no_comment=warn_no_comment,
-            warn_data_type=warn_data_type,
-            warn_missing_optional=warn_missing_optional,
-            schema=schema,
-        )
-        for finding in primary_findings:
-            file_findings.append(f"Primary Header: {finding}")
-
-        # Validate any additional observation headers
-        for i in range(1, len(hdul)):
-            findings = validate_header(
-                hdul[i].header,
-                is_primary=False,
-                is_obs=True,
-                warn_empty_keyword=warn_empty_keyword,
-                warn_no_comment=warn_no_comment,
-                warn_data_type=warn_data_type,
-                warn_missing_optional=warn_missing_optional,
-                schema=schema,
+
+def _as_output(
+    findings: List[Finding], structured: bool
+) -> Union[List[str], List[Finding]]:
+    """
+    Returns the findings as `Finding` objects if `structured`, or as strings otherwise.
+    """
+    if structured:
+        return findings
+    return [str(finding) for finding in findings]
+
+
+def iter_file_headers(
+    file_path: Path, header_only: bool = False, raw_cards: bool = False
+) -> Iterator[Union["fits.Header", bytes]]:
+    """
+    Iterates over the headers of a FITS file in the way `validate_file` reads them.
+
+    Parameters
+    ----------
+    file_path : Path
+        The path to the FITS file.
+    header_only : bool, default False
+        Whether to read only the headers of the file. See `validate_file`.
+    raw_cards : bool, default False
+        Whether to read the raw header bytes of the file. See `validate_file`.
+
+    Yields
+    ------
+    header : Union[fits.Header, bytes]
+        Each header of the file, as a `fits.Header`, or as the raw bytes of the header
+        with `raw_cards`.
+    """
+    if raw_cards:
+        # Parse the raw header cards from a memory map of the file
+        yield from _iter_image_headers(file_path, iter_raw_headers(file_path))
+    elif header_only:
+        # Read the headers block-by-block, skipping the data
+        yield from _iter_image_headers(file_path, iter_headers(file_path))
+    else:
+        from astropy.io import fits
+
+        # Open the FITS file and get the headers
+        with fits.open(file_path) as hdul:
+            for hdu in hdul:
+                yield hdu.header
+
+
+def _iter_image_headers(
+    file_path: Path, headers: Iterable[Union["fits.Header", bytes]]
+) -> Iterator[Union["fits.Header", bytes]]:
+    """
+    Iterates over the headers of a FITS file read without `astropy.io.fits`, replacing
+    the headers of tile-compressed images with the image headers that `astropy.io.fits`
+    builds from their `Z*` keywords.
+
+    The file is only opened with `astropy.io.fits` if it contains a tile-compressed image,
+    and the image data is not decompressed.
+    """
+    hdul = None
+    try:
+        for index, header in enumerate(headers):
+            if is_compressed_image(header):
+                if hdul is None:
+                    from astropy.io import fits
+
+                    hdul = fits.open(file_path)
+                header = hdul[index].header
+            yield header
+    finally:
+        if hdul is not None:
+            hdul.close()
+
+
+def _iter_file_findings(headers: Iterable, **kwargs) -> Iterator[Finding]:
+    """
+    Validates the headers of a FITS file, in order, starting with the primary header.
+
+    Each header is either a `fits.Header` or the raw bytes of the header. The first header
+    is validated as the primary header, and any additional headers as observation headers.
+    Findings are tagged with the index of the header they were found in, and yielded as
+    they are found, so the remaining headers are not read if the iteration is stopped.
+    """
+    # Share the work of validating the keywords common to the headers
+    memo = _BatchMemo()
+    for i, header in enumerate(headers):
+        if i == 0:
+            # Validate primary header
+            findings = _iter_header_content(
+                header, memo=memo, is_primary=True, **kwargs
+            )
+        else:
+            # Validate any additional observation headers
+            findings = _iter_header_content(
+                header, memo=memo, is_primary=False, is_obs=True, **kwargs
             )
-            for finding in findings:
-                file_findings.append(f"Observation Header {i}: {finding}")
+        for finding in findings:
+            yield finding.with_hdu(i)
 
-    # Combine findings from both headers
-    return file_findings
+
+def _iter_header_content(
+    header: Union["fits.Header", bytes],
+    cache: Optional[ValidationCache] = None,
+    memo: Optional["_BatchMemo"] = None,
+    **kwargs,
+) -> Iterator[Finding]:
+    """
+    Validates a `fits.Header` or the raw bytes of a header, using the cached findings if
+    the same header has been validated before. See `_iter_cards` for the parameters.
+
+    The findings of a header are only cached once all of them have been found, so a
+    header that is not validated to the end is validated again next time.
+    """
+    is_raw = isinstance(header, (bytes, bytearray))
+    key = None
+    if cache is not None:
+        header_bytes = header if is_raw else header.tostring().encode("utf-8")
+        key = cache.make_key(header_bytes, **kwargs)
+        findings = cache.get(key)
+        if findings is not None:
+            yield from findings
+            return
+
+    if is_raw:
+        cards = parse_header_cards(header)
+    else:
+        cards = _snapshot_cards(header)
+    findings = _iter_cards(cards, _map_cards(cards), memo=memo, **kwargs)
+
+    if cache is None:
+        yield from findings
+        return
+    header_findings = []
+    for finding in findings:
+        header_findings.append(finding)
+        yield finding
+    cache.set(key, header_findings)
+
+
+def _validate_header_content(header: Union["fits.Header", bytes], **kwargs):
+    """
+    Validates a `fits.Header` or the raw bytes of a header. See `_iter_header_content`.
+    """
+    return list(_iter_header_content(header, **kwargs))
+
+
+def _limit_findings(
+    findings: Iterator[Finding],
+    fail_fast: bool = False,
+    max_findings: Optional[int] = None,
+) -> Iterator[Finding]:
+    """
+    Yields the findings until the first error with `fail_fast`, or until `max_findings`
+    findings, and then stops the validation.
+    """
+    try:
+        for n_findings, finding in enumerate(findings, start=1):
+            yield finding
+            if fail_fast and finding.severity is FindingSeverity.ERROR:
+                return
+            if max_findings is not None and n_findings >= max_findings:
+                return
+    finally:
+        # Close any file still open for the remaining headers
+        findings.close()
+
+
+def _snapshot_cards(header: "fits.Header") -> List[Tuple[str, Any, str]]:
+    """
+    Function to get the keyword, value and comment of each card in a `fits.Header` in a
+    single pass over its cards.
+
+    Each property of an astropy `Card` is looked up once, rather than for each item when
+    unpacking the card, and the checks run against the snapshot instead of indexing the
+    `fits.Header`, which scans its cards for some kinds of keywords.
+    """
+    return [(card.keyword, card.value, card.comment) for card in header.cards]
+
+
+def _map_cards(cards: Iterable[Tuple[str, Any, str]]) -> Dict[str, Any]:
+    """
+    Function to map each keyword of the cards of a header to its first value, as
+    indexing a `fits.Header` by keyword does.
+    """
+    header = {}
+    for keyword, value, _ in cards:
+        if keyword not in header:
+            header[keyword] = value
+    return header
 
 
 def validate_header(
-    header: fits.Header,
+    header: "fits.Header",
     is_primary: bool = False,
     is_obs: bool = False,
     warn_empty_keyword: bool = False,
@@ -108,15 +381,19 @@ def validate_header(
     warn_data_type: bool = False,
     warn_missing_optional: bool = False,
     schema: Optional[SOLARNETSchema] = None,
-) -> List[str]:
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+) -> Union[List[str], List[Finding]]:
     """
     Validates a FITS header against the SOLARNET schema requirements.
 
     This function performs multiple validation checks:
     1. Verifies all required keywords are present based on HDU type
     2. Checks for pattern-based keywords when specified in the schema
-    3. Validates each keyword, value, and comment according to FITS standards
-    4. Optionally validates data types against the schema specifications
+    3. Verifies keywords required by the schema's conditional requirements on the
+       values of the header (e.g. `OBS_TYPE`, `INST_TYP`) are present
+    4. Validates each keyword, value, and comment according to FITS standards
+    5. Optionally validates data types against the schema specifications
 
     Parameters
     ----------
@@ -136,96 +413,752 @@ def validate_header(
         Whether to report warnings for optional keywords that aren't included.
     schema : Optional[SOLARNETSchema], default None
         The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers. If the header is
+        byte-identical to a cached header, the cached findings are returned.
 
     Returns
     -------
-    validation_findings : List[str]
+    validation_findings : Union[List[str], List[Finding]]
         A list of validation issues found; empty if the header is valid.
     """
     # Check if Custom Schema is provided
     if schema is None or not isinstance(schema, SOLARNETSchema):
-        # Use the default schema
-        schema = SOLARNETSchema()
+        # Use the shared default schema
+        schema = get_schema()
+
+    findings = _validate_header_content(
+        header,
+        cache=cache,
+        is_primary=is_primary,
+        is_obs=is_obs,
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+    )
+    return _as_output(findings, structured)
+
+
+def validate_headers(
+    headers: Iterable["fits.Header"],
+    is_primary: bool = False,
+    is_obs: bool = False,
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+) -> List[Union[List[str], List[Finding]]]:
+    """
+    Validates many FITS headers of the same kind against the SOLARNET schema requirements.
+
+    The findings for each header are the same as from `validate_header`, but the work
+    shared by the headers is done once for the whole batch: each distinct keyword is
+    resolved to its schema attribute once, and each distinct card (keyword, value and
+    comment) is validated once. This is much faster than calling `validate_header` for
+    each header when the headers share most of their cards, e.g. the extension headers of
+    the slices of an IFU or the steps of a time series.
+
+    Parameters
+    ----------
+    headers : Iterable[fits.Header]
+        The FITS headers to validate.
+    is_primary : bool, default False
+        Whether the headers belong to primary HDUs, affecting which keywords are required.
+    is_obs : bool, default False
+        Whether the headers belong to observation HDUs, affecting which keywords are required.
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers. See `validate_header`.
+
+    Returns
+    -------
+    validation_findings : List[Union[List[str], List[Finding]]]
+        The list of validation issues found in each header, in the order of `headers`.
+    """
+    # Check if Custom Schema is provided
+    if schema is None or not isinstance(schema, SOLARNETSchema):
+        # Use the shared default schema
+        schema = get_schema()
+
+    memo = _BatchMemo()
+    return [
+        _as_output(
+            _validate_header_content(
+                header,
+                cache=cache,
+                memo=memo,
+                is_primary=is_primary,
+                is_obs=is_obs,
+                warn_empty_keyword=warn_empty_keyword,
+                warn_no_comment=warn_no_comment,
+                warn_data_type=warn_data_type,
+                warn_missing_optional=warn_missing_optional,
+                schema=schema,
+            ),
+            structured,
+        )
+        for header in headers
+    ]
+
+
+def iter_findings(
+    file_path: Path,
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    header_only: bool = False,
+    raw_cards: bool = False,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+    fail_fast: bool = False,
+    max_findings: Optional[int] = None,
+) -> Iterator[Union[str, Finding]]:
+    """
+    Validates a FITS file against the SOLARNET schema requirements, yielding the findings
+    as they are found.
+
+    The findings are the same, and in the same order, as from `validate_file`. Each header
+    is read and validated only when the findings of the previous headers have been
+    consumed, so stopping the iteration, or stopping at the first error with `fail_fast`,
+    skips the validation of the remaining cards and headers of the file. This makes it
+    cheap to check whether a large file with many extensions has any error at all.
+
+    Parameters
+    ----------
+    file_path : Path
+        The path to the FITS file to validate.
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    header_only : bool, default False
+        Whether to read only the headers of the file. See `validate_file`.
+    raw_cards : bool, default False
+        Whether to validate the raw header cards of the file. See `validate_file`.
+    structured : bool, default False
+        Whether to yield `~solarnet_metadata.findings.Finding` objects rather than strings.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers. The findings of a header
+        are only cached if all of them were found.
+    fail_fast : bool, default False
+        Whether to stop after the first finding with an error severity. Warnings before
+        the first error are yielded.
+    max_findings : Optional[int], default None
+        The maximum number of findings to yield. If None, all of the findings are yielded.
+
+    Yields
+    ------
+    finding : Union[str, Finding]
+        Each validation issue found in the file.
+
+    Raises
+    ------
+    ValueError: If `max_findings` is not positive.
+
+    Examples
+    --------
+    >>> from solarnet_metadata.validation import iter_findings
+    >>> has_errors = any(iter_findings("my_file.fits", fail_fast=True))  # doctest: +SKIP
+    """
+    if max_findings is not None and max_findings < 1:
+        raise ValueError("max_findings must be positive.")
+    # Check if Custom Schema is provided
+    if schema is None or not isinstance(schema, SOLARNETSchema):
+        # Use the shared default schema
+        schema = get_schema()
+
+    file_findings = _iter_file_findings(
+        iter_file_headers(file_path, header_only=header_only, raw_cards=raw_cards),
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+        cache=cache,
+    )
+    return _iter_output(
+        _limit_findings(file_findings, fail_fast=fail_fast, max_findings=max_findings),
+        structured,
+    )
+
+
+def iter_header_findings(
+    header: "fits.Header",
+    is_primary: bool = False,
+    is_obs: bool = False,
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    structured: bool = False,
+    cache: Optional[ValidationCache] = None,
+    fail_fast: bool = False,
+    max_findings: Optional[int] = None,
+) -> Iterator[Union[str, Finding]]:
+    """
+    Validates a FITS header against the SOLARNET schema requirements, yielding the
+    findings as they are found.
+
+    The findings are the same, and in the same order, as from `validate_header`. The cards
+    of the header are validated only as the findings are consumed, so stopping the
+    iteration, or stopping at the first error with `fail_fast`, skips the validation of
+    the remaining cards.
 
+    Parameters
+    ----------
+    header : fits.Header
+        The FITS header to validate.
+    is_primary : bool, default False
+        Whether this header belongs to a primary HDU, affecting which keywords are required.
+    is_obs : bool, default False
+        Whether this header belongs to an observation HDU, affecting which keywords are required.
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to yield `~solarnet_metadata.findings.Finding` objects rather than strings.
+    cache : Optional[ValidationCache], default None
+        A cache of the findings of previously validated headers. The findings of the
+        header are only cached if all of them were found.
+    fail_fast : bool, default False
+        Whether to stop after the first finding with an error severity.
+    max_findings : Optional[int], default None
+        The maximum number of findings to yield. If None, all of the findings are yielded.
+
+    Yields
+    ------
+    finding : Union[str, Finding]
+        Each validation issue found in the header.
+
+    Raises
+    ------
+    ValueError: If `max_findings` is not positive.
+    """
+    if max_findings is not None and max_findings < 1:
+        raise ValueError("max_findings must be positive.")
+    # Check if Custom Schema is provided
+    if schema is None or not isinstance(schema, SOLARNETSchema):
+        # Use the shared default schema
+        schema = get_schema()
+
+    header_findings = _iter_header_content(
+        header,
+        cache=cache,
+        is_primary=is_primary,
+        is_obs=is_obs,
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        warn_data_type=warn_data_type,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+    )
+    return _iter_output(
+        _limit_findings(
+            header_findings, fail_fast=fail_fast, max_findings=max_findings
+        ),
+        structured,
+    )
+
+
+def _iter_output(
+    findings: Iterator[Finding], structured: bool
+) -> Iterator[Union[str, Finding]]:
+    """
+    Yields the findings as `Finding` objects if `structured`, or as strings otherwise.
+    """
+    try:
+        for finding in findings:
+            yield finding if structured else str(finding)
+    finally:
+        # Stop the validation if the iteration is stopped
+        findings.close()
+
+
+class _BatchMemo:
+    """
+    Memo of the work shared by the headers validated together, with the same schema and
+    options: the schema attribute pattern matched by each keyword, and the findings of
+    each distinct card.
+    """
+
+    __slots__ = ("patterns", "card_findings")
+
+    def __init__(self):
+        self.patterns = {}
+        self.card_findings = {}
+
+    def match_pattern(self, keyword: str, schema: SOLARNETSchema) -> Optional[str]:
+        try:
+            return self.patterns[keyword]
+        except KeyError:
+            attr_name = self.patterns[keyword] = schema.match_pattern(keyword)
+            return attr_name
+        except TypeError:
+            return schema.match_pattern(keyword)
+
+    def validate_card(self, keyword: str, value: Any, comment: str, **kwargs):
+        # The findings depend on the type and string of the value as well as its value,
+        # e.g. for `1` and `True`, or `0.0` and `-0.0`
+        try:
+            key = (keyword, comment, type(value), value, str(value))
+            findings = self.card_findings.get(key, None)
+        except Exception:
+            # Values that are not hashable or cannot be cast to a string
+            return _validate_card(keyword, value, comment, **kwargs)
+        if findings is None:
+            findings = self.card_findings[key] = _validate_card(
+                keyword, value, comment, **kwargs
+            )
+        return findings
+
+
+class ValidationSession:
+    """
+    Class representing the validation of a FITS header that is being edited.
+
+    The session takes a snapshot of the header, and remembers the findings of each card and
+    of the required keywords. Editing the header through `set` and `remove` keeps the
+    snapshot up to date, and `validate` then re-checks only the edited cards, and the
+    required keywords only if a keyword was added or removed, or a keyword that the
+    requirements depend on (`OBS_HDU` and the condition keys of the schema) was changed.
+    The findings are the same as from `validate_header` on the edited header.
+
+    If the header is edited other than through the session, `refresh` must be called
+    before the next `validate`.
+
+    Parameters
+    ----------
+    header : fits.Header
+        The FITS header to validate and edit.
+    is_primary : bool, default False
+        Whether the header belongs to a primary HDU, affecting which keywords are required.
+    is_obs : bool, default False
+        Whether the header belongs to an observation HDU, affecting which keywords are
+        required.
+    warn_empty_keyword : bool, default False
+        Whether to report warnings for empty keywords.
+    warn_no_comment : bool, default False
+        Whether to report warnings for keywords missing comments.
+    warn_data_type : bool, default False
+        Whether to validate and report warnings about incorrect data types.
+    warn_missing_optional : bool, default False
+        Whether to report warnings for optional keywords that aren't included.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+
+    Examples
+    --------
+    >>> from astropy.io import fits
+    >>> from solarnet_metadata.validation import ValidationSession
+    >>> session = ValidationSession(fits.Header(), is_primary=True)
+    >>> session.validate()
+    ['Missing Required Attribute: BITPIX', 'Missing Required Attribute: SIMPLE']
+    >>> session.set("SIMPLE", True, "Conforms to the FITS standard")
+    >>> session.validate()
+    ['Missing Required Attribute: BITPIX']
+    """
+
+    def __init__(
+        self,
+        header: "fits.Header",
+        is_primary: bool = False,
+        is_obs: bool = False,
+        warn_empty_keyword: bool = False,
+        warn_no_comment: bool = False,
+        warn_data_type: bool = False,
+        warn_missing_optional: bool = False,
+        schema: Optional[SOLARNETSchema] = None,
+    ):
+        # Check if Custom Schema is provided
+        if schema is None or not isinstance(schema, SOLARNETSchema):
+            # Use the shared default schema
+            schema = get_schema()
+
+        self.header = header
+        self.schema = schema
+        self._requirement_options = dict(
+            is_primary=is_primary,
+            is_obs=is_obs,
+            warn_missing_optional=warn_missing_optional,
+            schema=schema,
+        )
+        self._card_options = dict(
+            warn_empty_keyword=warn_empty_keyword,
+            warn_no_comment=warn_no_comment,
+            warn_data_type=warn_data_type,
+            schema=schema,
+        )
+        # Keywords whose values the required keywords depend on
+        self._condition_keys = schema.get_condition_keys() | {"OBS_HDU"}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Function to take a new snapshot of the header, after it was edited other than
+        through the session. All of the header is validated again by the next `validate`.
+        """
+        # The keyword, value and comment of each card, and the findings of each card, or
+        # None for cards that have not been validated since they were edited
+        self._cards = _snapshot_cards(self.header)
+        self._card_findings: List[Optional[List[Finding]]] = [None] * len(self._cards)
+        # The first value of each keyword, and the schema attribute pattern it matches
+        self._values = _map_cards(self._cards)
+        self._patterns = {
+            keyword: self.schema.match_pattern(keyword) for keyword in self._values
+        }
+        # The findings of the required keywords, or None if they must be checked again
+        self._requirement_findings: Optional[List[Finding]] = None
+
+    def set(self, keyword: str, value: Any, comment: Optional[str] = None) -> None:
+        """
+        Function to set the value, and optionally the comment, of a keyword in the
+        header, as `header[keyword] = (value, comment)` does.
+
+        Parameters
+        ----------
+        keyword : str
+            The keyword to set. If the keyword is not in the header it is added.
+        value : Any
+            The value of the keyword.
+        comment : Optional[str], default None
+            The comment of the keyword. If None, an existing comment is kept.
+        """
+        if comment is None:
+            self.header[keyword] = value
+        else:
+            self.header[keyword] = (value, comment)
+
+        if keyword.strip().upper() in _COMMENTARY_KEYWORDS:
+            # Commentary cards are added rather than set
+            self.refresh()
+            return
+
+        card = self.header.cards[keyword]
+        keyword = card.keyword
+        position = self.header.index(keyword)
+        if keyword in self._values:
+            self._cards[position] = (keyword, card.value, card.comment)
+            self._card_findings[position] = None
+            if keyword in self._condition_keys:
+                self._requirement_findings = None
+        else:
+            self._cards.insert(position, (keyword, card.value, card.comment))
+            self._card_findings.insert(position, None)
+            self._patterns[keyword] = self.schema.match_pattern(keyword)
+            self._requirement_findings = None
+            # Astropy adds a card in place of blank cards at the end of the header, if
+            # there are any, rather than growing the header
+            while len(self._cards) > len(self.header):
+                self._cards.pop()
+                self._card_findings.pop()
+            if "" in self._values and all(card[0] != "" for card in self._cards):
+                del self._values[""]
+                del self._patterns[""]
+        self._values[keyword] = card.value
+
+    def remove(self, keyword: str) -> None:
+        """
+        Function to remove all of the cards of a keyword from the header, as
+        `del header[keyword]` does.
+
+        Parameters
+        ----------
+        keyword : str
+            The keyword to remove.
+
+        Raises
+        ------
+        KeyError: If the keyword is not in the header.
+        """
+        keyword = self.header.cards[keyword].keyword
+        del self.header[keyword]
+
+        kept = [i for i, card in enumerate(self._cards) if card[0] != keyword]
+        self._cards = [self._cards[i] for i in kept]
+        self._card_findings = [self._card_findings[i] for i in kept]
+        del self._values[keyword]
+        del self._patterns[keyword]
+        self._requirement_findings = None
+
+    def validate(self, structured: bool = False) -> Union[List[str], List[Finding]]:
+        """
+        Function to validate the header, re-checking only what was edited since the last
+        validation.
+
+        Parameters
+        ----------
+        structured : bool, default False
+            Whether to return `~solarnet_metadata.findings.Finding` objects rather than
+            strings.
+
+        Returns
+        -------
+        validation_findings : Union[List[str], List[Finding]]
+            The list of validation issues found, the same as from `validate_header`.
+        """
+        if self._requirement_findings is None:
+            self._requirement_findings = _validate_requirements(
+                self._values,
+                set(self._patterns.values()),
+                **self._requirement_options,
+            )
+        validation_findings = list(self._requirement_findings)
+
+        for i, card_findings in enumerate(self._card_findings):
+            if card_findings is None:
+                card_findings = self._card_findings[i] = _validate_card(
+                    *self._cards[i], **self._card_options
+                )
+            validation_findings.extend(card_findings)
+
+        return _as_output(validation_findings, structured)
+
+    def __repr__(self) -> str:
+        return f"ValidationSession(cards={len(self._cards)})"
+
+
+def _iter_cards(
+    cards: Iterable[Tuple[str, Any, str]],
+    header: Mapping[str, Any],
+    is_primary: bool = False,
+    is_obs: bool = False,
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+    memo: Optional[_BatchMemo] = None,
+) -> Iterator[Finding]:
+    """
+    Validates the cards of a FITS header against the SOLARNET schema requirements,
+    yielding the findings as they are found.
+
+    `cards` are the keyword, value and comment of each card in the header, and `header`
+    maps each keyword to its (first) value. `memo` shares the work of validating the
+    keywords common to several headers. See `validate_header` for the other parameters.
+    """
+    # Resolve the header keywords to the schema attribute patterns they match
+    if memo is not None:
+        matched_patterns = {
+            memo.match_pattern(header_key, schema) for header_key in header.keys()
+        }
+    else:
+        matched_patterns = {
+            schema.match_pattern(header_key) for header_key in header.keys()
+        }
+
+    # Verify the Attributes required in the header
+    yield from _validate_requirements(
+        header,
+        matched_patterns,
+        is_primary=is_primary,
+        is_obs=is_obs,
+        warn_missing_optional=warn_missing_optional,
+        schema=schema,
+    )
+
+    # Validate all of the existing keywords in the header
+    validate_card = memo.validate_card if memo is not None else _validate_card
+    for keyword, value, comment in cards:
+        yield from validate_card(
+            keyword,
+            value,
+            comment,
+            warn_empty_keyword=warn_empty_keyword,
+            warn_no_comment=warn_no_comment,
+            warn_data_type=warn_data_type,
+            schema=schema,
+        )
+
+
+def _validate_requirements(
+    header: Mapping[str, Any],
+    matched_patterns: AbstractSet[Optional[str]],
+    is_primary: bool = False,
+    is_obs: bool = False,
+    warn_missing_optional: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+) -> List[Finding]:
+    """
+    Validates the `OBS_HDU` keyword of a header, and that the attributes required by the
+    schema are present in the header.
+
+    `header` maps each keyword to its (first) value, and `matched_patterns` holds the
+    schema attribute pattern matched by each keyword. See `validate_header` for the other
+    parameters.
+    """
     # Initialize Empty List for Validation Findings
     validation_findings = []
 
     # Check Special Keyword for `OBS_HDU` which is an int, 0 or 1
-    is_obs, obs_findings = check_obs_hdu(header, is_obs)
+    is_obs, obs_findings = check_obs_hdu(header, is_obs, structured=True)
     validation_findings.extend(obs_findings)
 
-    # Get subset of Required Attributes
-    required_attributes = schema.get_required_keywords(primary=is_primary, obs=is_obs)
     # Verify that all Required Attributes are present
-    for keyword, info in required_attributes.items():
-        if keyword not in header:
+    header_keys = header.keys()
+    attribute_key = schema.attribute_key
+    missing_required = (
+        schema.get_required_keyword_set(primary=is_primary, obs=is_obs) - header_keys
+    )
+    if missing_required:
+        for keyword in schema.get_required_keyword_names(
+            primary=is_primary, obs=is_obs
+        ):
+            if keyword not in missing_required:
+                continue
             # Check if there is a pattern match
-            if pattern := info.get("pattern", None):
-                found_match = False
-                # See if anything in header matches the pattern
-                for header_key in header.keys():
-                    res = re.fullmatch(pattern, header_key)
-                    if res:
-                        # There was a match!
-                        found_match = True
-                        break
-                if not found_match:
+            if pattern := attribute_key[keyword].get("pattern", None):
+                if not _has_pattern_match(
+                    keyword, header_keys, matched_patterns, schema
+                ):
                     validation_findings.append(
-                        f"Missing Required Attribute: {keyword}. No pattern match for {keyword} with pattern {pattern}"
+                        Finding(
+                            "missing-required-pattern", keyword=keyword, args=(pattern,)
+                        )
                     )
             else:
-                validation_findings.append(f"Missing Required Attribute: {keyword}")
+                validation_findings.append(Finding("missing-required", keyword=keyword))
+
+    # Verify that the Attributes required by the values of the header are present
+    conditional_requirements = schema.get_conditional_requirements(header)
+    for keyword, (condition_key, condition_value) in conditional_requirements.items():
+        if keyword in header_keys or keyword in missing_required:
+            continue
+        # Check if there is a pattern match
+        pattern = attribute_key.get(keyword, {}).get("pattern", None)
+        if pattern:
+            if not _has_pattern_match(keyword, header_keys, matched_patterns, schema):
+                validation_findings.append(
+                    Finding(
+                        "missing-conditional-pattern",
+                        keyword=keyword,
+                        args=(condition_key, condition_value, pattern),
+                    )
+                )
+        else:
+            validation_findings.append(
+                Finding(
+                    "missing-conditional",
+                    keyword=keyword,
+                    args=(condition_key, condition_value),
+                )
+            )
 
     # Optionally Warn if Optional Attributes are missing
     if warn_missing_optional:
-        optional_attributes = schema.get_optional_keywords()
-        for keyword, info in optional_attributes.items():
-            if keyword not in header:
-                # Check if there is a pattern match
-                if pattern := info.get("pattern", None):
-                    found_match = False
-                    # See if anything in header matches the pattern
-                    for header_key in header.keys():
-                        res = re.fullmatch(pattern, header_key)
-                        if res:
-                            # There was a match!
-                            found_match = True
-                            break
-                    if not found_match:
-                        validation_findings.append(
-                            f"Missing Optional Attribute: {keyword}. No pattern match for {keyword} with pattern {pattern}"
+        for keyword in schema.get_optional_keyword_names():
+            if keyword in header_keys:
+                continue
+            # Check if there is a pattern match
+            if pattern := attribute_key[keyword].get("pattern", None):
+                if not _has_pattern_match(
+                    keyword, header_keys, matched_patterns, schema
+                ):
+                    validation_findings.append(
+                        Finding(
+                            "missing-optional-pattern", keyword=keyword, args=(pattern,)
                         )
-                else:
-                    validation_findings.append(f"Missing Optional Attribute: {keyword}")
+                    )
+            else:
+                validation_findings.append(Finding("missing-optional", keyword=keyword))
 
-    # Validate all of the existing keywords in the header
-    for keyword, value, comment in header.cards:
-        # Validate each keyword, value, comment set
-        findings = validate_fits_keyword_value_comment(
-            keyword,
-            value,
-            comment,
-            warn_empty_keyword=warn_empty_keyword,
-            warn_no_comment=warn_no_comment,
-            schema=schema,
-        )
-        validation_findings.extend(findings)
+    return validation_findings
+
+
+def _validate_card(
+    keyword: str,
+    value: Any,
+    comment: str,
+    warn_empty_keyword: bool = False,
+    warn_no_comment: bool = False,
+    warn_data_type: bool = False,
+    schema: Optional[SOLARNETSchema] = None,
+) -> List[Finding]:
+    """
+    Validates a single card of a FITS header. See `validate_header` for the parameters.
+    """
+    # Validate each keyword, value, comment set
+    findings = validate_fits_keyword_value_comment(
+        keyword,
+        value,
+        comment,
+        warn_empty_keyword=warn_empty_keyword,
+        warn_no_comment=warn_no_comment,
+        schema=schema,
+        structured=True,
+    )
 
-        # Validate Date Type
-        if warn_data_type and keyword and keyword.strip() != "":
+    # Validate Date Type
+    if warn_data_type and keyword and keyword.strip() != "":
 
-            # check the data type of the keyword
-            findings = validate_fits_keyword_data_type(
+        # check the data type of the keyword
+        findings.extend(
+            validate_fits_keyword_data_type(
                 keyword=keyword,
                 value=value,
                 schema=schema,
+                structured=True,
             )
-            validation_findings.extend(findings)
+        )
 
-    return validation_findings
+    return findings
+
+
+def _has_pattern_match(
+    attribute_name: str,
+    header_keys: set,
+    matched_patterns: set,
+    schema: SOLARNETSchema,
+) -> bool:
+    """
+    Check whether any header keyword matches the pattern of a schema attribute.
+
+    `matched_patterns` holds the attribute matched first by each header keyword. Only if
+    the attribute is not among them are the keywords checked against its own pattern, in
+    case its pattern overlaps with that of an earlier attribute.
+    """
+    if attribute_name in matched_patterns:
+        return True
+    return schema.pattern_matches(attribute_name, header_keys)
 
 
-def check_obs_hdu(header: fits.Header, is_obs: bool = False) -> Tuple[bool, List[str]]:
+def check_obs_hdu(
+    header: "fits.Header", is_obs: bool = False, structured: bool = False
+) -> Tuple[bool, Union[List[str], List[Finding]]]:
     """
     Check and validate the OBS_HDU keyword in a FITS header.
 
@@ -239,13 +1172,15 @@ def check_obs_hdu(header: fits.Header, is_obs: bool = False) -> Tuple[bool, List
         The FITS header to check for OBS_HDU keyword.
     is_obs : bool, default False
         Initial assumption about whether this is an observation HDU.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
 
     Returns
     -------
     is_obs : bool
         The resolved observation HDU status, potentially modified based on the
         header's OBS_HDU value.
-    validation_findings : List[str]
+    validation_findings : Union[List[str], List[Finding]]
         A list of validation issues found; empty if OBS_HDU is valid.
 
     Notes
@@ -256,27 +1191,29 @@ def check_obs_hdu(header: fits.Header, is_obs: bool = False) -> Tuple[bool, List
     """
     validation_findings = []
     if "OBS_HDU" in header:
-        if header["OBS_HDU"] not in [0, 1]:
+        # Look up the value once, as header lookups are not always cheap
+        obs_hdu = header["OBS_HDU"]
+        if obs_hdu not in [0, 1]:
             validation_findings.append(
-                f"Invalid OBS_HDU value: {header['OBS_HDU']}. Must be 0 or 1."
+                Finding("invalid-obs-hdu", keyword="OBS_HDU", args=(obs_hdu,))
             )
             is_obs = False
-        if header["OBS_HDU"] == 1 and not is_obs:
+        if obs_hdu == 1 and not is_obs:
             logger.warning(
                 f"Keyword `OBS_HDU` is set to 1, but `is_obs` given as False. Overriding `is_obs` to True. If this is not the desired behavior, please check the header `OBS_HDU`."
             )
             is_obs = True
-        elif header["OBS_HDU"] == 0 and is_obs:
+        elif obs_hdu == 0 and is_obs:
             logger.warning(
                 f"Keyword `OBS_HDU` is set to 0, but `is_obs` given as True. Overriding `is_obs` to False. If this is not the desired behavior, please check the header `OBS_HDU`."
             )
             is_obs = False
-    elif "OBS_HDU" not in header and is_obs:
+    elif is_obs:
         logger.warning(
             f"Keyword `OBS_HDU` is not present in the header, but `is_obs` given as True. Overriding `is_obs` to True. If this is not the desired behavior, please check the header `OBS_HDU`."
         )
         is_obs = True
-    return is_obs, validation_findings
+    return is_obs, _as_output(validation_findings, structured)
 
 
 def validate_fits_keyword_value_comment(
@@ -286,7 +1223,8 @@ def validate_fits_keyword_value_comment(
     warn_empty_keyword: bool = False,
     warn_no_comment: bool = False,
     schema: Optional[SOLARNETSchema] = None,
-) -> List[str]:
+    structured: bool = False,
+) -> Union[List[str], List[Finding]]:
     """
     Validates a FITS keyword, value, and comment set according to FITS standard requirements.
 
@@ -313,17 +1251,19 @@ def validate_fits_keyword_value_comment(
         Whether to add a warning if the comment is empty.
     schema : Optional[SOLARNETSchema], default None
         The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
 
     Returns
     -------
-    findings : List[str]
+    findings : Union[List[str], List[Finding]]
         A list of validation issues found; empty if the set is valid.
     """
 
     # Check if Custom Schema is provided
     if schema is None or not isinstance(schema, SOLARNETSchema):
-        # Use the default schema
-        schema = SOLARNETSchema()
+        # Use the shared default schema
+        schema = get_schema()
 
     # Initialize Empty List for Findings
     findings = []
@@ -331,18 +1271,14 @@ def validate_fits_keyword_value_comment(
     # Check for Empty Keyword
     if not keyword or keyword.strip() == "":
         if warn_empty_keyword:
-            findings.append(
-                f"Invalid keyword '{keyword}': Must be 1-8 characters, containing only A-Z, 0-9, -, _."
-            )
+            findings.append(Finding("empty-keyword", keyword=keyword))
     # Check keyword format: 1-8 characters, A-Z, 0-9, -, _
     elif not isinstance(keyword, str) or not re.match(r"^[A-Z0-9_-]{1,8}$", keyword):
-        findings.append(
-            f"Invalid keyword '{keyword}': Must be 1-8 characters, containing only A-Z, 0-9, -, _."
-        )
+        findings.append(Finding("invalid-keyword", keyword=keyword))
 
     # Optional: Warn if comment is empty
     if warn_no_comment and (not comment or str(comment).strip() == ""):
-        findings.append(f"Keyword '{keyword}' has no comment.")
+        findings.append(Finding("no-comment", keyword=keyword))
 
     # Handle special keywords: COMMENT, HISTORY, and BLANK
     if keyword in ["COMMENT", "HISTORY"]:
@@ -355,12 +1291,12 @@ def validate_fits_keyword_value_comment(
         try:
             value_str = str(value)
         except Exception as e:
-            findings.append(f"Value for '{keyword}' cannot be cast to a string: {e}")
+            findings.append(Finding("value-not-string", keyword=keyword, args=(e,)))
 
         # Comment must be a string or None
         if comment is not None and not isinstance(comment, str):
             findings.append(
-                f"Comment for '{keyword}' must be a string (got {type(comment)})."
+                Finding("comment-not-string", keyword=keyword, args=(type(comment),))
             )
         elif (
             value_str is not None
@@ -384,26 +1320,29 @@ def validate_fits_keyword_value_comment(
 
             if len(card_str) > 80:
                 findings.append(
-                    f"FITS card for '{keyword}' exceeds 80 characters (length: {len(card_str)})."
+                    Finding("card-too-long", keyword=keyword, args=(len(card_str),))
                 )
 
     # Check for Valid Values in the Schema
-    attribute_key = schema.attribute_key
-    if keyword in attribute_key:
-        valid_values = attribute_key[keyword].get("valid_values", None)
-        if valid_values and value not in valid_values:
-            findings.append(
-                f"Value '{value}' for keyword '{keyword}' is not in the list of valid values: {valid_values}."
+    if not schema.is_valid_value(keyword, value):
+        findings.append(
+            Finding(
+                "invalid-value",
+                keyword=keyword,
+                # Valid values are stored as tuples in the read-only schema
+                args=(value, list(schema.get_valid_values(keyword))),
             )
+        )
 
-    return findings
+    return _as_output(findings, structured)
 
 
 def validate_fits_keyword_data_type(
     keyword: str,
     value: Any,
     schema: Optional[SOLARNETSchema] = None,
-) -> List[str]:
+    structured: bool = False,
+) -> Union[List[str], List[Finding]]:
     """
     Validates the data type of a FITS keyword value.
 
@@ -413,18 +1352,20 @@ def validate_fits_keyword_data_type(
         The FITS keyword to validate.
     value : Any
         The value associated with the keyword.
-    data_type : str
-        The expected data type of the value.
+    schema : Optional[SOLARNETSchema], default None
+        The schema to validate against. If None, the default SOLARNET schema is used.
+    structured : bool, default False
+        Whether to return `~solarnet_metadata.findings.Finding` objects rather than strings.
 
     Returns
     -------
-    findings : List[str]
+    findings : Union[List[str], List[Finding]]
         A list of validation issues found; empty if the data type is valid.
     """
     # Check if Custom Schema is provided
     if schema is None or not isinstance(schema, SOLARNETSchema):
-        # Use the default schema
-        schema = SOLARNETSchema()
+        # Use the shared default schema
+        schema = get_schema()
 
     findings = []
 
@@ -432,37 +1373,29 @@ def validate_fits_keyword_data_type(
     keyword_info = schema.attribute_key.get(keyword, None)
     if not keyword_info:
         # Search for Pattern Match in the Schema
-        found_match = False
-        for _, info in schema.attribute_key.items():
-            if pattern := info.get("pattern", None):
-                res = re.fullmatch(pattern, keyword)
-                if res:
-                    found_match = True
-                    keyword_info = info
-                    break
-        if not found_match:
-            findings.append(
-                f"Keyword '{keyword}' not found in the schema. Cannot Validate Data Type."
-            )
+        attr_name = schema.match_pattern(keyword)
+        if attr_name is not None:
+            keyword_info = schema.attribute_key[attr_name]
+        else:
+            findings.append(Finding("unknown-keyword", keyword=keyword))
 
     if keyword_info:
         # Make sure we have a data type for the keyword
         data_type = keyword_info.get("data_type", None)
         if not data_type:
-            findings.append(
-                f"Keyword '{keyword}' has no data type. Cannot Validate Data Type."
-            )
+            findings.append(Finding("no-data-type", keyword=keyword))
         # Check if data type is known
         elif data_type not in DATA_TYPE_MAP:
-            findings.append(f"Unknown data type '{data_type}' for keyword '{keyword}'.")
-            return findings
+            findings.append(
+                Finding("unknown-data-type", keyword=keyword, args=(data_type,))
+            )
         else:
             # Check if value can be cast to the expected data type
             try:
                 DATA_TYPE_MAP[data_type](value)
             except Exception as e:
                 findings.append(
-                    f"Value for '{keyword}' cannot be cast to data type '{data_type}': {e}"
+                    Finding("invalid-data-type", keyword=keyword, args=(data_type, e))
                 )
 
-    return findings
+    return _as_output(findings, structured)